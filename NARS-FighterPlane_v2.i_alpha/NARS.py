@@ -7,6 +7,8 @@ import random  # 用于babble
 
 from NARS_Program import NARSType, NARSProgram
 from NARS_Elements import *
+from NARS_Latency import LatencyTracker, now
+from instruments import INSTRUMENTS
 
 
 class NARSAgent:
@@ -24,8 +26,8 @@ class NARSAgent:
     """
 
     # nars_type: 'opennars' or 'ONA'
-    def __init__(self, nars_type: NARSType = None, mainGoal: str = None, mainGoal_negative: str = None):
-        "构造方法"
+    def __init__(self, nars_type: NARSType = None, mainGoal: str = None, mainGoal_negative: str = None, brain_options: dict = None, brain_pool=None, io_hub=None):
+        "构造方法（brain_options：传递给具体NARS程序的配置；brain_pool：从中租用已启动的程序，见NARS_Pool；io_hub：共享的I/O线程，见NARS_IOHub）"
         # 使用字典记录操作，并在后面重载「__getitem__」方法实现快捷读写操作
         # 空字典：获取这个操作「被程序发送了多少次」
         self._operation_container: dict[NARSOperation:int] = dict()
@@ -33,10 +35,13 @@ class NARSAgent:
         self._sensors: list[NARSSensor] = []  # 空列表
         # 使用「对象复合」的形式，把「具体程序启动」的部分交给「NARSProgram」处理
         self.brain: NARSProgram = None
+        self.brain_pool = None  # 大脑的来源（为空则自行启动、断开时终止）
+        self.io_hub = None  # 自行启动的大脑由哪个I/O线程收发（为空则使用程序自己的线程）
+        self.brain_options: dict = {}
         self.enable_brain_control: bool = True  # 决定是否「接收NARS操作」
         self.enable_brain_sense: bool = True  # 决定是否「接收外界感知」
         if nars_type:  # 若没有输入nars_type，也可以后续再初始化
-            self.equip_brain(nars_type)
+            self.equip_brain(nars_type, brain_pool=brain_pool, io_hub=io_hub, **(brain_options or {}))
         # 定义自身的「总目标」
         self.mainGoal: str = mainGoal
         self.mainGoal_negative: str = mainGoal_negative
@@ -44,6 +49,8 @@ class NARSAgent:
         self._total_sense_inputs: int = 0  # 从外界获得的感知输入量
         # 操作相关
         self._total_initiative_operates: int = 0  # 从NARS程序接收的操作总数
+        self._operation_read_times: dict[str, float] = {}  # 尚未被应用的操作的（最新）读取时间
+        self.rng: random.Random = random  # babble用的随机数流（默认为全局随机数，可替换为独立的流以便复现）
 
     def __del__(self) -> None:
         "析构函数"
@@ -56,32 +63,79 @@ class NARSAgent:
         "获取自己是否有「初始化大脑」"
         return self.brain != None
 
-    def equip_brain(self, nars_type: NARSType):  # -> NARSProgram
-        "（配合disconnect可重复使用）装载自己的「大脑」：上载一个NARS程序，使得其可以进行推理"
+    def equip_brain(self, nars_type: NARSType, brain_pool=None, io_hub=None, **brain_options):  # -> NARSProgram
+        "（配合disconnect可重复使用）装载自己的「大脑」：上载一个NARS程序，使得其可以进行推理（有brain_pool时从池中租用，收发由池决定）"
         # 定义自身用到的「NARS程序」类型
         self.type: NARSType = nars_type
         if self.brain:  # 已经「装备」则报错
             raise "Already equipped a program!"
-        self.brain: NARSProgram = NARSProgram.fromType(
-            type=nars_type
-        )
+        if brain_pool:
+            if brain_pool.nars_type != nars_type:
+                raise ValueError(
+                    f'Brain pool of {brain_pool.nars_type} cannot serve {nars_type}')
+            self.brain: NARSProgram = brain_pool.lease(**brain_options)
+        else:
+            self.brain: NARSProgram = NARSProgram.fromType(
+                type=nars_type,
+                io_hub=io_hub,
+                **brain_options  # 具体程序的配置（如「替身NARS」的种子、噪声量）
+            )
+        self.brain_pool = brain_pool
+        self.io_hub = io_hub
+        self.brain_options: dict = brain_options  # 重新启动时沿用（见reset_state）
         # 遇到「截获的操作」：交给专门函数处理
         self.brain.operationHook = self.handle_program_operation
 
     def disconnect_brain(self):
         "与游戏「解耦」，类似「断开连接」的作用"
-        self.brain.terminate()  # 终止程序运行
+        if not self.brain:  # 已断开（如：先手动断开，后析构）
+            return
+        if self.brain_pool:  # 重置后归还进程池，供下一个智能体复用
+            self.brain_pool.release(self.brain)
+        else:
+            self.brain.terminate()  # 终止程序运行
         self.brain = None  # 空置，以便下一次定义
 
+    def reset_state(self, reset_brain: bool = False) -> None:
+        """（新回合）重置智能体的状态：已存储的操作、未写入的语句与各项计数
+        - reset_brain：同时清空「大脑」的记忆（不支持重置的后端则重新启动程序）
+        """
+        self.reset_stored_operations()
+        self._operation_read_times.clear()
+        self._total_sense_inputs = 0
+        self._total_initiative_operates = 0
+        if not self.brain:
+            return
+        self.brain.clear_cached_cmds()  # 上一回合的感知已过时
+        if not reset_brain:
+            return
+        if self.brain.reset():  # 重置会断开操作钩子：重新接上
+            self.brain.operationHook = self.handle_program_operation
+        else:
+            frequency: int = self.brain.inference_cycle_frequency
+            self.disconnect_brain()
+            self.equip_brain(self.type, self.brain_pool, self.io_hub, **self.brain_options)
+            self.brain.inference_cycle_frequency = frequency
+
     # update sensors (object positions), remind goals, and make inference
     def update(self, *sense_args: tuple, **sense_targets: dict):
         "NARS在环境中的行动：感知更新→目标提醒→推理步进"
         self.update_sensors(*sense_args, **sense_targets)
-        # 原「remind_goal」：时刻提醒智能体要做的事情
+        self._remind_goals()
+        self._inference_step()
+
+    def update_perceptions(self, perceptions: list[NARSPerception]) -> None:
+        "同update，但感知由调用方给出（如批量环境中向量化计算的感知）"
+        for perception in perceptions:
+            self.add_perception(perception)
+        self._remind_goals()
+        self._inference_step()
+
+    def _remind_goals(self) -> None:
+        "原「remind_goal」：时刻提醒智能体要做的事情"
         self.mainGoal and self.put_goal(self.mainGoal)
         self.mainGoal_negative and self.put_goal(
             self.mainGoal_negative, True)  # 时刻提醒智能体*不要做*的事情
-        self._inference_step()
 
     # 语句相关 #
 
@@ -90,6 +144,7 @@ class NARSAgent:
         return self.brain.update_inference_cycles()
 
     # 感知相关 #
+    @INSTRUMENTS.timed('nars.sensors')
     def update_sensors(self, *sense_args: tuple, **sense_targets: dict):
         "其它特性留给后续继承"
         # 遍历所有感知器，从感知器统一获得感知
@@ -99,6 +154,14 @@ class NARSAgent:
                 for perception in sensor(*sense_args, **sense_targets):
                     self.add_perception(perception)
 
+    def perceive(self, *sense_args: tuple, **sense_targets: dict) -> list[NARSPerception]:
+        "从所有启用的感知器获得当前的感知（只观察，不送入大脑、不计数）"
+        return [
+            perception
+            for sensor in self._sensors if sensor.enabled
+            for perception in sensor(*sense_args, **sense_targets)
+        ]
+
     def add_perception(self, perception: NARSPerception) -> None:
         "统一添加感知：传递给「大脑」+计数"
         if self.enable_brain_sense:  # 需要启用「大脑感知」
@@ -173,11 +236,30 @@ class NARSAgent:
             for operation in operations
         ]
 
-    def handle_program_operation(self, operation: NARSOperation):
+    def handle_program_operation(self, operation: NARSOperation, read_time: float = None):
         "对接命令行与游戏：根据NARS程序返回的操作字符串，存储相应操作"
         if self.enable_brain_control:  # 需要启用「大脑操作」
             self.store_operation(operation)  # 存储操作
             self._total_initiative_operates += 1  # 增加接收的操作次数
+            # 记录读取时间，待操作被应用时统计延迟
+            read_time = operation.read_time if read_time is None else read_time
+            if read_time is not None:
+                self._operation_read_times[operation.name] = read_time  # 以最新一次为准，避免沿用过期的读取时间
+
+    def cancel_operation(self, operation: NARSOperation) -> None:
+        "撤销一个已存储但尚未应用的操作（如：被冲突的操作取代），并丢弃其读取时间"
+        self[operation] = False
+        self._operation_read_times.pop(operation.name, None)
+
+    def mark_operation_applied(self, operation: NARSOperation) -> None:
+        "标记某操作已在环境中被应用（统计「读取→应用」的延迟）"
+        if (read_time := self._operation_read_times.pop(operation.name, None)) is not None:
+            self.brain.latency.on_operation_applied(read_time, now())
+
+    @property
+    def latency(self) -> LatencyTracker:
+        "获取「大脑」的延迟统计"
+        return self.brain.latency
 
     @property
     def need_babble(self) -> bool:
@@ -186,9 +268,9 @@ class NARSAgent:
 
     def babble(self, probability: int = 1, operations=[], force_operation: bool = True):
         "随机行为，就像婴儿的牙牙学语（有概率）"  # 🆕为实现「与具体实现程序形式」的分离，直接提升至Agent层次
-        if not probability or random.randint(1, probability) == 1:  # 几率触发
+        if not probability or self.rng.randint(1, probability) == 1:  # 几率触发
             self.force_unconscious_operation(
-                random.choice(operations),  # 随机取一个NARS操作
+                self.rng.choice(operations),  # 随机取一个NARS操作
                 force_operation  # 一定要做出操作吗？
             )  # 相当于「强制无意识操作」
 
@@ -224,3 +306,7 @@ class NARSAgent:
     def total_operates(self) -> int:
         "获取从「NARS计算机实现」中截获的操作次数"
         return self._total_initiative_operates
+
+    def instrument_summary(self, reset: bool = False) -> dict[str, dict[str, float]]:
+        "获取NARS相关热点（感知器、写入、读取）的计时摘要"
+        return INSTRUMENTS.summary(prefix='nars.', reset=reset)
@@ -0,0 +1,396 @@
+"""asyncio版本的NARS程序与智能体：不开守护线程，一个事件循环可同时驱动多个智能体
+- AsyncNARSProgram：用asyncio.create_subprocess_exec启动后端；写入语句、推理步进都是协程（写入后等待管道排空）
+  - 输出由事件循环中的读取任务解析；操作交给钩子，也可用`async for operation in program.operations()`逐个取得
+  - 语句模板与操作解析沿用同步版本的各后端类（见PROTOCOLS），启动时直接执行后端（不经过cmd）
+- AsyncNARSAgent：NARSAgent的协程版本（操作存储、感知器与计数沿用NARSAgent；与大脑通信的方法都需await）
+用法：
+    agent = await AsyncNARSAgent.create(NARSType.SCRIPTED_ONA, mainGoal='good', seed=0)
+    await agent.update_perceptions([NARSPerception('enemy', 'left')])  # 感知→目标提醒→推理步进
+    async for operation in agent.brain.operations(): ...
+    await agent.disconnect_brain()
+    python NARS_Async.py --agents 1 16 64 [--seconds 5]  # 在一个事件循环中驱动多个智能体
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import threading
+from typing import AsyncIterator
+
+from NARS import NARSAgent
+from NARS_Elements import NARSOperation, NARSPerception
+from NARS_Program import NARSType, NARSProgram, opennars, ONA, Python, ScriptedOpenNARS, ScriptedONA
+from NARS_Latency import LatencyTracker, now
+from instruments import INSTRUMENTS
+from logger import LOG_IO
+
+PROTOCOLS: dict[NARSType, type[NARSProgram]] = {
+    NARSType.OPENNARS: opennars,
+    NARSType.ONA: ONA,
+    NARSType.ONA_OLD: ONA,
+    NARSType.PYTHON: Python,
+    NARSType.SCRIPTED_OPENNARS: ScriptedOpenNARS,
+    NARSType.SCRIPTED_ONA: ScriptedONA,
+}
+"各类型沿用的同步版本：提供语句模板与操作解析"
+
+INFERENCE_CYCLE_FREQUENCIES: dict[NARSType, int] = {
+    NARSType.OPENNARS: 5,
+    NARSType.SCRIPTED_OPENNARS: 5,
+}
+"默认推理周期频率（与同步版本一致；未列出的为0：后端自主更新）"
+
+
+def launch_arguments(nars_type: NARSType, **options) -> list[str]:
+    "启动后端的命令行参数（options：替身脚本的配置，或jar_path/exe_path）"
+    match nars_type:
+        case NARSType.SCRIPTED_OPENNARS | NARSType.SCRIPTED_ONA:
+            return PROTOCOLS[nars_type].command(**options)
+        case NARSType.OPENNARS:
+            return ['java', '-Xmx1024m', '-jar', options.get('jar_path', opennars.DEFAULT_JAR_PATH)]
+        case NARSType.ONA:
+            return [options.get('exe_path', ONA.DEFAULT_EXE_PATH), 'shell']
+        case NARSType.ONA_OLD:
+            return [options.get('exe_path', r'.\NAR_old.exe'), 'shell']
+        case NARSType.PYTHON:
+            return [options.get('exe_path', Python.DEFAULT_EXE_PATH)]
+
+
+class AsyncNARSProgram:
+    """与NARS后端通信的asyncio程序（须在事件循环中使用）
+    - 通过launch构造（启动子进程与读取任务）；terminate或`async with`结束
+    """
+
+    def __init__(self, nars_type: NARSType, process: asyncio.subprocess.Process) -> None:
+        "（由launch调用）"
+        self.type: NARSType = nars_type
+        self.protocol: type[NARSProgram] = PROTOCOLS[nars_type]
+        self.process: asyncio.subprocess.Process = process
+        self.inference_cycle_frequency: int = INFERENCE_CYCLE_FREQUENCIES.get(nars_type, 0)
+        self.operationHook = None
+        "读取到操作时调用（在事件循环中，同步调用）"
+        self._subscribers: list[asyncio.Queue] = []
+        self.num_written_lines: int = 0
+        self.num_read_lines: int = 0
+        self.latency: LatencyTracker = LatencyTracker(self.protocol.__name__)
+        self._reader: asyncio.Task = asyncio.create_task(
+            self._read_lines(), name=f'NARS-reader-{self.protocol.__name__}')
+
+    @classmethod
+    async def launch(cls, nars_type: NARSType, **options) -> 'AsyncNARSProgram':
+        "启动一个后端（options见launch_arguments）"
+        process: asyncio.subprocess.Process = await asyncio.create_subprocess_exec(
+            *launch_arguments(nars_type, **options),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+        )
+        program: AsyncNARSProgram = cls(nars_type, process)
+        await program.write_line('*volume=0')
+        return program
+
+    async def __aenter__(self) -> 'AsyncNARSProgram':
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.terminate()
+
+    @property
+    def enable_babble(self) -> bool:
+        return bool(self.protocol.BABBLE_TEMPLATE)
+
+    @property
+    def num_cached_cmds(self) -> int:
+        "语句在写入时直接送出，没有缓冲区"
+        return 0
+
+    def clear_cached_cmds(self) -> None:
+        pass
+
+    # 运行时相关 #
+
+    async def write_line(self, cmd: str, is_perception: bool = False) -> None:
+        "写入一行并等待管道排空（后端跟不上时，在这里等待而不是堆积）"
+        if self.process is None:
+            return
+        write_time: float = now()
+        self.process.stdin.write((cmd + '\n').encode())
+        await self.process.stdin.drain()
+        self.num_written_lines += 1
+        self.latency.on_written(write_time, write_time, now(), is_perception)
+
+    async def step(self, num: int = None) -> None:
+        "推理步进：写入推理周期数（默认为inference_cycle_frequency；为零则不写入）"
+        if num := num or self.inference_cycle_frequency:
+            await self.write_line(f'{num}')
+
+    async def reset(self) -> bool:
+        "清空后端的记忆（见NARSProgram.reset）；返回是否支持重置"
+        if not self.protocol.RESET_COMMAND or self.process is None:
+            return False
+        self.operationHook = None
+        await self.write_line(self.protocol.RESET_COMMAND)
+        await self.write_line('*volume=0')
+        return True
+
+    async def terminate(self) -> None:
+        "关闭输入并终止后端，等待读取任务结束"
+        if (process := self.process) is None:
+            return
+        self.process = None
+        process.stdin.close()
+        try:
+            process.terminate()
+        except ProcessLookupError:  # 已退出
+            pass
+        await process.wait()
+        await self._reader
+
+    def kill(self) -> None:
+        "（同步）强制终止：用于事件循环之外的清理（如析构）"
+        if (process := self.process) is not None:
+            self.process = None
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+
+    async def _read_lines(self) -> None:
+        "读取任务：解析每一行输出，操作交给钩子与各订阅者；输出结束时通知订阅者"
+        stdout: asyncio.StreamReader = self.process.stdout
+        try:
+            while line := await stdout.readline():
+                self.num_read_lines += 1
+                with INSTRUMENTS.section('nars.read'):
+                    # 同步版本的解析不依赖实例状态：直接借用
+                    if operation_name := self.protocol.catch_operation_name(self, line.decode(errors='replace')):
+                        operation: NARSOperation = NARSOperation(operation_name)
+                        operation.read_time = now()
+                        self.latency.on_operation_read(operation.read_time)
+                        if self.operationHook:
+                            self.operationHook(operation)
+                        for subscriber in self._subscribers:
+                            subscriber.put_nowait(operation)
+        except (ConnectionError, ValueError) as e:  # 管道异常断开/一行过长
+            LOG_IO.warning('Stopped reading from %s: %s', self.protocol.__name__, e)
+        finally:
+            for subscriber in self._subscribers:
+                subscriber.put_nowait(None)
+
+    async def operations(self) -> AsyncIterator[NARSOperation]:
+        "逐个取得此后读取到的操作（后端退出时结束）"
+        subscriber: asyncio.Queue = asyncio.Queue()
+        self._subscribers.append(subscriber)
+        try:
+            while (operation := await subscriber.get()) is not None:
+                yield operation
+        finally:
+            self._subscribers.remove(subscriber)
+
+    # 语句相关 #
+
+    async def add_perception(self, perception: NARSPerception) -> None:
+        await self.write_line(
+            self.protocol.SENSE_TEMPLATE % (perception.object, perception.adjective),
+            is_perception=True)
+
+    async def put_goal(self, goalName: str, is_negative: bool = False) -> None:
+        await self.write_line((
+            self.protocol.GOAL_TEMPLATE_NEGATIVE
+            if is_negative
+            else self.protocol.GOAL_TEMPLATE
+        ) % goalName)
+
+    async def praise_goal(self, goalName: str) -> None:
+        await self.write_line(self.protocol.PRAISE_TEMPLATE % goalName)
+
+    async def punish_goal(self, goalName: str) -> None:
+        await self.write_line(self.protocol.PUNISH_TEMPLATE % goalName)
+
+    async def put_unconscious_operation(self, operation: NARSOperation) -> None:
+        if self.protocol.BABBLE_TEMPLATE:
+            await self.write_line(self.protocol.BABBLE_TEMPLATE % operation.name)
+
+    async def register_basic_operation(self, operation: NARSOperation) -> None:
+        if self.protocol.OPERATION_REGISTER_TEMPLATE:
+            await self.write_line(self.protocol.OPERATION_REGISTER_TEMPLATE % operation.name)
+
+
+class AsyncNARSAgent(NARSAgent):
+    """NARSAgent的asyncio版本：大脑为AsyncNARSProgram
+    - 与大脑通信的方法（感知、目标、推理、babble、断开）都是协程；操作由读取任务直接存入，无需线程
+    - 通过create构造（或构造后await equip_brain）
+    """
+
+    def __init__(self, mainGoal: str = None, mainGoal_negative: str = None) -> None:
+        super().__init__(mainGoal=mainGoal, mainGoal_negative=mainGoal_negative)
+
+    @classmethod
+    async def create(cls, nars_type: NARSType, mainGoal: str = None, mainGoal_negative: str = None,
+                     **brain_options) -> 'AsyncNARSAgent':
+        agent: AsyncNARSAgent = cls(mainGoal, mainGoal_negative)
+        await agent.equip_brain(nars_type, **brain_options)
+        return agent
+
+    def __del__(self) -> None:
+        "析构时事件循环可能已关闭：只做同步的强制终止"
+        if self.brain:
+            self.brain.kill()
+            self.brain = None
+
+    async def equip_brain(self, nars_type: NARSType, **brain_options) -> None:
+        "启动自己的「大脑」（brain_options见launch_arguments）"
+        self.type: NARSType = nars_type
+        if self.brain:
+            raise RuntimeError('Already equipped a program!')
+        self.brain: AsyncNARSProgram = await AsyncNARSProgram.launch(nars_type, **brain_options)
+        self.brain_options: dict = brain_options
+        self.brain.operationHook = self.handle_program_operation
+
+    async def disconnect_brain(self) -> None:
+        if not self.brain:
+            return
+        brain, self.brain = self.brain, None
+        await brain.terminate()
+
+    async def reset_state(self, reset_brain: bool = False) -> None:
+        "（新回合）见NARSAgent.reset_state"
+        self.reset_stored_operations()
+        self._operation_read_times.clear()
+        self._total_sense_inputs = 0
+        self._total_initiative_operates = 0
+        if not (self.brain and reset_brain):
+            return
+        if await self.brain.reset():
+            self.brain.operationHook = self.handle_program_operation
+        else:
+            frequency: int = self.brain.inference_cycle_frequency
+            await self.disconnect_brain()
+            await self.equip_brain(self.type, **self.brain_options)
+            self.brain.inference_cycle_frequency = frequency
+
+    # 感知→目标提醒→推理步进 #
+
+    async def update(self, *sense_args: tuple, **sense_targets: dict) -> None:
+        await self.update_sensors(*sense_args, **sense_targets)
+        await self._remind_goals()
+        await self._inference_step()
+
+    async def update_perceptions(self, perceptions: list[NARSPerception]) -> None:
+        for perception in perceptions:
+            await self.add_perception(perception)
+        await self._remind_goals()
+        await self._inference_step()
+
+    async def _remind_goals(self) -> None:
+        self.mainGoal and await self.put_goal(self.mainGoal)
+        self.mainGoal_negative and await self.put_goal(self.mainGoal_negative, True)
+
+    async def _inference_step(self) -> None:
+        await self.brain.step()
+
+    async def update_sensors(self, *sense_args: tuple, **sense_targets: dict) -> None:
+        for perception in self.perceive(*sense_args, **sense_targets):
+            await self.add_perception(perception)
+
+    async def add_perception(self, perception: NARSPerception) -> None:
+        if self.enable_brain_sense:
+            await self.brain.add_perception(perception)
+            self._total_sense_inputs += 1
+
+    # 目标与操作 #
+
+    async def put_goal(self, goalName: str, is_negative: bool = False) -> None:
+        await self.brain.put_goal(goalName, is_negative)
+
+    async def praise_goal(self, goalName: str) -> None:
+        await self.brain.praise_goal(goalName)
+
+    async def punish_goal(self, goalName: str) -> None:
+        await self.brain.punish_goal(goalName)
+
+    async def register_basic_operation(self, operation: NARSOperation) -> None:
+        await self.brain.register_basic_operation(operation)
+
+    async def register_basic_operations(self, *operations: list[NARSOperation]) -> None:
+        for operation in operations:
+            await self.register_basic_operation(operation)
+
+    async def babble(self, probability: int = 1, operations=[], force_operation: bool = True) -> None:
+        if not probability or self.rng.randint(1, probability) == 1:
+            await self.force_unconscious_operation(self.rng.choice(operations), force_operation)
+
+    async def force_unconscious_operation(self, operation: NARSOperation, force_operation: bool = True) -> None:
+        await self.brain.put_unconscious_operation(operation)
+        force_operation and self.store_operation(operation)
+
+
+# 一个事件循环驱动多个智能体 #
+
+DEMO_PERCEPTIONS: list[NARSPerception] = [
+    NARSPerception('enemy', 'left'),
+    NARSPerception('enemy', 'right'),
+    NARSPerception('enemy', 'ahead'),
+    NARSPerception.new_self('still'),
+]
+"每次更新送入的感知（与游戏中一次对敌、移动感知的规模相当）"
+
+
+async def drive(nars_type: NARSType, num_agents: int, seconds: float, update_period: float) -> dict:
+    "在当前事件循环中启动num_agents个智能体，每update_period秒更新一次，持续seconds秒"
+    scripted: bool = nars_type in (NARSType.SCRIPTED_ONA, NARSType.SCRIPTED_OPENNARS)
+    agents: list[AsyncNARSAgent] = await asyncio.gather(*(
+        AsyncNARSAgent.create(nars_type, 'good', **({'seed': k} if scripted else {}))
+        for k in range(num_agents)))
+    threads: int = threading.active_count()
+    cpu_start: float = time.process_time()
+    start: float = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        await asyncio.gather(*(agent.update_perceptions(DEMO_PERCEPTIONS) for agent in agents))
+        await asyncio.sleep(update_period)
+    wall_time: float = time.perf_counter() - start
+    cpu_time: float = time.process_time() - cpu_start
+    result: dict = {
+        'agents': num_agents,
+        'threads': threads,
+        'cpu (s)': cpu_time,
+        'cpu share': cpu_time / wall_time,
+        'lines written': sum(agent.brain.num_written_lines for agent in agents),
+        'operations': sum(agent.total_operates for agent in agents),
+    }
+    await asyncio.gather(*(agent.disconnect_brain() for agent in agents))
+    return result
+
+
+def use_pidfd_child_watcher() -> None:
+    "Python 3.12之前，默认的子进程监视器为每个子进程开一个等待线程；支持pidfd的Linux上改用无线程的监视器"
+    if sys.version_info < (3, 12) and hasattr(os, 'pidfd_open'):
+        asyncio.set_child_watcher(asyncio.PidfdChildWatcher())
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Drive many asyncio NARS agents from one event loop')
+    parser.add_argument('--agents', type=int, nargs='+', default=[1, 16, 64])
+    parser.add_argument('--backend', default='scripted_ONA',
+                        help='NARS type (scripted backends run anywhere)')
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--update-period', type=float, default=0.2,
+                        help='seconds between updates of each agent (the game updates NARS every 200 ms)')
+    return parser.parse_args(argv)
+
+
+async def main(args: argparse.Namespace) -> None:
+    nars_type: NARSType = NARSType.from_str(args.backend)
+    print('| agents | threads | CPU (s) | CPU share | lines written | operations |')
+    print('|---|---|---|---|---|---|')
+    for num_agents in args.agents:
+        result: dict = await drive(nars_type, num_agents, args.seconds, args.update_period)
+        print(f'| {num_agents} | {result["threads"]} | {result["cpu (s)"]:.2f} | {result["cpu share"]:.1%} | '
+              f'{result["lines written"]} | {result["operations"]} |')
+
+
+if __name__ == '__main__':
+    use_pidfd_child_watcher()
+    asyncio.run(main(parse_args()))
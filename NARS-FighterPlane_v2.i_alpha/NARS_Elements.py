@@ -18,6 +18,7 @@ class NARSOperation():  # 现在不需要枚举类
             print(f'Warning: mutiple "^" in name of operation {name}')
         else:  # 否则默认设置
             self.name = name
+        self.read_time: float = None  # 从NARS程序输出中被读取的时间（用于延迟统计）
 
     @property
     def value(self) -> any:
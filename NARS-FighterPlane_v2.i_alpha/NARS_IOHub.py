@@ -0,0 +1,372 @@
+"""共享的NARS I/O线程：用一个基于selectors（Linux上为epoll）的事件循环，收发多个NARS程序的管道
+- 默认每个NARSProgram有各自的读取、写入线程；同一进程中有几十个智能体时，上百个线程会互相争抢GIL
+- 挂到IOHub上的程序不再启动自己的线程：输出由I/O线程按行读取、解析；待写入的语句仍存放在各程序自己的缓冲区中
+- 公平调度：每轮中，每个有待写入语句的程序最多写入QUANTUM条（合并为一次写入）；管道写满时不阻塞，等可写后再继续
+- 仅支持POSIX：Windows的select不能监听管道
+用法：
+    hub = IOHub()
+    program = NARSProgram.fromType(NARSType.ONA, io_hub=hub)  # 或：NARSPlanePlayer(..., io_hub=hub)、BrainPool(..., io_hub=hub)
+    program.terminate()  # 终止时自动脱离
+    hub.close()
+    python NARS_IOHub.py --brains 1 16 64 [--seconds 5]  # 对比「每程序两个线程」与「共享I/O线程」的线程数与CPU占用
+"""
+
+import os
+import time
+import argparse
+import threading
+import selectors
+from collections import deque
+
+from NARS_Program import NARSType, NARSProgram
+from NARS_Elements import NARSPerception
+from NARS_Latency import now, merge_trackers, STAGE_QUEUE
+from instruments import INSTRUMENTS
+
+QUANTUM: int = 8
+"每轮中，每个程序最多写入的语句数"
+READ_SIZE: int = 1 << 16
+"每次从管道读取的最大字节数"
+DETACH_TIMEOUT: float = 1.0
+"等待I/O线程确认脱离的最长时间（秒）"
+
+
+class _Channel:
+    "一个程序在I/O线程中的收发状态"
+
+    __slots__ = ('program', 'read_fd', 'write_fd', 'read_buffer', 'raw_lines',
+                 'out', 'in_flight', 'write_time', 'blocked', 'closed')
+
+    def __init__(self, program: NARSProgram) -> None:
+        self.program: NARSProgram = program
+        self.read_fd: int = program.process.stdout.fileno()
+        self.write_fd: int = program.process.stdin.fileno()
+        self.read_buffer: bytearray = bytearray()
+        self.raw_lines: deque[str] = deque()
+        "不经过缓冲区、优先写入的行（推理周期）"
+        self.out: bytes = b''
+        "已取出、尚未写完的字节"
+        self.in_flight: list[tuple[str, float, bool]] = []
+        "out中包含的语句（写完后统一记录）"
+        self.write_time: float = None
+        self.blocked: bool = False
+        "管道已满：等待可写事件"
+        self.closed: bool = False
+        "程序的输入已关闭：不再写入"
+
+    @property
+    def has_output(self) -> bool:
+        return not self.closed and bool(self.out or self.raw_lines or self.program._cached_cmds)
+
+
+class IOHub:
+    """在一个线程中服务多个NARS程序的stdin/stdout
+    - attach/detach：（由NARSProgram调用）挂上/脱离；脱离会等待I/O线程确认，之后才能安全关闭管道
+    - notify：（由write_line调用）标记程序有待写入的语句，必要时唤醒I/O线程
+    """
+
+    def __init__(self, quantum: int = QUANTUM, name: str = 'NARS-io-hub') -> None:
+        if os.name == 'nt':
+            raise OSError('IOHub needs selectable pipes, which Windows does not provide')
+        self.quantum: int = quantum
+        self._selector: selectors.BaseSelector = selectors.DefaultSelector()
+        self._wake_read, self._wake_write = os.pipe()  # 自唤醒管道
+        os.set_blocking(self._wake_read, False)
+        os.set_blocking(self._wake_write, False)
+        self._selector.register(self._wake_read, selectors.EVENT_READ, None)
+        self._channels: dict[NARSProgram, _Channel] = {}
+        self._pending: set[_Channel] = set()
+        "有待写入内容的程序"
+        self._requests: deque[tuple] = deque()
+        "待I/O线程处理的挂上/脱离请求"
+        self._sleeping: bool = False
+        self._wake_pending: bool = False
+        self._running: bool = True
+        # 统计
+        self.num_rounds: int = 0
+        self.num_reads: int = 0
+        self.num_writes: int = 0
+        self.num_blocked_writes: int = 0
+        self.thread: threading.Thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self.thread.start()
+
+    @property
+    def num_programs(self) -> int:
+        return len(self._channels)
+
+    # 程序接口 #
+
+    def attach(self, program: NARSProgram) -> None:
+        "挂上一个（已启动的）程序：此后它的输出由I/O线程读取、解析"
+        channel: _Channel = _Channel(program)
+        os.set_blocking(channel.write_fd, False)
+        self._channels[program] = channel
+        self._request(('attach', channel))
+        self.notify(program)  # 启动阶段的命令已在缓冲区中
+
+    def detach(self, program: NARSProgram) -> None:
+        "脱离一个程序（等待I/O线程确认后返回；未写完的内容被丢弃）"
+        if (channel := self._channels.pop(program, None)) is None:
+            return
+        if threading.current_thread() is self.thread or not self._running:
+            self._unregister(channel)
+            return
+        done: threading.Event = threading.Event()
+        self._request(('detach', channel, done))
+        done.wait(DETACH_TIMEOUT)
+
+    def notify(self, program: NARSProgram) -> None:
+        "程序有新的待写入内容"
+        if channel := self._channels.get(program):
+            self._pending.add(channel)
+            self._wake()
+
+    def write_raw(self, program: NARSProgram, line: str) -> None:
+        "不经过缓冲区、优先写入的一行（如推理周期数）"
+        if channel := self._channels.get(program):
+            channel.raw_lines.append(line)
+            self._pending.add(channel)
+            self._wake()
+
+    def close(self) -> None:
+        "停止I/O线程（仍挂着的程序不再收发，由其所有者终止）"
+        if not self._running:
+            return
+        self._running = False
+        self._wake(force=True)
+        self.thread.join()
+        for channel in list(self._channels.values()):
+            self._unregister(channel)
+        self._channels.clear()
+        self._selector.close()
+        os.close(self._wake_read)
+        os.close(self._wake_write)
+
+    def summary(self) -> dict[str, int]:
+        return {
+            'programs': self.num_programs,
+            'rounds': self.num_rounds,
+            'reads': self.num_reads,
+            'writes': self.num_writes,
+            'blocked writes': self.num_blocked_writes,
+        }
+
+    # 事件循环 #
+
+    def _request(self, request: tuple) -> None:
+        self._requests.append(request)
+        self._wake(force=True)
+
+    def _wake(self, force: bool = False) -> None:
+        "I/O线程在select中等待时，写入一个字节唤醒它（同一次等待只写一次）"
+        if (self._sleeping and not self._wake_pending) or force:
+            self._wake_pending = True
+            try:
+                os.write(self._wake_write, b'\0')
+            except (BlockingIOError, OSError):  # 管道已满（已有待处理的唤醒）或已关闭
+                pass
+
+    def _loop(self) -> None:
+        while True:
+            while self._requests:
+                self._handle_request(self._requests.popleft())
+            if not self._running:
+                break
+            self._sleeping = True  # 先标记再检查：notify要么被这里看到，要么会唤醒select
+            writable: bool = any(not channel.blocked for channel in list(self._pending))
+            events = self._selector.select(0 if writable or self._requests else None)
+            self._sleeping = False
+            self.num_rounds += 1
+            with INSTRUMENTS.section('nars.io_hub'):
+                for key, mask in events:
+                    if (channel := key.data) is None:
+                        self._drain_wake()
+                    elif key.fd == channel.read_fd:
+                        self._read(channel)
+                    else:  # 管道重新可写
+                        self._selector.unregister(channel.write_fd)
+                        channel.blocked = False
+                for channel in list(self._pending):
+                    if channel.blocked:
+                        continue
+                    self._pending.discard(channel)  # 先移除再检查：不会漏掉期间入队的语句
+                    self._flush(channel)
+                    if channel.has_output:
+                        self._pending.add(channel)
+
+    def _handle_request(self, request: tuple) -> None:
+        if request[0] == 'attach':
+            channel: _Channel = request[1]
+            if self._channels.get(channel.program) is channel:  # 挂上前未被脱离
+                self._selector.register(channel.read_fd, selectors.EVENT_READ, channel)
+        else:
+            _, channel, done = request
+            self._unregister(channel)
+            done.set()
+
+    def _unregister(self, channel: _Channel) -> None:
+        channel.closed = True
+        self._pending.discard(channel)
+        for fd in (channel.read_fd, channel.write_fd):
+            try:
+                self._selector.unregister(fd)
+            except (KeyError, ValueError):  # 未注册（尚未挂上、已读到结尾或未被阻塞）
+                pass
+
+    def _drain_wake(self) -> None:
+        self._wake_pending = False
+        try:
+            while os.read(self._wake_read, READ_SIZE):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _read(self, channel: _Channel) -> None:
+        "读取一次输出，把完整的行交给程序处理；读到结尾则不再监听"
+        try:
+            data: bytes = os.read(channel.read_fd, READ_SIZE)
+        except OSError:
+            data = b''
+        self.num_reads += 1
+        buffer: bytearray = channel.read_buffer
+        if not data:
+            self._selector.unregister(channel.read_fd)
+            if buffer:  # 最后一行没有换行符
+                channel.program.on_output_line(buffer.decode(errors='replace'))
+                buffer.clear()
+            return
+        buffer += data
+        if (end := buffer.rfind(b'\n')) < 0:
+            return
+        lines: list[bytes] = buffer[:end].split(b'\n')
+        del buffer[:end + 1]
+        for line in lines:
+            channel.program.on_output_line(line.decode(errors='replace').rstrip('\r') + '\n')
+
+    def _flush(self, channel: _Channel) -> None:
+        "向程序写入一批内容（推理周期 + 至多quantum条语句）；管道已满时等待可写"
+        program: NARSProgram = channel.program
+        if not channel.out:
+            lines: list[str] = []
+            while channel.raw_lines:
+                lines.append(channel.raw_lines.popleft())
+            cmds: list = program._cached_cmds
+            n: int = min(self.quantum, len(cmds))
+            channel.in_flight = cmds[:n]
+            del cmds[:n]
+            lines += [cmd for cmd, _, _ in channel.in_flight]
+            if not lines:
+                return
+            channel.out = ('\n'.join(lines) + '\n').encode()
+            channel.write_time = now()
+        try:
+            written: int = os.write(channel.write_fd, channel.out)
+        except BlockingIOError:
+            written = 0
+        except OSError:  # 程序已终止（输入已关闭）
+            channel.closed = True
+            channel.out = b''
+            return
+        self.num_writes += 1
+        channel.out = channel.out[written:]
+        if channel.out:
+            self.num_blocked_writes += 1
+            channel.blocked = True
+            self._selector.register(channel.write_fd, selectors.EVENT_WRITE, channel)
+            return
+        written_time: float = now()
+        for cmd, enqueue_time, is_perception in channel.in_flight:
+            program.on_written(cmd, enqueue_time, channel.write_time, written_time, is_perception)
+        channel.in_flight = []
+
+
+# 线程数与CPU占用对比 #
+
+MODE_THREADS: str = 'threads'
+"每个程序各自的读取、写入线程"
+MODE_HUB: str = 'hub'
+"所有程序共用一个I/O线程"
+
+BENCHMARK_PERCEPTIONS: list[NARSPerception] = [
+    NARSPerception('enemy', 'left'),
+    NARSPerception('enemy', 'right'),
+    NARSPerception('enemy', 'ahead'),
+    NARSPerception.new_self('still'),
+]
+"每次更新送入的感知（与游戏中一次对敌、移动感知的规模相当）"
+
+
+def benchmark(nars_type: NARSType, num_brains: int, mode: str, seconds: float,
+              update_period: float) -> dict[str, float]:
+    "启动num_brains个程序，按游戏的节奏（每update_period秒一次感知→目标→推理）驱动seconds秒"
+    hub: IOHub = IOHub() if mode == MODE_HUB else None
+    operations: list[int] = [0]
+
+    def on_operation(operation) -> None:
+        operations[0] += 1
+
+    scripted: bool = nars_type in (NARSType.SCRIPTED_ONA, NARSType.SCRIPTED_OPENNARS)
+    programs: list[NARSProgram] = [
+        NARSProgram.fromType(nars_type, io_hub=hub, **({'seed': k} if scripted else {}))
+        for k in range(num_brains)]
+    for program in programs:
+        program.operationHook = on_operation
+        program.latency.reset()
+    threads: int = threading.active_count()
+    cpu_start: float = time.process_time()
+    start: float = time.perf_counter()
+    next_update: float = start
+    while (current := time.perf_counter()) - start < seconds:
+        if current < next_update:
+            time.sleep(next_update - current)
+            continue
+        next_update += update_period
+        for program in programs:
+            for perception in BENCHMARK_PERCEPTIONS:
+                program.add_perception(perception)
+            program.put_goal('good')
+            program.update_inference_cycles()
+    wall_time: float = time.perf_counter() - start
+    cpu_time: float = time.process_time() - cpu_start
+    queue_wait = merge_trackers((program.latency for program in programs), stages=(STAGE_QUEUE,))[STAGE_QUEUE]
+    result: dict[str, float] = {
+        'brains': num_brains,
+        'mode': mode,
+        'threads': threads,
+        'cpu (s)': cpu_time,
+        'cpu share': cpu_time / wall_time,
+        'lines written': sum(program.num_written_lines for program in programs),
+        'lines read': sum(program.num_read_lines for program in programs),
+        'operations': operations[0],
+        'queue wait p95 (ms)': queue_wait.percentile(95) * 1e3,
+    }
+    for program in programs:
+        program.terminate()
+    hub and hub.close()
+    return result
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Compare per-program I/O threads with one shared selector thread')
+    parser.add_argument('--brains', type=int, nargs='+', default=[1, 16, 64])
+    parser.add_argument('--backend', default='scripted_ONA',
+                        help='NARS type (scripted backends run anywhere)')
+    parser.add_argument('--seconds', type=float, default=5.0,
+                        help='wall time to drive each configuration')
+    parser.add_argument('--update-period', type=float, default=0.2,
+                        help='seconds between updates of each brain (the game updates NARS every 200 ms)')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args: argparse.Namespace = parse_args()
+    nars_type: NARSType = NARSType.from_str(args.backend)
+    print('| brains | mode | threads | CPU (s) | CPU share | lines written | lines read | operations | queue wait p95 (ms) |')
+    print('|---|---|---|---|---|---|---|---|---|')
+    for num_brains in args.brains:
+        for mode in (MODE_THREADS, MODE_HUB):
+            result: dict = benchmark(nars_type, num_brains, mode, args.seconds, args.update_period)
+            print(f'| {num_brains} | {mode} | {result["threads"]} | {result["cpu (s)"]:.2f} | '
+                  f'{result["cpu share"]:.1%} | {result["lines written"]} | {result["lines read"]} | '
+                  f'{result["operations"]} | {result["queue wait p95 (ms)"]:.2f} |')
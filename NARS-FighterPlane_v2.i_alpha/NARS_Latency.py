@@ -0,0 +1,171 @@
+"""NARS通信的延迟统计
+- 语句：入队（write_line）→ 写入（_add_to_cmd开始）→ 刷新（flush完成）
+- 操作：读取（read_line解析出操作）→ 应用（游戏中被执行）
+- 往返：感知入队 → 对应操作被读取
+各阶段使用对数分桶直方图记录，O(1)写入，按需估计p50/p95/p99
+每个程序有自己的统计（往返时间只以本程序的感知为起点）；需要后端或整局的分布时，用merge_trackers合并
+"""
+
+from math import log
+from time import perf_counter as now  # 统一使用单调高精度时钟
+
+STAGE_QUEUE: str = 'queue'
+"语句在缓冲区中等待的时间（入队→写入）"
+STAGE_FLUSH: str = 'flush'
+"语句写入管道的时间（写入→刷新）"
+STAGE_ROUND_TRIP: str = 'round trip'
+"往返时间（感知入队→操作读取）"
+STAGE_APPLY: str = 'apply'
+"操作被游戏应用的时间（读取→应用）"
+
+STAGES: tuple[str] = (STAGE_QUEUE, STAGE_FLUSH, STAGE_ROUND_TRIP, STAGE_APPLY)
+
+PERCENTILES: tuple[int] = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """对数分桶的延迟直方图
+    - 桶边界按固定比例增长（默认每桶约9%），覆盖1微秒到约100秒
+    - 记录只需一次对数运算与计数；分位数误差不超过一个桶宽
+    """
+
+    MIN_SECONDS: float = 1e-6
+    GROWTH: float = 2 ** (1 / 8)
+    NUM_BUCKETS: int = 216  # 1e-6 * GROWTH**216 ≈ 130 秒
+
+    def __init__(self) -> None:
+        self._log_growth: float = log(self.GROWTH)
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts: list[int] = [0] * self.NUM_BUCKETS
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+        self._cached_count: int = -1  # 分位数缓存对应的记录数
+        self._cached_percentiles: dict[int, float] = {}
+
+    def record(self, seconds: float) -> None:
+        "记录一个延迟（秒）"
+        if seconds < self.MIN_SECONDS:
+            index = 0
+        else:
+            index = min(
+                int(log(seconds / self.MIN_SECONDS) / self._log_growth),
+                self.NUM_BUCKETS - 1
+            )
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def bucket_upper_bound(self, index: int) -> float:
+        return self.MIN_SECONDS * self.GROWTH ** (index + 1)
+
+    def percentile(self, p: float) -> float:
+        "估计第p百分位的延迟（秒），无记录时返回0"
+        if not self.count:
+            return 0.0
+        rank: float = self.count * p / 100
+        cumulative: int = 0
+        for index, n in enumerate(self.counts):
+            cumulative += n
+            if cumulative >= rank:
+                return min(self.bucket_upper_bound(index), self.max)
+        return self.max
+
+    def percentiles(self, ps: tuple[int] = PERCENTILES) -> dict[int, float]:
+        "批量获取分位数（记录数不变时使用缓存）"
+        if self._cached_count != self.count or set(ps) - set(self._cached_percentiles):
+            self._cached_percentiles = {p: self.percentile(p) for p in ps}
+            self._cached_count = self.count
+        return self._cached_percentiles
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        "并入另一个直方图的全部记录"
+        for index, n in enumerate(other.counts):
+            if n:
+                self.counts[index] += n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+
+class LatencyTracker:
+    """一个程序的各阶段延迟
+    - 往返时间以「读取操作前，最近一条已刷新的感知」为起点：即「操作所能依据的最新信息」的陈旧程度
+    """
+
+    def __init__(self, backend: str) -> None:
+        self.backend: str = backend
+        self.histograms: dict[str, LatencyHistogram] = {
+            stage: LatencyHistogram()
+            for stage in STAGES
+        }
+        self.last_perception_enqueue_time: float = None  # 最近一条已刷新的感知的入队时间
+
+    def __getitem__(self, stage: str) -> LatencyHistogram:
+        return self.histograms[stage]
+
+    def record(self, stage: str, seconds: float) -> None:
+        self.histograms[stage].record(seconds)
+
+    def on_written(self, enqueue_time: float, write_time: float, flush_time: float, is_perception: bool) -> None:
+        "一条语句被写入并刷新"
+        self.histograms[STAGE_QUEUE].record(write_time - enqueue_time)
+        self.histograms[STAGE_FLUSH].record(flush_time - write_time)
+        if is_perception:
+            self.last_perception_enqueue_time = enqueue_time
+
+    def on_operation_read(self, read_time: float) -> None:
+        "读取到一个操作"
+        if self.last_perception_enqueue_time is not None:
+            self.histograms[STAGE_ROUND_TRIP].record(
+                read_time - self.last_perception_enqueue_time)
+
+    def on_operation_applied(self, read_time: float, apply_time: float) -> None:
+        "一个（读取到的）操作在游戏中被应用"
+        self.histograms[STAGE_APPLY].record(apply_time - read_time)
+
+    def reset(self) -> None:
+        for histogram in self.histograms.values():
+            histogram.reset()
+        self.last_perception_enqueue_time = None
+
+    def merge(self, other: 'LatencyTracker', stages: tuple[str] = STAGES) -> None:
+        "并入另一个程序的统计（各阶段分别合并）"
+        for stage in stages:
+            self.histograms[stage].merge(other.histograms[stage])
+
+    def snapshot(self, stages: tuple[str] = STAGES) -> dict[str, float]:
+        "导出各阶段的分位数（毫秒），形如「round trip p95 (ms)」"
+        return {
+            f'{stage} p{p} (ms)': seconds * 1000
+            for stage in stages
+            for p, seconds in self.histograms[stage].percentiles().items()
+        }
+
+    def report(self) -> str:
+        "生成可读的延迟报告"
+        lines: list[str] = [f'Latency of {self.backend}:']
+        for stage, histogram in self.histograms.items():
+            ps = histogram.percentiles()
+            lines.append(
+                f'  {stage:>10}: n={histogram.count:<8d} ' +
+                ' '.join(f'p{p}={ps[p] * 1000:.3f}ms' for p in PERCENTILES) +
+                f' max={histogram.max * 1000:.3f}ms'
+            )
+        return '\n'.join(lines)
+
+
+def merge_trackers(trackers, backend: str = '', stages: tuple[str] = STAGES) -> LatencyTracker:
+    "合并多个程序的延迟统计（得到一个后端或整局的总体分布；只合并给出的阶段）"
+    merged: LatencyTracker = LatencyTracker(backend)
+    for tracker in trackers:
+        merged.merge(tracker, stages)
+    return merged
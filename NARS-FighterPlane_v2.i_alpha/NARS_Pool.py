@@ -0,0 +1,128 @@
+"""NARS程序的「热」进程池：已启动的后端在多局游戏、多个回合之间复用
+- lease(**配置)：租出一个该配置的空闲程序（没有空闲时「冷启动」一个新的）
+- release(程序)：用后端的重置指令（`*reset`）清空其记忆，等输出静默后放回池中；不支持重置（或迟迟不静默）的后端直接终止
+- 每次租用都记录「租用→第一条语句写入后端」的时间，按热/冷分别统计
+用法：
+    pool = BrainPool(NARSType.ONA)
+    pool.warm(2)  # 预热两个（默认配置）
+    agent = NARSPlanePlayer(NARSType.ONA, brain_pool=pool)  # 从池中租用同配置的程序
+    agent.disconnect_brain()  # 归还（而不是终止）
+    python NARS_Pool.py --backend scripted_ONA [--leases 10]  # 对比冷/热租用的耗时
+"""
+
+import time
+import threading
+import argparse
+
+from NARS_Program import NARSType, NARSProgram
+from NARS_Latency import LatencyHistogram, now
+
+LEASE_WARM: str = 'warm'
+"从池中取出已启动的程序"
+LEASE_COLD: str = 'cold'
+"池中没有空闲程序，租用时才启动"
+
+
+class BrainPool:
+    """同一类型的NARS程序池（按程序的配置分别存放）
+    - 线程安全：多个智能体可同时租用/归还
+    - 池中的程序已断开操作钩子，租用者需重新设置（NARSAgent.equip_brain会处理）
+    """
+
+    def __init__(self, nars_type: NARSType, io_hub=None) -> None:
+        "io_hub：池中程序共用的I/O线程（见NARS_IOHub；为空则各自使用自己的线程）"
+        self.nars_type: NARSType = nars_type
+        self.io_hub = io_hub
+        self._idle: dict[str, list[NARSProgram]] = {}
+        "配置 → 空闲的程序"
+        self._leased: dict[NARSProgram, tuple[str, int]] = {}
+        "已租出的程序 → (配置, 租出时的推理周期频率)：归还时恢复租用者修改过的频率"
+        self._lock: threading.Lock = threading.Lock()
+        self.num_leases: dict[str, int] = {LEASE_WARM: 0, LEASE_COLD: 0}
+        self.lease_latency: dict[str, LatencyHistogram] = {
+            LEASE_WARM: LatencyHistogram(), LEASE_COLD: LatencyHistogram()}
+        "租用→第一条语句写入后端的时间（秒）"
+
+    @staticmethod
+    def _key(brain_options: dict) -> str:
+        return repr(sorted(brain_options.items()))
+
+    @property
+    def num_idle(self) -> int:
+        return sum(map(len, self._idle.values()))
+
+    def warm(self, size: int, **brain_options) -> None:
+        "预先启动程序，直到池中至少有size个该配置的空闲程序"
+        key: str = self._key(brain_options)
+        while len(self._idle.get(key, ())) < size:
+            program: NARSProgram = NARSProgram.fromType(self.nars_type, self.io_hub, **brain_options)
+            with self._lock:
+                self._idle.setdefault(key, []).append(program)
+
+    def lease(self, **brain_options) -> NARSProgram:
+        "租出一个该配置的程序（优先使用空闲的；brain_options：传递给具体程序的配置）"
+        leased_at: float = now()
+        key: str = self._key(brain_options)
+        with self._lock:
+            idle: list[NARSProgram] = self._idle.get(key)
+            program: NARSProgram = idle.pop() if idle else None
+        kind: str = LEASE_WARM if program else LEASE_COLD
+        if program is None:
+            program = NARSProgram.fromType(self.nars_type, self.io_hub, **brain_options)
+        with self._lock:
+            self._leased[program] = key, program.inference_cycle_frequency
+            self.num_leases[kind] += 1
+        program.lease(leased_at, self.lease_latency[kind].record)
+        return program
+
+    def release(self, program: NARSProgram) -> None:
+        "归还程序：能重置的等其处理完先前的输入（输出静默）再放回池中，避免上一次的操作传给下一个租用者；否则终止"
+        with self._lock:
+            key, program.inference_cycle_frequency = self._leased.pop(program)
+        if program.reset() and program.wait_until_quiet():
+            with self._lock:
+                self._idle.setdefault(key, []).append(program)
+        else:
+            program.terminate()
+
+    def close(self) -> None:
+        "终止所有空闲程序（已租出的由租用者负责）"
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for programs in idle.values():
+            for program in programs:
+                program.terminate()
+
+    def summary(self) -> dict[str, float]:
+        "租用统计：各类租用的次数与「租用→第一条语句写入」的平均/最大耗时（毫秒）"
+        summary: dict[str, float] = {}
+        for kind, histogram in self.lease_latency.items():
+            summary[f'{kind} leases'] = self.num_leases[kind]
+            if histogram.count:
+                summary[f'{kind} lease to first write mean (ms)'] = histogram.mean * 1e3
+                summary[f'{kind} lease to first write max (ms)'] = histogram.max * 1e3
+        return summary
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Compare lease-to-first-write times of cold and warm NARS programs')
+    parser.add_argument('--backend', default='scripted_ONA',
+                        help=f'NARS type ({", ".join(t.value for t in NARSType)})')
+    parser.add_argument('--leases', type=int, default=10,
+                        help='lease/release rounds (the first one starts cold)')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args: argparse.Namespace = parse_args()
+    pool = BrainPool(NARSType.from_str(args.backend))
+    for _ in range(args.leases):
+        program: NARSProgram = pool.lease()
+        program.put_goal('good')
+        while program.lease_to_first_write is None:  # 等待写入线程送出
+            time.sleep(0.001)
+        pool.release(program)
+    pool.close()
+    for key, value in pool.summary().items():
+        print(f'{key}: {value:.3f}' if isinstance(value, float) else f'{key}: {value}')
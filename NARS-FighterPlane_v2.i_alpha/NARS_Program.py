@@ -7,12 +7,17 @@ import threading  # 用于打开线程
 import queue
 import subprocess  # 用于打开进程
 import signal  # 用于终止程序
+import sys  # 用于启动「替身NARS」脚本
+import time
+import os
 
 from enum import Enum  # 枚举NARS类型
 
 from NARS_Elements import *  # 导入各类元素（从命令行返回到具体NARS元素）
-
-DEBUG: bool = True
+from NARS_Latency import LatencyTracker, now  # 延迟统计
+from instruments import INSTRUMENTS  # 热点计时
+from logger import LOG_IO  # 异步日志（替代print）
+from NARS_Recording import IORecorder, KIND_LAUNCH, KIND_WRITE, KIND_CYCLES, KIND_READ  # I/O录制
 
 
 class NARSType(Enum):
@@ -24,6 +29,8 @@ class NARSType(Enum):
     ONA: str = 'ONA'
     ONA_OLD: str = 'ONA_old'
     PYTHON: str = 'python'
+    SCRIPTED_OPENNARS: str = 'scripted_opennars'
+    SCRIPTED_ONA: str = 'scripted_ONA'
 
     @staticmethod
     def from_str(type_str):
@@ -37,6 +44,10 @@ class NARSType(Enum):
                 return NARSType.ONA_OLD
             case 'python':
                 return NARSType.PYTHON
+            case 'scripted_opennars':
+                return NARSType.SCRIPTED_OPENNARS
+            case 'scripted_ona':
+                return NARSType.SCRIPTED_ONA
 
     @staticmethod
     @property
@@ -78,39 +89,142 @@ class NARSProgram:
     OPERATION_REGISTER_TEMPLATE: str = BABBLE_TEMPLATE  # 暂时使用Babble的模板
     '指示「自我有一个可用的（基本）操作」（操作注册）'
 
+    WRITER_IDLE_TIMEOUT: float = 0.1
+    '写入线程空闲时的最长等待（秒）：用于及时发现程序已终止'
+
+    RESET_COMMAND: str = '*reset'
+    '清空后端记忆的指令（为空则不支持重置，见reset）'
+
+    RESET_QUIET_S: float = 0.05
+    '重置后输出静默多久，才视为后端已处理完先前的输入（见wait_until_quiet）'
+
+    RESET_TIMEOUT_S: float = 1.0
+    '等待重置后静默的最长时间（秒）'
+
+    OPTIONS: tuple[str] = ()
+    '构造时接受的配置项（见fromType、check_options）'
+
     # 程序构造入口 #
 
     @staticmethod
-    def fromType(type: NARSType):
+    def classFromType(type: NARSType):
+        "类型对应的程序类"
+        return {
+            NARSType.OPENNARS: opennars,
+            NARSType.ONA: ONA,
+            NARSType.ONA_OLD: ONA,
+            NARSType.PYTHON: Python,
+            NARSType.SCRIPTED_OPENNARS: ScriptedOpenNARS,
+            NARSType.SCRIPTED_ONA: ScriptedONA,
+        }[type]
+
+    @staticmethod
+    def check_options(type: NARSType, options: dict) -> None:
+        "检查配置项都能被该类型的程序接受，否则抛出ValueError（供调用方在启动任何程序之前尽早报错）"
+        if unsupported := set(options) - set(NARSProgram.classFromType(type).OPTIONS):
+            raise ValueError(
+                f'NARS type {type.value} does not accept options: {", ".join(sorted(unsupported))}')
+
+    @staticmethod
+    def fromType(type: NARSType, io_hub=None, **options):
+        "根据类型构造程序（io_hub：由共享的I/O线程收发，见NARS_IOHub；options会被传递给具体程序的构造函数，须在其OPTIONS之内）"
+        NARSProgram.check_options(type, options)
         if type == NARSType.OPENNARS:
-            return opennars()
+            return opennars(io_hub=io_hub, **options)
         if type == NARSType.ONA:
-            return ONA()
+            return ONA(io_hub=io_hub, **options)
         if type == NARSType.ONA_OLD:
-            return ONA(r'.\NAR_old.exe')
+            return ONA(**{'exe_path': r'.\NAR_old.exe', **options}, io_hub=io_hub)
         if type == NARSType.PYTHON:
-            return Python()
+            return Python(io_hub=io_hub, **options)
+        if type == NARSType.SCRIPTED_OPENNARS:
+            return ScriptedOpenNARS(io_hub=io_hub, **options)
+        if type == NARSType.SCRIPTED_ONA:
+            return ScriptedONA(io_hub=io_hub, **options)
 
     # 程序/进程相关 #
 
-    def __init__(self, operationHook=None):
-        "初始化NARS程序：启动命令行、连接「NARS计算机实现」、启动线程"
+    def __init__(self, operationHook=None, io_hub=None):
+        "初始化NARS程序：启动命令行、连接「NARS计算机实现」、启动线程（有io_hub时改由其I/O线程收发）"
         "推理循环频率"
         # set too large will get delayed and slow down the game
         self.inference_cycle_frequency: int = 1
         "🆕存储输出「纳思操作」的钩子：在从命令行读取到操作时，输出到对应函数中"
         self.operationHook = operationHook
-        self._cached_cmds: list[str] = []  # 定义一个先进先出队列，存储待写入的指令
+        # 定义一个先进先出队列，存储待写入的指令：(指令, 入队时间, 是否为感知)
+        self._cached_cmds: list[tuple[str, float, bool]] = []
+        # 缓冲区非空的信号：写入线程空闲时等待它，而不是空转（多个程序并存时，空转的线程会互相争抢GIL）
+        self._cmds_available: threading.Event = threading.Event()
+        # 吞吐量统计：累计写入的语句数、读取的行数
+        self.num_written_lines: int = 0
+        self.num_read_lines: int = 0
+        # 延迟统计（每个实例独立：往返时间只以本程序的感知为起点，各线程也不会同时更新同一个直方图）
+        self.latency: LatencyTracker = LatencyTracker(self.__class__.__name__)
+        # I/O录制器（为空则不录制）
+        self.recorder: IORecorder = None
+        # 租用统计（见lease）：租用时间（记录后空置）、租用到第一条语句写入的时间、记录时的回调
+        self.leased_at: float = None
+        self.lease_to_first_write: float = None
+        self.on_first_write = None
+        self.io_hub = io_hub
         self.launch_nars()
-        self.launch_thread_read()
-        self.launch_thread_write()
+        self.num_launch_cmds: int = self.num_cached_cmds  # 启动阶段写入的命令数（录制时单独标记）
+        if io_hub:
+            io_hub.attach(self)
+        else:
+            self.launch_thread_read()
+            self.launch_thread_write()
 
     # 用析构函数替代「process_kill」方法
     def __del__(self):
         "程序结束时，自动终止NARS"
         self.terminate()
 
+    def start_recording(self, path: str, tick_source=None) -> IORecorder:
+        "开始录制I/O流（tick_source：返回当前游戏帧号的函数）"
+        self.stop_recording()
+        self.recorder = IORecorder(path, self.__class__.__name__, tick_source)
+        return self.recorder
+
+    def stop_recording(self) -> None:
+        if recorder := self.recorder:
+            self.recorder = None
+            recorder.close()
+
+    def lease(self, leased_at: float, on_first_write=None) -> None:
+        "（由进程池调用）标记被租用：租用后第一条语句写入后端时，记录「租用→写入」的时间（秒）并传给on_first_write"
+        self.lease_to_first_write = None
+        self.latency.reset()  # 只统计本次租用
+        self.on_first_write = on_first_write
+        self.leased_at = leased_at
+
+    def reset(self) -> bool:
+        "清空后端的记忆（供复用）：丢弃未写入的指令，断开操作钩子，发送重置指令；返回是否支持重置"
+        if not self.RESET_COMMAND or self.process is None:
+            return False
+        self.stop_recording()
+        self.operationHook = None
+        self.leased_at = self.on_first_write = None
+        self.clear_cached_cmds()
+        self.write_line(self.RESET_COMMAND)
+        self.write_line('*volume=0')  # 重置后音量可能恢复默认
+        return True
+
+    def wait_until_quiet(self, quiet: float = RESET_QUIET_S, timeout: float = RESET_TIMEOUT_S) -> bool:
+        "等待缓冲区中的指令全部写入、且输出静默quiet秒（如：重置后，上一次租用的输入所引发的输出已读完）；超时返回False"
+        deadline: float = now() + timeout
+        num_read_lines, quiet_since = self.num_read_lines, now()
+        while now() < deadline:
+            time.sleep(quiet / 5)
+            if self.num_cached_cmds or self.num_read_lines != num_read_lines:
+                num_read_lines, quiet_since = self.num_read_lines, now()
+            elif now() - quiet_since >= quiet:
+                return True
+        return False
+
     def terminate(self):
+        self.stop_recording()
+        self.io_hub and self.io_hub.detach(self)  # 先停止收发，再关闭管道
         try:
             self.process.send_signal(signal.CTRL_C_EVENT)
             self.process.terminate()
@@ -137,18 +251,20 @@ class NARSProgram:
         "直接启动程序"
         pass
 
-    def launch_thread(self, target, args) -> threading.Thread:
+    def launch_thread(self, target, args, name: str = None) -> threading.Thread:
         "通用：开启线程（返回开启的线程）"
-        self.read_line_thread = threading.Thread(
+        thread = threading.Thread(
             target=target,
-            args=args
+            args=args,
+            name=name  # 线程名：便于在追踪/性能分析中区分
         )
 
         # 将线程设置为守护线程，即在程序退出时自动终止线程
-        self.read_line_thread.daemon = True
+        thread.daemon = True
 
         # 启动线程
-        self.read_line_thread.start()
+        thread.start()
+        return thread
 
     def launch_thread_read(self):
         "开启子线程，负责接收NARS程序的输出"
@@ -156,7 +272,8 @@ class NARSProgram:
         self.read_line_thread = self.launch_thread(
             target=self.read_line,  # 目标函数是 self.read_line
             # 将 self.process.stdout 作为参数传递给 self.read_line 方法
-            args=(self.process.stdout,)
+            args=(self.process.stdout,),
+            name=f'NARS-reader-{self.__class__.__name__}'
         )
 
     def launch_thread_write(self):
@@ -165,7 +282,8 @@ class NARSProgram:
         self.write_line_thread = self.launch_thread(
             target=self.async_write_lines,  # 目标函数是 self.write_line
             # 将 self.process.stdout 作为参数传递给 self.write_line 方法
-            args=(self.process.stdin,)
+            args=(self.process.stdin,),
+            name=f'NARS-writer-{self.__class__.__name__}'
         )
 
     # 语句相关 #
@@ -173,7 +291,8 @@ class NARSProgram:
         "统一添加感知"
         self.write_line(
             self.__class__.SENSE_TEMPLATE % (
-                perception.object, perception.adjective)  # 套模板
+                perception.object, perception.adjective),  # 套模板
+            is_perception=True  # 作为「往返延迟」的起点
         )
 
     # 目标
@@ -217,13 +336,24 @@ class NARSProgram:
 
     def read_line(self, out):  # read line without blocking
         "读取程序的（命令行）输出"
-        for line in iter(out.readline, b'\n'):  # get operations
+        for line in iter(out.readline, ''):  # get operations（文本模式下，读到空串即输出流关闭）
+            self.on_output_line(line)
+        out.close()  # 关闭输出流
+
+    def on_output_line(self, line: str) -> None:
+        "处理程序输出的一行：录制、截取操作并交给钩子（读取线程与I/O线程共用）"
+        self.num_read_lines += 1
+        if recorder := self.recorder:
+            recorder.record(KIND_READ, line.rstrip('\n'))
+        with INSTRUMENTS.section('nars.read'):
             if operation_name := self.catch_operation_name(line):  # 从一行语句中获得操作
                 operation: NARSOperation = NARSOperation(
                     operation_name)  # 从字符串到操作（打包）
-                if self.operationHook:  # 若非空
+                operation.read_time = now()  # 记录读取时间
+                self.latency.on_operation_read(operation.read_time)
+                # 若非空；刚被租用、尚未写入语句时读到的操作仍属于上一次租用，丢弃
+                if self.operationHook and self.leased_at is None:
                     self.operationHook(operation)  # 直接传递一个「纳思操作」到指定位置
-        out.close()  # 关闭输出流
 
     def catch_operation_name(self, line: str):
         "从输出的一行（语句）中获取信息，并返回截取到的「操作字符串」"
@@ -241,22 +371,53 @@ class NARSProgram:
     def async_write_lines(self, stdin):
         "从自身指令缓冲区中读取输入，送入程序的stdin中"
         while self.process != None:  # 始终运行，读取缓冲区中的指令列表
+            if not self._cached_cmds:
+                # 等待新的指令（超时后重新检查进程是否已终止）
+                self._cmds_available.wait(self.WRITER_IDLE_TIMEOUT)
+                self._cmds_available.clear()  # 清除后回到循环开头重新检查，不会漏掉期间入队的指令
+                continue
             if self._cached_cmds:
-                cmd: str = self._cached_cmds.pop(0)  # 取最开头（）
-                self._add_to_cmd(cmd)  # 异步调用（不阻塞主进程）
-                if (n_cmds := self.num_cached_cmds) > 0xff:
-                    print(
-                        f"Warning: The number of cached commands has exceeded the limit with n={n_cmds}!",
-                        f'> Last cmd is: {cmd}', sep='\n'
-                    )
-
-    # @measure_time
-    def write_line(self, cmd: str):
-        "缓存命令到缓冲区中"
-        DEBUG and print(f'add {cmd} to {self.num_cached_cmds}')
-        self._cached_cmds.append(cmd)  # 存入缓冲区
+                cmd, enqueue_time, is_perception = self._cached_cmds.pop(0)  # 取最开头（）
+                write_time: float = now()
+                try:
+                    self._add_to_cmd(cmd)  # 异步调用（不阻塞主进程）
+                except (AttributeError, ValueError, OSError):  # 程序已终止（输入已关闭）
+                    break
+                self.on_written(cmd, enqueue_time, write_time, now(), is_perception)
+
+    def on_written(self, cmd: str, enqueue_time: float, write_time: float, written_time: float,
+                   is_perception: bool) -> None:
+        "一条指令已写入程序：录制、计数与延迟统计（写入线程与I/O线程共用）"
+        is_launch: bool = self.num_written_lines < self.num_launch_cmds
+        if recorder := self.recorder:
+            recorder.record(KIND_LAUNCH if is_launch else KIND_WRITE, cmd)
+        self.num_written_lines += 1
+        self.latency.on_written(
+            enqueue_time, write_time, written_time, is_perception)
+        if (leased_at := self.leased_at) is not None and enqueue_time >= leased_at \
+                and not is_launch and not cmd.startswith('*'):  # 租用后的第一条语句（不计启动命令与指令）
+            self.leased_at = None
+            self.lease_to_first_write = written_time - leased_at
+            if on_first_write := self.on_first_write:
+                on_first_write(self.lease_to_first_write)
+        if (n_cmds := self.num_cached_cmds) > 0xff:
+            LOG_IO.warning(
+                'The number of cached commands has exceeded the limit with n=%d! Last cmd is: %s',
+                n_cmds, cmd
+            )
+
+    @INSTRUMENTS.timed('nars.write')
+    def write_line(self, cmd: str, is_perception: bool = False):
+        "缓存命令到缓冲区中（附带入队时间）"
+        LOG_IO.debug('add %s to %d', cmd, len(self._cached_cmds))
+        self._cached_cmds.append((cmd, now(), is_perception))  # 存入缓冲区
+        if io_hub := self.io_hub:
+            io_hub.notify(self)  # 唤醒I/O线程
+        else:
+            self._cmds_available.set()  # 唤醒写入线程
         return  # 代码删除后记：不适宜「对每个输入的语句都开一个新线程」，对系统占用的开销太大
 
+    @INSTRUMENTS.timed('nars.writer')
     def _add_to_cmd(self, cmd: str):
         "向命令行添加命令"
         self.process.stdin.write(cmd + '\n')  # TODO：（只能输入单行）主要代码性能卡在这行的执行时间上
@@ -265,6 +426,11 @@ class NARSProgram:
 
     def add_inference_cycles(self, num: int):
         "推理循环步进"
+        if recorder := self.recorder:
+            recorder.record(KIND_CYCLES, str(num))
+        if io_hub := self.io_hub:  # 管道由I/O线程独占：交给它（先于缓冲区中的语句写入，与直接写入一致）
+            io_hub.write_raw(self, f'{num}')
+            return
         self.process.stdin.write(f'{num}\n')
         self.process.stdin.flush()
 
@@ -280,6 +446,8 @@ class opennars(NARSProgram):
     DEFAULT_JAR_PATH: str = r'.\opennars.jar'
     "可执行文件路径"
 
+    OPTIONS: tuple[str] = ('jar_path',)
+
     # 特有语法区 #
 
     # opennars' grammar（避免百分号歧义）
@@ -291,9 +459,9 @@ class opennars(NARSProgram):
         # self.add_to_cmd('java -Xmx2048m -jar opennars.jar')
         self.write_line(f'java -Xmx1024m -jar {self.jar_path}')
 
-    def __init__(self, jar_path: str = DEFAULT_JAR_PATH):
+    def __init__(self, jar_path: str = DEFAULT_JAR_PATH, io_hub=None):
         self.jar_path = jar_path
-        super().__init__(NARSType.OPENNARS)
+        super().__init__(io_hub=io_hub)
         self.inference_cycle_frequency = 5
 
     def catch_operation_name(self, line: str) -> str:
@@ -309,6 +477,8 @@ class ONA(NARSProgram):
     DEFAULT_EXE_PATH: str = r'.\NAR.exe'
     "可执行文件路径"
 
+    OPTIONS: tuple[str] = ('exe_path',)
+
     # 特有语法区 #
 
     # ONA Babble 无效：语句「<(*,{SELF}) --> ^deactivate>. :|:」报错「OSError: [Errno 22] Invalid argument」
@@ -320,9 +490,9 @@ class ONA(NARSProgram):
     # 操作注册
     OPERATION_REGISTER_TEMPLATE: str = f'(*,{NARSProgram._TERM_SELF}, ^%s). :|:'
 
-    def __init__(self, exe_path: str = DEFAULT_EXE_PATH):
+    def __init__(self, exe_path: str = DEFAULT_EXE_PATH, io_hub=None):
         self.exe_path = exe_path
-        super().__init__(NARSType.ONA)
+        super().__init__(io_hub=io_hub)
         self.inference_cycle_frequency = 0  # ONA会自主更新
 
     def launch_program(self):
@@ -344,6 +514,10 @@ class Python(NARSProgram):
     DEFAULT_EXE_PATH: str = r'.\main.exe'
     "程序路径"
 
+    OPTIONS: tuple[str] = ('exe_path',)
+
+    RESET_COMMAND: str = None  # 不支持`*reset`：归还进程池时直接终止
+
     # 特定模板 # 注：NARS-Python 对语句使用圆括号
 
     SENSE_TEMPLATE: str = '({%s} --> [%s]). :|:'
@@ -369,9 +543,9 @@ class Python(NARSProgram):
 
     # 类实现 #
 
-    def __init__(self, exe_path: str = DEFAULT_EXE_PATH):
+    def __init__(self, exe_path: str = DEFAULT_EXE_PATH, io_hub=None):
         self.exe_path = exe_path
-        super().__init__(NARSType.ONA)
+        super().__init__(io_hub=io_hub)
         self.inference_cycle_frequency = 0  # NARS-Python 不需要更新（暂时只能输入NAL语句）
 
     def launch_program(self):
@@ -381,7 +555,101 @@ class Python(NARSProgram):
 
     def catch_operation_name(self, line: str) -> str:
         if 'reject' in line.lower():
-            print(f'Reject: {line}')
+            LOG_IO.warning('Reject: %s', line)
         if 'EXE' in line:  # 若为操作前缀
             # print(f'{line}') # 操作文本：「EXE: ^left based on desirability: 0.9」
             return line.split(' ', 2)[1][1:]
+
+
+class Scripted(NARSProgram):
+    """本地「替身NARS」：启动NARS_Scripted.py脚本进程，模拟具体实现的命令行协议
+    - 无需JVM或ONA可执行文件，在任何装有Python的机器上都能运行
+    - 用于对写入/读取路径进行可复现的吞吐量、延迟测试
+    - 需与具体协议的子类一同继承，以复用其语句模板与操作解析
+    """
+
+    SCRIPT_PATH: str = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'NARS_Scripted.py')
+    "替身脚本路径"
+
+    PROTOCOL: str = None
+    "模拟的协议（由子类指定）"
+
+    DEFAULT_OPTIONS: dict[str, any] = {
+        'seed': 0,
+        'noise': 0,
+        'operation_probability': 0.05,
+        'latency': 0.0,
+        'jitter': 0.0,
+        'respect_volume': False,
+    }
+    "替身脚本的默认配置"
+
+    OPTIONS: tuple[str] = tuple(DEFAULT_OPTIONS)
+
+    def __init__(self, io_hub=None, **options):
+        "options：替身脚本的配置（见DEFAULT_OPTIONS），未提供的使用默认值"
+        self.options: dict[str, any] = {
+            **self.__class__.DEFAULT_OPTIONS, **options}
+        super().__init__(io_hub=io_hub)
+
+    @property
+    def launch_arguments(self) -> list[str]:
+        "启动替身脚本的命令行参数"
+        return self.__class__.command(**self.options)
+
+    @classmethod
+    def command(cls, **options) -> list[str]:
+        "启动（该协议的）替身脚本的命令行参数（也供不经过本类的调用方使用，如旧版本的桥接层）"
+        args: list[str] = [
+            sys.executable, '-u', cls.SCRIPT_PATH,
+            '--protocol', cls.PROTOCOL,
+        ]
+        for key, value in {**cls.DEFAULT_OPTIONS, **options}.items():
+            flag: str = '--' + key.replace('_', '-')
+            if isinstance(value, bool):  # 开关型参数
+                value and args.append(flag)
+            elif isinstance(value, (list, tuple)):
+                args += [flag, ','.join(map(str, value))]
+            else:
+                args += [flag, str(value)]
+        return args
+
+    def launch_nars(self):
+        "直接启动替身脚本（不经过cmd）"
+        self.process = subprocess.Popen(self.launch_arguments,
+                                        bufsize=1,
+                                        stdin=subprocess.PIPE,  # 输入管道
+                                        stdout=subprocess.PIPE,  # 输出管道
+                                        universal_newlines=True,  # convert bytes to text/string
+                                        shell=False)
+        self.write_line('*volume=0')
+
+    def launch_program(self):
+        "替身脚本在launch_nars中直接启动"
+        pass
+
+    def terminate(self):
+        "替身脚本是普通子进程：关闭输入并终止即可（不依赖Windows专有的信号）"
+        self.stop_recording()
+        self.io_hub and self.io_hub.detach(self)  # 先停止收发，再关闭管道
+        try:
+            if process := self.process:
+                self.process = None  # 空置（同时让写入线程退出）
+                process.stdin.close()
+                process.terminate()
+                process.wait()
+        except BaseException as e:
+            print(f'Failed to terminate process: {e}')
+
+
+class ScriptedOpenNARS(Scripted, opennars):
+    "模拟OpenNARS协议的替身（推理周期由游戏驱动）"
+
+    PROTOCOL: str = 'opennars'
+
+
+class ScriptedONA(Scripted, ONA):
+    "模拟ONA协议的替身（每条输入语句运行一个周期）"
+
+    PROTOCOL: str = 'ONA'
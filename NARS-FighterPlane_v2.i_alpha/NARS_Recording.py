@@ -0,0 +1,188 @@
+"""NAL输入/输出流的录制与回放
+- 录制：NARSProgram写入的每一条语句、读取的每一行，连同单调时钟时间戳与游戏帧号，追加到gzip压缩的日志中
+- 回放：把录制的输入流按原速（或加倍、最快）送入任意后端，无需运行pygame；用于复现学习问题、在相同输入上对比后端
+日志格式（每行一条记录，多次录制可追加到同一文件）：
+- 会话头：`#nal-io v1 backend=<类名> start=<unix时间>`
+- 记录：`<类型><距上一条的微秒数>\\t<帧号>\\t<文本>`，类型为L（启动命令）、W（写入语句）、C（推理周期数）、R（读取行）
+用法：python NARS_Recording.py game.nal.gz --backend scripted_ONA [--speed 1|4|max]
+"""
+
+import gzip
+import time
+import argparse
+import threading
+from collections import deque
+
+KIND_LAUNCH: str = 'L'
+"启动阶段写入的命令（如启动程序、*volume=0），回放时由目标后端自行处理"
+KIND_WRITE: str = 'W'
+KIND_CYCLES: str = 'C'
+KIND_READ: str = 'R'
+
+HEADER_PREFIX: str = '#nal-io v1'
+
+FLUSH_INTERVAL: float = 0.2
+"后台线程压缩写入的间隔（秒）"
+
+
+class IORecorder:
+    """I/O录制器
+    - record(类型, 文本)：由各线程调用，只追加到内存队列（不做压缩与磁盘写入）
+    - 后台线程定期把队列中的记录压缩追加到文件
+    - tick_source：返回当前游戏帧号的函数（可选）
+    """
+
+    def __init__(self, path: str, backend: str = '', tick_source=None) -> None:
+        self.path: str = path
+        self.tick_source = tick_source
+        self.num_records: int = 0
+        self._records: deque[tuple[str, int, int, str]] = deque()
+        self._file = gzip.open(path, 'at', encoding='utf-8')  # 追加：新的gzip成员
+        self._file.write(
+            f'{HEADER_PREFIX} backend={backend} start={time.time():.6f}\n')
+        self._last_ns: int = time.perf_counter_ns()
+        self._running: bool = True
+        self._thread: threading.Thread = threading.Thread(
+            target=self._run, name='NAL-recorder', daemon=True)
+        self._thread.start()
+
+    def record(self, kind: str, text: str) -> None:
+        "记录一条（线程安全：deque.append是原子的）"
+        self._records.append((
+            kind, time.perf_counter_ns(),
+            self.tick_source() if self.tick_source else -1,
+            text,
+        ))
+
+    def _flush(self) -> None:
+        lines: list[str] = []
+        while self._records:
+            kind, ns, tick, text = self._records.popleft()
+            lines.append(
+                f'{kind}{(ns - self._last_ns) // 1000}\t{tick}\t{text}\n')
+            self._last_ns = ns
+        if lines:
+            self._file.write(''.join(lines))
+            self.num_records += len(lines)
+
+    def _run(self) -> None:
+        while self._running:
+            time.sleep(FLUSH_INTERVAL)
+            self._flush()
+
+    def close(self) -> None:
+        "停止录制：写出剩余记录并关闭文件"
+        if not self._running:
+            return
+        self._running = False
+        self._thread.join()
+        self._flush()
+        self._file.close()
+        print(f'{self.num_records} I/O records are saved to {self.path}.')
+
+
+def read_recording(path: str):
+    """逐条读取录制日志
+    产出：(会话序号, 类型, 距会话开始的秒数, 帧号, 文本)
+    """
+    session: int = -1
+    elapsed_us: int = 0
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        for line in file:
+            line = line.rstrip('\n')
+            if line.startswith(HEADER_PREFIX):
+                session += 1
+                elapsed_us = 0
+                continue
+            head, tick, text = line.split('\t', 2)
+            elapsed_us += int(head[1:])
+            yield session, head[0], elapsed_us / 1e6, int(tick), text
+
+
+def replay(path: str, program, speed: float = 1.0, session: int = None) -> dict:
+    """把录制的输入流送入一个NARS程序
+    - speed：相对原速的倍数；为0（或None）时不等待，以最快速度送入
+    - session：只回放指定序号的会话（默认全部）
+    返回：回放统计
+    """
+    stats: dict = {
+        'written': 0, 'cycles': 0, 'recorded reads': 0,
+        'recorded operations': 0, 'operations': 0,
+    }
+    operation_hook = program.operationHook
+
+    def on_operation(operation) -> None:
+        stats['operations'] += 1
+        operation_hook and operation_hook(operation)
+    program.operationHook = on_operation
+
+    start: float = time.perf_counter()
+    session_start: float = start  # 每个会话的时间线单独对齐
+    current_session: int = None
+    recorded_duration: float = 0.0
+    for record_session, kind, elapsed, _, text in read_recording(path):
+        if session is not None and record_session != session:
+            continue
+        if record_session != current_session:
+            current_session = record_session
+            session_start = time.perf_counter()
+            recorded_duration += elapsed
+        else:
+            recorded_duration += elapsed - last_elapsed
+        last_elapsed: float = elapsed
+        if kind == KIND_READ:  # 原后端的输出：只用于对比
+            stats['recorded reads'] += 1
+            if program.catch_operation_name(text + '\n'):
+                stats['recorded operations'] += 1
+            continue
+        if kind == KIND_LAUNCH:
+            continue
+        if speed and (delay := elapsed / speed - (time.perf_counter() - session_start)) > 0:
+            time.sleep(delay)
+        if kind == KIND_WRITE:
+            program.write_line(text)
+            stats['written'] += 1
+        elif kind == KIND_CYCLES:
+            program.add_inference_cycles(int(text))
+            stats['cycles'] += 1
+    # 等待缓冲区写空
+    while program.num_cached_cmds:
+        time.sleep(0.001)
+    stats['recorded duration'] = recorded_duration
+    stats['wall time'] = time.perf_counter() - start
+    return stats
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Replay a recorded NAL input stream into a NARS backend')
+    parser.add_argument('recording', help='recorded I/O log (.nal.gz)')
+    parser.add_argument('--backend', default='scripted_ONA',
+                        help='opennars/ONA/python/scripted_opennars/scripted_ONA')
+    parser.add_argument('--speed', default='1',
+                        help='replay speed relative to the recording, or "max"')
+    parser.add_argument('--session', type=int, default=None,
+                        help='replay only the N-th recorded session')
+    parser.add_argument('--log-level', default='WARNING',
+                        help='log level (queue overflow warnings are expected at max speed)')
+    parser.add_argument('--settle', type=float, default=0.5,
+                        help='seconds to wait for late outputs after the last input')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    from NARS_Program import NARSProgram, NARSType
+    from logger import setup_logging
+    args: argparse.Namespace = parse_args()
+    setup_logging(args.log_level)
+    program: NARSProgram = NARSProgram.fromType(NARSType(args.backend))
+    stats: dict = replay(
+        args.recording, program,
+        speed=0 if args.speed == 'max' else float(args.speed),
+        session=args.session)
+    time.sleep(args.settle)
+    program.terminate()
+    print(
+        f'Replayed {stats["written"]} sentences and {stats["cycles"]} cycle commands '
+        f'({stats["recorded duration"]:.2f}s recorded) in {stats["wall time"]:.2f}s; '
+        f'operations: {stats["operations"]} (recorded: {stats["recorded operations"]})')
@@ -0,0 +1,157 @@
+"""「替身NARS」：用于压测I/O层的本地脚本进程
+- 模拟ONA与OpenNARS的命令行协议：接收NAL语句、`*volume`/`*reset`指令与「推理周期数」
+- 按配置输出一定量的「推导噪声」，并随机输出`EXE ...`（OpenNARS）/`^op ...`（ONA）操作行
+- 可配置每次响应的延迟与抖动；在给定种子下，输出内容完全确定（与输入序列一一对应）
+用法：python NARS_Scripted.py --protocol ONA --seed 0 --noise 10 --latency 0.001 --jitter 0.0005
+"""
+
+import sys
+import time
+import random
+import argparse
+
+PROTOCOL_OPENNARS: str = 'opennars'
+PROTOCOL_ONA: str = 'ONA'
+
+DEFAULT_OPERATIONS: list[str] = ['left', 'right', 'deactivate', 'strike']
+"默认会输出的操作（与NARSPlanePlayer的操作一致）"
+
+
+class ScriptedNARS:
+    """替身NARS本体
+    - 「推理周期」：OpenNARS仅在收到周期数时运行；ONA每收到一条语句也会运行一个周期
+    - 每个周期以operation_probability的概率输出一个操作
+    - 每条（非指令）输入语句输出noise行推导噪声；若respect_volume，则噪声量再乘以volume/100
+    """
+
+    def __init__(
+        self,
+        protocol: str = PROTOCOL_ONA,
+        seed: int = 0,
+        noise: int = 0,
+        operation_probability: float = 0.05,
+        operations: list[str] = DEFAULT_OPERATIONS,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        respect_volume: bool = False,
+        output=sys.stdout,
+    ) -> None:
+        self.protocol: str = protocol
+        self.seed: int = seed
+        self.noise: int = noise
+        self.operation_probability: float = operation_probability
+        self.operations: list[str] = operations
+        self.latency: float = latency
+        self.jitter: float = jitter
+        self.respect_volume: bool = respect_volume
+        self.output = output
+        self.reset()
+
+    def reset(self) -> None:
+        "重置状态（对应`*reset`指令）：随机数流从种子重新开始"
+        self.rng: random.Random = random.Random(self.seed)
+        self.volume: int = 100
+        self.num_cycles: int = 0
+        self.num_inputs: int = 0
+
+    # 输出格式 #
+
+    def format_operation(self, operation: str) -> str:
+        if self.protocol == PROTOCOL_ONA:
+            return f'^{operation} executed with args ({{SELF}})'
+        return f'EXE $0.50;0.50;0.95$ ^{operation}([{{SELF}}])=null'
+
+    def format_noise(self, sentence: str, i: int) -> str:
+        term: str = sentence.split('. :|:', 1)[0].split('! :|:', 1)[0]
+        if self.protocol == PROTOCOL_ONA:
+            return f'Derived: {term}. :|: occurrenceTime={self.num_cycles} Priority={self.rng.random():.6f} Truth: frequency=1.000000, confidence={0.9 ** (i + 1):.6f}'
+        return f'OUT: <{term} =/> <{{SELF}} --> [good]>>. :!{self.num_cycles}: %1.00;{0.9 ** (i + 1):.2f}%'
+
+    # 输入处理 #
+
+    def cycles(self, n: int) -> list[str]:
+        "运行n个推理周期，返回输出的操作行"
+        lines: list[str] = []
+        for _ in range(n):
+            self.num_cycles += 1
+            if self.rng.random() < self.operation_probability:
+                lines.append(self.format_operation(
+                    self.rng.choice(self.operations)))
+        return lines
+
+    def handle(self, line: str) -> list[str]:
+        "处理一行输入，返回要输出的所有行"
+        line = line.strip()
+        if not line:
+            return []
+        # 指令
+        if line.startswith('*volume='):
+            self.volume = int(line.split('=', 1)[1] or 0)
+            return []
+        if line == '*reset':
+            self.reset()
+            return []
+        if line.startswith('*'):  # 其它指令：忽略
+            return []
+        # 推理周期
+        if line.isdigit():
+            return self.cycles(int(line))
+        # NAL语句
+        self.num_inputs += 1
+        num_noise: int = (
+            self.noise * self.volume // 100 if self.respect_volume
+            else self.noise
+        )
+        lines: list[str] = [
+            self.format_noise(line, i)
+            for i in range(num_noise)
+        ]
+        if self.protocol == PROTOCOL_ONA:  # ONA每条输入都会运行一个周期
+            lines += self.cycles(1)
+        return lines
+
+    def delay(self) -> None:
+        "模拟响应延迟（含抖动）"
+        if self.latency or self.jitter:
+            time.sleep(max(
+                0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter)))
+
+    def run(self, input=sys.stdin) -> None:
+        "主循环：逐行读取输入，直到输入流关闭"
+        for line in input:
+            if lines := self.handle(line):
+                self.delay()
+                self.output.write('\n'.join(lines) + '\n')
+                self.output.flush()
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Scripted stand-in NARS process')
+    parser.add_argument('--protocol', choices=[PROTOCOL_OPENNARS, PROTOCOL_ONA], default=PROTOCOL_ONA)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--noise', type=int, default=0,
+                        help='derivation lines emitted per input sentence')
+    parser.add_argument('--operation-probability', type=float, default=0.05,
+                        help='probability of emitting an operation per inference cycle')
+    parser.add_argument('--operations', default=','.join(DEFAULT_OPERATIONS))
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds to wait before each response')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='maximum deviation of the latency in seconds')
+    parser.add_argument('--respect-volume', action='store_true',
+                        help='scale the derivation noise with *volume')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    ScriptedNARS(
+        protocol=args.protocol,
+        seed=args.seed,
+        noise=args.noise,
+        operation_probability=args.operation_probability,
+        operations=args.operations.split(','),
+        latency=args.latency,
+        jitter=args.jitter,
+        respect_volume=args.respect_volume,
+    ).run()
@@ -0,0 +1,77 @@
+"""多智能体模式的扩展性测量：智能体数增加时，每秒模拟帧数如何变化
+- 对每个智能体数N，运行一局无界面、不按帧率等待的游戏（同一种子），记录现实耗时与每秒帧数
+- 「相对N局单智能体」：N个智能体一局的耗时 ÷ N局单智能体的耗时（越小越划算）
+- --io-hub：所有智能体的NARS程序共用一个I/O线程（NARS_IOHub），对比线程数与每秒帧数
+用法：python agent_scaling.py --agents 1 2 4 8 [--backend scripted_ONA] [--duration 60] [--io-hub]
+"""
+
+import argparse
+import multiprocessing as mp
+
+from experiment_runner import run_session, SCRIPTED_TYPES
+
+DEFAULT_AGENTS: list[int] = [1, 2, 4, 8]
+
+
+def make_configs(args: argparse.Namespace) -> list[dict]:
+    return [
+        {
+            'run': num_agents,
+            'nars_type': args.backend,
+            'num_agents': num_agents,
+            'seed': args.seed,
+            'game_speed': 1.0,
+            'enable_punish': False,
+            'duration_s': args.duration,
+            'paced': False,
+            'brain_options': {'seed': args.seed} if args.backend in SCRIPTED_TYPES else {},
+            'io_hub': args.io_hub,
+            'log_level': args.log_level,
+        }
+        for num_agents in args.agents
+    ]
+
+
+def scaling_table(summaries: list[dict]) -> str:
+    "扩展性对比表（Markdown）"
+    summaries = sorted(summaries, key=lambda summary: summary['run'])
+    single: dict = next(
+        (summary for summary in summaries if summary['run'] == 1), None)
+    lines: list[str] = [
+        '| agents | threads | ticks | wall time (s) | ticks/s | agent-ticks/s | vs N single-agent games | scores |',
+        '|---|---|---|---|---|---|---|---|',
+    ]
+    for summary in summaries:
+        num_agents: int = summary['run']
+        ticks_per_s: float = summary['ticks'] / summary['wall_time']
+        ratio: str = (
+            f'{summary["wall_time"] / (num_agents * single["wall_time"]):.2f}'
+            if single else '—')
+        lines.append(
+            f'| {num_agents} | {summary.get("threads", "—")} | {summary["ticks"]} | {summary["wall_time"]:.2f} | {ticks_per_s:.0f} | '
+            f'{ticks_per_s * num_agents:.0f} | {ratio} | {summary.get("scores", [summary["score"]])} |')
+    return '\n'.join(lines)
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Measure ticks per second as NARS agents are added to one world')
+    parser.add_argument('--agents', type=int, nargs='+', default=DEFAULT_AGENTS,
+                        help=f'agent counts to measure (default {" ".join(map(str, DEFAULT_AGENTS))})')
+    parser.add_argument('--backend', default='scripted_ONA')
+    parser.add_argument('--duration', type=int, default=60,
+                        help='in-game duration of each session in seconds')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--io-hub', action='store_true',
+                        help='serve the pipes of all NARS programs from one selector thread (POSIX only)')
+    parser.add_argument('--log-level', default='WARNING')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args: argparse.Namespace = parse_args()
+    # 依次运行（一次一局），使各局的现实耗时可比
+    with mp.get_context('spawn').Pool(1, maxtasksperchild=1) as pool:
+        summaries: list[dict] = [
+            result['summary'] for result in pool.imap(run_session, make_configs(args))]
+    print(scaling_table(summaries))
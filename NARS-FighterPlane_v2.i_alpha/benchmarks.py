@@ -0,0 +1,341 @@
+"""热点路径的微基准：NARS的I/O与游戏循环
+- 每项基准给出「单次操作的耗时（微秒）」，取多轮中的最小值（减少调度噪声的影响）
+- 结果可存为JSON基线；再次运行时与基线对比，慢于阈值（默认20%）即报告回归（退出码为1）
+- 游戏相关的基准在无界面模式下运行（SDL dummy驱动）；NARS相关的基准使用替身NARS，无需JVM或ONA
+- 基线与机器相关：请在同一台机器上保存与对比
+用法：python benchmarks.py [--save] [--baseline FILE] [--threshold 0.2] [--only nars. game.collision]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+from time import perf_counter
+
+GAME_DIR: str = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_BASELINE_PATH: str = 'benchmark_baseline.json'
+"默认的基线文件（位于游戏目录）"
+
+DEFAULT_ROUNDS: int = 5
+DEFAULT_THRESHOLD: float = 0.2
+
+SWITCH_INTERVAL: float = 0.5
+"计时期间的GIL切换间隔（秒）：减少NARS程序后台读写线程对计时的干扰"
+
+COLLISION_SIZES: list[tuple[int, int]] = [(10, 5), (50, 20), (200, 50)]
+"碰撞检测的规模：(敌机数, 子弹数)"
+
+NUM_SENSED_ENEMIES: int = 10
+"感知与渲染基准中，场上的敌机数"
+
+OPERATION_LINES: dict[str, list[str]] = {
+    'opennars': [
+        'EXE $0.50;0.50;0.95$ ^left([{SELF}])=null',
+        'OUT: <<{enemy} --> [left]> =/> <{SELF} --> [good]>>. :!12: %1.00;0.90%',
+        'IN: <{SELF} --> [good]>! :|:',
+    ],
+    'ONA': [
+        '^left executed with args ({SELF})',
+        'Derived: <{enemy} --> [left]>. :|: occurrenceTime=12 Priority=0.500000 Truth: frequency=1.000000, confidence=0.900000',
+        'Input: <{SELF} --> [good]>! :|: occurrenceTime=12 Priority=1.000000 Truth: frequency=1.000000, confidence=0.900000',
+    ],
+    'Python': [
+        'EXE: ^left based on desirability: 0.9',
+        'OUT: ({enemy} --> [left]). :|: %1.00;0.90%',
+        'IN: ({SELF} --> [good])! :|:',
+    ],
+}
+"各后端输出的典型行（一行操作、两行非操作），用于操作解析基准"
+
+
+class BenchContext:
+    "基准共用的对象：一局无界面游戏（按需创建，连接替身NARS）"
+
+    def __init__(self) -> None:
+        self._game = None
+        self._enemies: list = []
+        self._bullets: list = []
+
+    @property
+    def game(self):
+        if self._game is None:
+            from plane_game import PlaneGame, NARSType
+            self._game = PlaneGame(
+                NARSType.SCRIPTED_ONA, headless=True, seed=0,
+                brain_options={'operation_probability': 0})
+            self._game.start_time = self._game.current_time
+        return self._game
+
+    def place_enemies(self, num: int) -> list:
+        "在场上（确定性地）放置num架敌机（复用同一批精灵）"
+        from game_sprites import Enemy, SCREEN_RECT
+        rng = random.Random(num)
+        while len(self._enemies) < num:
+            self._enemies.append(Enemy(rng=rng))
+        enemies: list = self._enemies[:num]
+        for enemy in enemies:
+            enemy.rect.x = rng.randint(0, SCREEN_RECT.width - enemy.rect.width)
+            enemy.rect.y = rng.randint(0, SCREEN_RECT.height // 2)
+        self.game.enemy_group.empty()
+        self.game.enemy_group.add(*enemies)
+        return enemies
+
+    def place_bullets(self, num: int) -> list:
+        "在场上（确定性地）放置num颗子弹（复用同一批精灵）"
+        from game_sprites import Bullet, SCREEN_RECT
+        rng = random.Random(-num)
+        while len(self._bullets) < num:
+            self._bullets.append(Bullet())
+        bullets: list = self._bullets[:num]
+        for bullet in bullets:
+            bullet.rect.x = rng.randint(0, SCREEN_RECT.width - bullet.rect.width)
+            bullet.rect.y = rng.randint(0, SCREEN_RECT.height)
+        self.game.hero.bullets.empty()
+        self.game.hero.bullets.add(*bullets)
+        return bullets
+
+    def reset(self) -> None:
+        "清空场上的精灵与待写入的命令"
+        self.game.enemy_group.empty()
+        self.game.hero.bullets.empty()
+        self.game.nars.clear_cached_cmds()
+
+    def close(self) -> None:
+        if self._game is not None:
+            self._game.close()
+
+
+# 各项基准：bench(上下文, 次数) -> 总耗时（秒） #
+
+def bench_write_line(context: BenchContext, number: int) -> float:
+    "写入缓冲区（入队）"
+    program = context.game.nars.brain
+    sentence: str = program.SENSE_TEMPLATE % ('enemy', 'left')
+    start: float = perf_counter()
+    for _ in range(number):
+        program.write_line(sentence)
+    elapsed: float = perf_counter() - start
+    program.clear_cached_cmds()
+    return elapsed
+
+
+def bench_add_to_cmd(context: BenchContext, number: int) -> float:
+    "写入进程的stdin（写入线程的主体）"
+    program = context.game.nars.brain
+    sentence: str = program.SENSE_TEMPLATE % ('enemy', 'left')
+    start: float = perf_counter()
+    for _ in range(number):
+        program._add_to_cmd(sentence)
+    return perf_counter() - start
+
+
+def catch_operation_bench(backend: str):
+    "某个后端的操作解析（解析只依赖行文本：不启动程序，直接调用类中的方法）"
+    def bench(context: BenchContext, number: int) -> float:
+        import NARS_Program
+        catch_operation_name = getattr(NARS_Program, backend).catch_operation_name
+        lines: list[str] = [line + '\n' for line in OPERATION_LINES[backend]]
+        start: float = perf_counter()
+        for _ in range(number // len(lines)):
+            for line in lines:
+                catch_operation_name(None, line)
+        return perf_counter() - start
+    bench.__doc__ = f'{backend}的操作解析（每次一行，操作与非操作混合）'
+    return bench
+
+
+def bench_update_sensors(context: BenchContext, number: int) -> float:
+    "三个感知器（边界、移动、对敌）的一次更新（含感知写入缓冲区）"
+    game = context.game
+    context.place_enemies(NUM_SENSED_ENEMIES)
+    start: float = perf_counter()
+    for _ in range(number):
+        game.nars.update_sensors(hero=game.hero, enemy_group=game.enemy_group)
+    elapsed: float = perf_counter() - start
+    context.reset()
+    return elapsed
+
+
+def collision_bench(num_enemies: int, num_bullets: int):
+    "碰撞检测（每次调用前重新摆放精灵，摆放不计时）"
+    def bench(context: BenchContext, number: int) -> float:
+        game = context.game
+        check_collide = game._PlaneGame__check_collide
+        elapsed: float = 0.0
+        for _ in range(number):
+            context.place_enemies(num_enemies)
+            context.place_bullets(num_bullets)
+            start: float = perf_counter()
+            check_collide()
+            elapsed += perf_counter() - start
+        context.reset()
+        return elapsed
+    bench.__doc__ = f'碰撞检测：{num_enemies}架敌机、{num_bullets}颗子弹'
+    return bench
+
+
+def bench_render_sprites(context: BenchContext, number: int) -> float:
+    "绘制所有精灵（背景、敌机、战机、子弹）"
+    game = context.game
+    context.place_enemies(NUM_SENSED_ENEMIES)
+    context.place_bullets(NUM_SENSED_ENEMIES)
+    groups: list = [game.background_group, game.enemy_group,
+                    game.hero_group, game.hero.bullets]
+    start: float = perf_counter()
+    for _ in range(number):
+        for group in groups:
+            group.draw(game.screen)
+    elapsed: float = perf_counter() - start
+    context.reset()
+    return elapsed
+
+
+def hud_bench(overlay: bool):
+    "HUD文本的渲染（可含性能HUD页）"
+    def bench(context: BenchContext, number: int) -> float:
+        game = context.game
+        game.show_performance_overlay = overlay
+        display_text = game._PlaneGame__display_text
+        start: float = perf_counter()
+        for _ in range(number):
+            display_text()
+        elapsed: float = perf_counter() - start
+        game.show_performance_overlay = False
+        return elapsed
+    bench.__doc__ = 'HUD文本与性能HUD页的渲染' if overlay else 'HUD文本的渲染'
+    return bench
+
+
+BENCHMARKS: dict[str, tuple] = {
+    'nars.write_line': (bench_write_line, 20000),
+    'nars._add_to_cmd': (bench_add_to_cmd, 2000),
+    **{
+        f'nars.catch_operation_name[{backend}]': (catch_operation_bench(backend), 30000)
+        for backend in OPERATION_LINES
+    },
+    'nars.update_sensors': (bench_update_sensors, 2000),
+    **{
+        f'game.collision[{num_enemies}x{num_bullets}]': (collision_bench(num_enemies, num_bullets), 500)
+        for num_enemies, num_bullets in COLLISION_SIZES
+    },
+    'game.render.sprites': (bench_render_sprites, 500),
+    'game.render.hud': (hud_bench(False), 200),
+    'game.render.hud+overlay': (hud_bench(True), 200),
+}
+"所有基准：名称→(函数, 每轮次数)"
+
+
+def run_benchmarks(names: list[str], rounds: int = DEFAULT_ROUNDS) -> dict[str, float]:
+    "运行给定的基准，返回「名称→单次耗时（微秒，多轮最小值）」"
+    context = BenchContext()
+    results: dict[str, float] = {}
+    switch_interval: float = sys.getswitchinterval()
+    try:
+        for name in names:
+            bench, number = BENCHMARKS[name]
+            bench(context, max(number // 10, 1))  # 预热
+            sys.setswitchinterval(SWITCH_INTERVAL)
+            results[name] = min(
+                bench(context, number) / number for _ in range(rounds)) * 1e6
+            sys.setswitchinterval(switch_interval)
+            print(f'{name:<40}{results[name]:>12.3f} us')
+    finally:
+        sys.setswitchinterval(switch_interval)
+        context.close()
+    return results
+
+
+def machine_info() -> dict:
+    import pygame
+    return {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def load_baseline(path: str) -> dict:
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_baseline(path: str, results: dict[str, float]) -> None:
+    "保存基线（只覆盖本次运行的项，其余项保留）"
+    baseline: dict = load_baseline(path) if os.path.exists(path) else {}
+    baseline = {
+        'machine': machine_info(),
+        'saved_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'results': {**baseline.get('results', {}), **results},
+    }
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(baseline, file, indent=2)
+    print(f'Baseline of {len(results)} benchmarks is saved to {path}.')
+
+
+def compare(results: dict[str, float], baseline: dict, threshold: float) -> list[str]:
+    "与基线对比，返回回归（慢于基线超过阈值）的基准名"
+    regressions: list[str] = []
+    print(f'\n{"benchmark":<40}{"current":>12}{"baseline":>12}{"change":>10}')
+    for name, current in results.items():
+        if (base := baseline['results'].get(name)) is None:
+            print(f'{name:<40}{current:>12.3f}{"-":>12}{"new":>10}')
+            continue
+        change: float = current / base - 1
+        regressed: bool = change > threshold
+        if regressed:
+            regressions.append(name)
+        print(f'{name:<40}{current:>12.3f}{base:>12.3f}{change:>+10.1%}'
+              + ('  REGRESSION' if regressed else ''))
+    if baseline.get('machine') != machine_info():
+        print('Note: the baseline was saved on a different machine/environment.')
+    return regressions
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Microbenchmarks of the NARS I/O and game hot paths')
+    parser.add_argument('--only', nargs='+', metavar='PREFIX',
+                        help='only run benchmarks whose names start with one of the prefixes')
+    parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS,
+                        help=f'rounds per benchmark, the fastest is kept (default {DEFAULT_ROUNDS})')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH,
+                        help=f'baseline file (default {DEFAULT_BASELINE_PATH})')
+    parser.add_argument('--save', action='store_true',
+                        help='save the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'relative slowdown reported as a regression (default {DEFAULT_THRESHOLD})')
+    parser.add_argument('--list', action='store_true',
+                        help='list the benchmarks and exit')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args: argparse.Namespace = parse_args()
+    if args.list:
+        for name, (bench, number) in BENCHMARKS.items():
+            print(f'{name:<40}{bench.__doc__}')
+        sys.exit()
+    os.chdir(GAME_DIR)  # 图片等资源以游戏目录为基准
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    from logger import setup_logging
+    setup_logging('ERROR')  # 基准会让缓冲区超限：不输出相应的警告
+    names: list[str] = [
+        name for name in BENCHMARKS
+        if not args.only or name.startswith(tuple(args.only))]
+    results: dict[str, float] = run_benchmarks(names, args.rounds)
+    regressions: list[str] = []
+    if args.save:
+        save_baseline(args.baseline, results)
+    elif os.path.exists(args.baseline):
+        regressions = compare(
+            results, load_baseline(args.baseline), args.threshold)
+        print(f'{len(regressions)} regression(s) above {args.threshold:.0%}.')
+    else:
+        print(f'No baseline at {args.baseline}; run with --save to create one.')
+    sys.exit(1 if regressions else 0)
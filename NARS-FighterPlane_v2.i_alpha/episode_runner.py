@@ -0,0 +1,93 @@
+"""回合制运行：在同一个进程中连续运行大量短回合（pygame与NARS程序只启动一次）
+- 每回合固定的游戏内时长，结束后用PlaneGame.reset_episode重置世界；第i回合的种子为「种子+i」
+- 默认保留NARS的记忆（跨回合学习）；--reset-brain则每回合都从空白的记忆开始
+- 输出每回合的摘要（CSV）与每秒完成的回合数
+用法：python episode_runner.py --backend scripted_ONA --episodes 1000 --duration 10 [--reset-brain]
+"""
+
+import os
+import time
+import argparse
+
+import pandas as pd
+
+from experiment_runner import GAME_DIR, DEFAULT_OUTPUT_DIR, SCRIPTED_TYPES, apply_settings
+
+SUMMARY_COLUMNS: list[str] = ['episode', 'seed', 'ingame_time', 'ticks', 'score', 'performance',
+                              'senses', 'operations']
+"打印的摘要列"
+
+
+def run_episodes(config: dict) -> tuple[list[dict], float]:
+    "（在本进程中）运行所有回合，返回（各回合的摘要, 现实耗时）"
+    os.chdir(GAME_DIR)
+    from plane_game import PlaneGame, NARSType, setup_logging, shutdown_logging
+    setup_logging(config['log_level'])
+
+    game = PlaneGame(
+        nars_type=NARSType(config['nars_type']),
+        game_speed=config['game_speed'],
+        enable_punish=config['enable_punish'],
+        headless=True,
+        brain_options=config['brain_options'],
+        seed=config['seed'],
+        num_agents=config['num_agents'],
+    )
+    game.paced = config['paced']
+    start: float = time.perf_counter()
+    try:
+        apply_settings(game, config)
+        summaries: list[dict] = game.run_episodes(
+            config['episodes'], config['duration_s'], config['reset_brain'])
+    finally:
+        game.close()
+        shutdown_logging()
+    return summaries, time.perf_counter() - start
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Run many short NARS-FighterPlane episodes in one process')
+    parser.add_argument('--backend', default='scripted_ONA')
+    parser.add_argument('--episodes', type=int, default=100)
+    parser.add_argument('--duration', type=int, default=10,
+                        help='in-game duration of each episode in seconds')
+    parser.add_argument('--reset-brain', action='store_true',
+                        help="clear the NARS program's memory between episodes (default: keep learning)")
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the first episode (episode i uses seed + i)')
+    parser.add_argument('--agents', type=int, default=1)
+    parser.add_argument('--speed', type=float, default=1.0)
+    parser.add_argument('--punish', action='store_true')
+    parser.add_argument('--paced', action='store_true',
+                        help='wait between frames (default: run the simulation as fast as possible)')
+    parser.add_argument('--log-level', default='WARNING')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR,
+                        help=f'directory of the episode table (default {DEFAULT_OUTPUT_DIR})')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args: argparse.Namespace = parse_args()
+    output_dir: str = os.path.abspath(args.output)
+    summaries, wall_time = run_episodes({
+        'nars_type': args.backend,
+        'episodes': args.episodes,
+        'duration_s': args.duration,
+        'reset_brain': args.reset_brain,
+        'seed': args.seed,
+        'num_agents': args.agents,
+        'game_speed': args.speed,
+        'enable_punish': args.punish,
+        'paced': args.paced,
+        'brain_options': {'seed': args.seed} if args.backend in SCRIPTED_TYPES else {},
+        'log_level': args.log_level,
+    })
+    table: pd.DataFrame = pd.DataFrame(summaries)
+    os.makedirs(output_dir, exist_ok=True)
+    path: str = os.path.join(output_dir, f'episodes-{time.strftime("%Y%m%d-%H%M%S")}.csv')
+    table.to_csv(path, index=False)
+    print(table[SUMMARY_COLUMNS].to_string(index=False, max_rows=20))
+    print(f'{len(summaries)} episodes finished in {wall_time:.1f}s '
+          f'({len(summaries) / wall_time:.1f} episodes/s, mean score {table["score"].mean():.2f}).')
+    print(f'Episode summaries are saved to {path}.')
@@ -0,0 +1,309 @@
+"""批量实验：在进程池中并行运行多局无界面游戏
+- 每局是一个独立的进程：独立的PlaneGame与NARSAgent「大脑」，运行固定的游戏内时长
+- 进程池大小默认等于CPU核数；每局结束后回收进程（pygame与NARS程序均不跨局复用）
+- --reuse-brains：工作进程跨局保留，并从进程内的程序池（NARS_Pool）租用已启动的NARS程序，跳过后续各局的启动开销
+- --io-hub：每个工作进程中，所有NARS程序由一个共享的I/O线程收发（NARS_IOHub），而不是每个程序两个线程
+- 汇总每局的遥测数据（按游戏内秒采样），按后端求出表现曲线的均值与标准差
+- 每局的配置、摘要与遥测同时写入SQLite结果库（results_store），便于跨实验查询
+用法：python experiment_runner.py --backend scripted_ONA ONA --runs 8 --duration 120
+"""
+
+import os
+import ast
+import time
+import argparse
+import threading
+import multiprocessing as mp
+from multiprocessing import util as mp_util
+
+import pandas as pd
+
+from results_store import ResultWriter, DEFAULT_DB_PATH
+
+GAME_DIR: str = os.path.dirname(os.path.abspath(__file__))
+"游戏目录（图片等资源以此为相对路径）"
+
+DEFAULT_DURATION_S: int = 120
+"每局的默认游戏内时长（秒）"
+DEFAULT_OUTPUT_DIR: str = 'experiments'
+"实验结果的默认目录"
+
+TICKS_PER_RECORD: int = 60
+"每隔多少帧记录一行遥测数据（60帧=游戏内一秒）"
+
+CURVE_COLUMNS: list[str] = ['performance', 'hit rate', 'reward ewma']
+"需要汇总成曲线的遥测列"
+
+SCRIPTED_TYPES: tuple[str] = ('scripted_opennars', 'scripted_ONA')
+
+_brain_pools: dict[tuple[str, bool], object] = {}
+"（工作进程内）各后端的NARS程序池（按是否使用共享I/O线程分开）：复用程序时，同一工作进程中先后运行的各局共用"
+_io_hubs: list = []
+"（工作进程内）共享的I/O线程（至多一个）"
+
+
+def worker_io_hub():
+    "（在子进程中）共享的I/O线程（首次使用时创建；工作进程退出时停止，晚于程序池）"
+    if not _io_hubs:
+        from NARS_IOHub import IOHub
+        hub = IOHub()
+        _io_hubs.append(hub)
+        mp_util.Finalize(hub, hub.close, exitpriority=5)
+    return _io_hubs[0]
+
+
+def worker_brain_pool(nars_type: str, io_hub=None):
+    "（在子进程中）该后端的程序池（首次使用时创建；工作进程退出时终止池中的程序）"
+    key: tuple[str, bool] = nars_type, io_hub is not None
+    if key not in _brain_pools:
+        from NARS_Pool import BrainPool
+        from NARS_Program import NARSType
+        pool = _brain_pools[key] = BrainPool(NARSType(nars_type), io_hub)
+        mp_util.Finalize(pool, pool.close, exitpriority=10)  # 进程池的子进程不会执行atexit
+    return _brain_pools[key]
+
+
+def run_session(config: dict) -> dict:
+    """（在子进程中）运行一局无界面游戏
+    返回：{'config': 完整配置, 'summary': 本局摘要, 'telemetry': 遥测行列表}
+    """
+    os.chdir(GAME_DIR)
+    from plane_game import PlaneGame, NARSType, setup_logging, shutdown_logging
+    from NARS_Pool import LEASE_WARM
+    setup_logging(config['log_level'])  # 子进程各自配置（限流后输出）
+    io_hub = worker_io_hub() if config.get('io_hub') else None
+    brain_pool = worker_brain_pool(config['nars_type'], io_hub) if config.get('reuse_brains') else None
+    warm_leases: int = brain_pool.num_leases[LEASE_WARM] if brain_pool else 0
+
+    game = PlaneGame(
+        nars_type=NARSType(config['nars_type']),
+        game_speed=config['game_speed'],
+        enable_punish=config['enable_punish'],
+        headless=True,
+        brain_options=config['brain_options'],
+        seed=config.get('seed'),
+        num_agents=config.get('num_agents', 1),
+        brain_pool=brain_pool,
+        io_hub=io_hub,
+    )
+    game.paced = config['paced']
+    game.data_record_interval = TICKS_PER_RECORD
+    started_at: float = time.time()
+    start: float = time.perf_counter()
+    try:
+        apply_settings(game, config)
+        game.run(config['duration_s'])
+        summary: dict = {
+            'run': config['run'],
+            'backend': config['nars_type'],
+            'started_at': started_at,
+            'wall_time': time.perf_counter() - start,
+            'threads': threading.active_count(),
+            **game.run_summary(),
+        }
+        if brain_pool:  # 本局的热租用数与「租用→第一条语句写入」的最长时间
+            summary['warm brains'] = brain_pool.num_leases[LEASE_WARM] - warm_leases
+            summary['lease to first write (ms)'] = max(
+                (player.brain.lease_to_first_write or 0.0) * 1e3 for player in game.players)
+        full_config: dict = {**game.run_config(), **config}
+        telemetry: list[dict] = game.game_data_rows
+    finally:
+        game.close()
+        shutdown_logging()  # 进程池的子进程不会执行atexit：手动输出剩余日志
+    return {'config': full_config, 'summary': summary, 'telemetry': telemetry}
+
+
+def apply_settings(game, config: dict) -> None:
+    "应用配置中可选的游戏/NARS参数（未给出的保持默认；多智能体时作用于每个智能体）"
+    if (frequency := config.get('inference_cycle_frequency')) is not None:
+        for player in game.players:
+            player.brain.inference_cycle_frequency = frequency
+    if (babble_times := config.get('babble_times')) is not None:
+        # 与默认逻辑一致：只对需要babble的实现生效
+        game.remaining_babble_times = babble_times if game.nars.need_babble else 0
+    if (babble_probability := config.get('babble_probability')) is not None:
+        game.babble_probability = babble_probability
+    if (sensors := config.get('sensors')) is not None:
+        for player in game.players:
+            player.set_enabled_sensors(sensors)
+
+
+def make_configs(args: argparse.Namespace) -> list[dict]:
+    "生成每局的配置（第i局的种子为「基准种子+i」：各局互不相同，不同后端的同一局面对相同的世界）"
+    from NARS_Program import NARSType, NARSProgram
+    configs: list[dict] = []
+    for backend in args.backend:
+        for i in range(args.runs):
+            seed: int = args.seed + i
+            brain_options: dict = dict(args.brain_options)
+            if backend in SCRIPTED_TYPES:
+                brain_options.setdefault('seed', seed)
+            NARSProgram.check_options(NARSType.from_str(backend), brain_options)  # 在启动进程池之前报错
+            configs.append({
+                'run': len(configs),
+                'nars_type': backend,
+                'seed': seed,
+                'num_agents': args.agents,
+                'game_speed': args.speed,
+                'enable_punish': args.punish,
+                'duration_s': args.duration,
+                'paced': not args.max_speed,
+                'brain_options': brain_options,
+                'reuse_brains': args.reuse_brains,
+                'io_hub': args.io_hub,
+                'log_level': args.log_level,
+            })
+    return configs
+
+
+def session_pool(processes: int, configs: list[dict]):
+    """运行各局的进程池
+    - spawn：子进程不继承父进程的线程与句柄
+    - 默认每个进程只运行一局；有局复用程序（reuse_brains）时，工作进程跨局保留
+    """
+    reuse_brains: bool = any(config.get('reuse_brains') for config in configs)
+    return mp.get_context('spawn').Pool(
+        processes, maxtasksperchild=None if reuse_brains else 1)
+
+
+def run_experiments(configs: list[dict], processes: int = None,
+                    writer: ResultWriter = None, experiment: str = None) -> list[dict]:
+    "在进程池中运行所有局（按完成顺序返回结果；给出writer时，每局结束即交给后台写入结果库）"
+    processes = min(processes or os.cpu_count(), len(configs))
+    results: list[dict] = []
+    with session_pool(processes, configs) as pool:
+        for result in pool.imap_unordered(run_session, configs):
+            summary: dict = result['summary']
+            print(
+                f'[{len(results) + 1}/{len(configs)}] run {summary["run"]} ({summary["backend"]}): '
+                f'performance={summary["performance"]:.3f} in {summary["wall_time"]:.1f}s')
+            results.append(result)
+            writer and writer.submit(
+                result['config'], summary, result['telemetry'],
+                experiment=experiment, started_at=summary['started_at'])
+        pool.close()
+        pool.join()  # 让工作进程正常退出（终止程序池中的程序）
+    return results
+
+
+def aggregate_curves(telemetry: pd.DataFrame) -> pd.DataFrame:
+    "按「后端+游戏内时间」汇总各局遥测，得到曲线的均值与标准差"
+    curves: pd.DataFrame = telemetry.groupby(['backend', 'ingame_time'])[
+        CURVE_COLUMNS].agg(['mean', 'std', 'count'])
+    curves.columns = [f'{column} {stat}' for column, stat in curves.columns]
+    return curves.reset_index()
+
+
+def plot_curves(curves: pd.DataFrame, path: str) -> None:
+    "把汇总曲线（均值±标准差）画到图片中"
+    import matplotlib
+    matplotlib.use('Agg')  # 只输出文件，不弹出窗口
+    import matplotlib.pyplot as plt
+    fig, axes = plt.subplots(1, len(CURVE_COLUMNS), figsize=(
+        5 * len(CURVE_COLUMNS), 4))
+    for ax, column in zip(axes, CURVE_COLUMNS):
+        for backend, curve in curves.groupby('backend'):
+            mean, std = curve[f'{column} mean'], curve[f'{column} std'].fillna(0)
+            ax.plot(curve['ingame_time'], mean, label=backend)
+            ax.fill_between(curve['ingame_time'], mean - std, mean + std, alpha=0.2)
+        ax.set_title(column)
+        ax.set_xlabel('ingame time (s)')
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def save_results(results: list[dict], path: str) -> str:
+    "保存每局摘要、遥测与汇总曲线到目录中（返回该目录）"
+    os.makedirs(path, exist_ok=True)
+    summaries: pd.DataFrame = pd.DataFrame(
+        [result['summary'] for result in results]).sort_values('run')
+    telemetry: pd.DataFrame = pd.DataFrame([
+        {'run': result['summary']['run'], 'backend': result['summary']['backend'], **row}
+        for result in results
+        for row in result['telemetry']
+    ])
+    curves: pd.DataFrame = aggregate_curves(telemetry)
+    summaries.to_csv(os.path.join(path, 'runs.csv'), index=False)
+    telemetry.to_csv(os.path.join(path, 'telemetry.csv'), index=False)
+    curves.to_csv(os.path.join(path, 'curves.csv'), index=False)
+    try:
+        plot_curves(curves, os.path.join(path, 'curves.png'))
+    except ImportError:  # 没有matplotlib时只输出表格
+        pass
+    return path
+
+
+def parse_brain_options(specs: list[str]) -> dict:
+    "解析「键=值」形式的程序配置（值按Python字面量解析，失败则视作字符串）"
+    options: dict = {}
+    for spec in specs or []:
+        key, _, value = spec.partition('=')
+        try:
+            options[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            options[key] = value
+    return options
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Run headless NARS-FighterPlane sessions in parallel')
+    parser.add_argument('--backend', nargs='+', default=['scripted_ONA'],
+                        help='NARS types to compare (opennars/ONA/python/scripted_opennars/scripted_ONA)')
+    parser.add_argument('--runs', type=int, default=os.cpu_count(),
+                        help='number of sessions per backend (default: number of cores)')
+    parser.add_argument('--duration', type=int, default=DEFAULT_DURATION_S,
+                        help=f'in-game duration of each session in seconds (default {DEFAULT_DURATION_S})')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='game speed of each session')
+    parser.add_argument('--agents', type=int, default=1,
+                        help='NARS-controlled heroes per session (one brain process each)')
+    parser.add_argument('--punish', action='store_true',
+                        help='punish NARS on collisions')
+    parser.add_argument('--max-speed', action='store_true',
+                        help='do not wait between frames (the backend gets less real time per in-game second)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='base random seed (session i uses seed + i)')
+    parser.add_argument('--brain-option', metavar='KEY=VALUE', action='append',
+                        help='option passed to the NARS program, e.g. --brain-option noise=10')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='size of the process pool (default: number of cores)')
+    parser.add_argument('--reuse-brains', action='store_true',
+                        help='keep workers and reset their NARS programs between sessions instead of restarting them '
+                             '(scripted backends are reused only with a fixed --brain-option seed=N)')
+    parser.add_argument('--io-hub', action='store_true',
+                        help='serve the pipes of all NARS programs of a worker from one selector thread (POSIX only)')
+    parser.add_argument('--log-level', default='WARNING',
+                        help='log level of the sessions (default WARNING)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR,
+                        help=f'directory of the results (default {DEFAULT_OUTPUT_DIR})')
+    parser.add_argument('--db', default=None,
+                        help=f'SQLite results database (default OUTPUT/{DEFAULT_DB_PATH})')
+    args: argparse.Namespace = parser.parse_args(argv)
+    args.brain_options = parse_brain_options(args.brain_option)
+    return args
+
+
+if __name__ == '__main__':
+    args: argparse.Namespace = parse_args()
+    configs: list[dict] = make_configs(args)
+    output_dir: str = os.path.abspath(args.output)
+    os.makedirs(output_dir, exist_ok=True)
+    experiment: str = time.strftime('%Y%m%d-%H%M%S')
+    writer = ResultWriter(args.db or os.path.join(output_dir, DEFAULT_DB_PATH))
+    start: float = time.perf_counter()
+    try:
+        results: list[dict] = run_experiments(
+            configs, args.processes, writer, experiment)
+    finally:
+        writer.close()  # 写完已完成的各局
+    wall_time: float = time.perf_counter() - start
+    # 并行效率：各局耗时之和÷总耗时
+    busy_time: float = sum(result['summary']['wall_time'] for result in results)
+    print(
+        f'{len(results)} sessions finished in {wall_time:.1f}s '
+        f'(speedup x{busy_time / wall_time:.2f}).')
+    print(f'Results are exported to {save_results(results, os.path.join(output_dir, experiment))} '
+          f'and {writer.path} (experiment "{experiment}").')
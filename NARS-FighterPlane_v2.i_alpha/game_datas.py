@@ -0,0 +1,132 @@
+"""游戏数据（遥测）的降采样与多分辨率摘要
+- 多分辨率摘要：预先逐级计算「最值金字塔」（每桶保留最小值与最大值，不丢失尖峰与低谷），
+  缩放/重绘时按视野选取合适层级，让绘图点数与数据总量无关
+"""
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_POINTS: int = 2000
+"默认每条曲线最多绘制的点数"
+
+PYRAMID_FACTOR: int = 4
+"多分辨率摘要中，相邻两层之间的合并倍数"
+
+
+class MultiResolutionSeries:
+    """单条序列的多分辨率摘要（最值金字塔）
+    - 第0层为原始数据；第k层中每个桶覆盖原始数据的 PYRAMID_FACTOR**k 个点
+    - 每层记录各桶「最小值/最大值」及其横坐标，一次性向量化构建
+    - 查询时根据视野内的原始点数选择层级，返回的点数不超过max_points
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, factor: int = PYRAMID_FACTOR) -> None:
+        self.factor: int = factor
+        self.x: np.ndarray = np.asarray(x)
+        self.y: np.ndarray = np.asarray(y, dtype=np.float64)
+        # 各层：(桶起始横坐标, 最小值横坐标, 最小值, 最大值横坐标, 最大值)
+        self.levels: list[tuple[np.ndarray, ...]] = [
+            (self.x, self.x, self.y, self.x, self.y)
+        ]
+        self.__build_levels()
+
+    def __build_levels(self) -> None:
+        "逐级合并，直到只剩一个桶"
+        while len((level := self.levels[-1])[0]) > 1:
+            self.levels.append(self.__merge(level))
+
+    def __merge(self, level: tuple[np.ndarray, ...]) -> tuple[np.ndarray, ...]:
+        "把上一层每factor个桶合并为一个桶"
+        x_start, x_min, y_min, x_max, y_max = level
+        n: int = len(x_start)
+        num_buckets: int = -(-n // self.factor)
+        pad: int = num_buckets * self.factor - n
+        if pad:  # 用边缘值补齐，不影响最值
+            x_min, y_min, x_max, y_max = (
+                np.pad(x_min, (0, pad), mode='edge'),
+                np.pad(y_min, (0, pad), mode='edge'),
+                np.pad(x_max, (0, pad), mode='edge'),
+                np.pad(y_max, (0, pad), mode='edge'),
+            )
+        rows = np.arange(num_buckets)
+        arg_min = np.argmin(y_min.reshape(num_buckets, self.factor), axis=1)
+        arg_max = np.argmax(y_max.reshape(num_buckets, self.factor), axis=1)
+        x_min = x_min.reshape(num_buckets, self.factor)[rows, arg_min]
+        y_min = y_min.reshape(num_buckets, self.factor)[rows, arg_min]
+        x_max = x_max.reshape(num_buckets, self.factor)[rows, arg_max]
+        y_max = y_max.reshape(num_buckets, self.factor)[rows, arg_max]
+        return x_start[::self.factor], x_min, y_min, x_max, y_max
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def query(self, x_from=None, x_to=None, max_points: int = DEFAULT_MAX_POINTS) -> tuple[np.ndarray, np.ndarray]:
+        "获取视野[x_from, x_to]内的曲线，点数不超过max_points（横坐标须单调递增）"
+        if not len(self.x):
+            return self.x, self.y
+        x_from = self.x[0] if x_from is None else x_from
+        x_to = self.x[-1] if x_to is None else x_to
+        # 根据视野内的原始点数选取层级
+        num_raw: int = int(
+            np.searchsorted(self.x, x_to, side='right')
+            - np.searchsorted(self.x, x_from, side='left')
+        )
+        level_index: int = 0
+        num_points: int = num_raw
+        while num_points > max_points and level_index + 1 < len(self.levels):
+            level_index += 1
+            # 非原始层每个桶产生两个点
+            num_points = 2 * -(-num_raw // self.factor ** level_index)
+        x_start, x_min, y_min, x_max, y_max = self.levels[level_index]
+        # 多取左右各一个桶，保证曲线延伸到视野边缘
+        i_from = max(int(np.searchsorted(x_start, x_from, side='right')) - 1, 0)
+        i_to = min(int(np.searchsorted(x_start, x_to, side='right')) + 1, len(x_start))
+        if level_index == 0:
+            return x_min[i_from:i_to], y_min[i_from:i_to]
+        # 交错最小值与最大值，并保持横坐标顺序
+        x_min, y_min = x_min[i_from:i_to], y_min[i_from:i_to]
+        x_max, y_max = x_max[i_from:i_to], y_max[i_from:i_to]
+        min_first = x_min <= x_max
+        xs = np.empty(2 * len(x_min), dtype=x_min.dtype)
+        ys = np.empty(2 * len(y_min), dtype=np.float64)
+        xs[0::2] = np.where(min_first, x_min, x_max)
+        xs[1::2] = np.where(min_first, x_max, x_min)
+        ys[0::2] = np.where(min_first, y_min, y_max)
+        ys[1::2] = np.where(min_first, y_max, y_min)
+        return xs, ys
+
+
+class GameDataSummary:
+    """整张遥测表的多分辨率摘要
+    - 以行号为横坐标（与原「按索引绘图」一致），每列一个MultiResolutionSeries
+    - 保留「游戏内时间」列，用于把横坐标显示为游戏内时间
+    """
+
+    TIME_COLUMN: str = 'ingame_time'
+
+    def __init__(self, datas: pd.DataFrame) -> None:
+        self.index: np.ndarray = np.arange(len(datas))
+        self.ingame_times: np.ndarray = (
+            datas[self.TIME_COLUMN].to_numpy()
+            if self.TIME_COLUMN in datas.columns
+            else self.index
+        )
+        self.series: dict[str, MultiResolutionSeries] = {
+            name: MultiResolutionSeries(
+                self.index,
+                pd.to_numeric(datas[name], errors='coerce').fillna(0).to_numpy()
+            )
+            for name in datas.columns
+        }
+
+    def __getitem__(self, name: str) -> MultiResolutionSeries:
+        return self.series[name]
+
+    def __iter__(self):
+        return self.series.__iter__()
+
+    def ingame_time_at(self, x: float):
+        "横坐标（行号）→游戏内时间"
+        if not len(self.ingame_times):
+            return 0
+        return self.ingame_times[int(np.clip(round(x), 0, len(self.ingame_times) - 1))]
@@ -0,0 +1,100 @@
+"""性能HUD：显示与NARS程序通信的健康状况
+- 命令队列深度、每秒写入语句数、每秒读取行数、每秒操作数
+- 往返延迟分位数
+- 模拟帧率（每秒tick数）与渲染帧率
+为保证开销低廉：各速率按固定的现实时间间隔采样（差值/间隔），文字也只在采样时重新渲染，其余帧直接贴图
+"""
+
+import pygame
+
+from NARS_Latency import STAGE_ROUND_TRIP, PERCENTILES
+
+SAMPLE_INTERVAL_MS: int = 500
+"采样（并重新渲染）的现实时间间隔"
+
+TEXT_COLOR: list[int] = [120, 235, 120]
+PANEL_COLOR: tuple[int] = (0, 0, 0, 160)  # 半透明底板
+PANEL_POSITION: list[int] = [10, 200]
+LINE_HEIGHT: int = 20
+
+
+class PerformanceOverlay:
+    """性能HUD页
+    - update(游戏)：每帧调用；到达采样间隔时重新计算速率并渲染
+    - draw(屏幕)：贴上缓存的图层
+    """
+
+    def __init__(self, font: pygame.font.Font) -> None:
+        self.font: pygame.font.Font = font
+        self.surface: pygame.Surface = None  # 缓存的图层
+        self._last_sample_ticks: int = None
+        self._last_counts: tuple[int, ...] = None
+
+    def reset(self) -> None:
+        "重新开始采样（如：刚被打开时）"
+        self._last_sample_ticks = None
+        self.surface = None
+
+    @staticmethod
+    def _counts(game) -> tuple[int, ...]:
+        "采样所需的各项累计量"
+        brain = game.nars.brain
+        return (
+            brain.num_written_lines if brain else 0,
+            brain.num_read_lines if brain else 0,
+            game.nars.total_operates,
+            game.num_ticks,
+            game.num_rendered_frames,
+        )
+
+    def update(self, game) -> None:
+        "每帧调用：到达采样间隔时，重新计算并渲染"
+        current_ticks: int = pygame.time.get_ticks()
+        if self._last_sample_ticks is None:  # 首次：只记录起点
+            self._last_sample_ticks = current_ticks
+            self._last_counts = self._counts(game)
+            self.surface = self.surface or self._render(game, (0,) * 5)
+            return
+        if (elapsed_ms := current_ticks - self._last_sample_ticks) < SAMPLE_INTERVAL_MS:
+            return
+        counts: tuple[int, ...] = self._counts(game)
+        rates: tuple[float, ...] = tuple(
+            (current - last) * 1000 / elapsed_ms
+            for current, last in zip(counts, self._last_counts)
+        )
+        self._last_sample_ticks = current_ticks
+        self._last_counts = counts
+        self.surface = self._render(game, rates)
+
+    def _render(self, game, rates: tuple[float, ...]) -> pygame.Surface:
+        "渲染整页文字到一个图层"
+        written_rate, read_rate, operation_rate, tick_rate, frame_rate = rates
+        brain = game.nars.brain
+        round_trip = (
+            brain.latency[STAGE_ROUND_TRIP].percentiles() if brain
+            else {p: 0.0 for p in PERCENTILES}
+        )
+        lines: list[str] = [
+            '[I/O health]',
+            'Queue depth: %d' % (game.nars.num_cached_cmds if brain else 0),
+            'Written: %.1f sentences/s' % written_rate,
+            'Read: %.1f lines/s' % read_rate,
+            'Operations: %.1f /s' % operation_rate,
+            'Round trip(ms): ' + ' '.join(
+                'p%d=%.1f' % (p, seconds * 1000) for p, seconds in round_trip.items()),
+            'Sim: %.1f ticks/s | Render: %.1f FPS' % (tick_rate, frame_rate),
+            'Late ticks: %d | late timers: %d' % (game.tick_overruns, game.timer_overruns),
+        ]
+        surface = pygame.Surface(
+            (300, LINE_HEIGHT * len(lines) + 10), pygame.SRCALPHA)
+        surface.fill(PANEL_COLOR)
+        for i, line in enumerate(lines):
+            surface.blit(
+                self.font.render(line, True, TEXT_COLOR),
+                [5, 5 + i * LINE_HEIGHT])
+        return surface
+
+    def draw(self, screen: pygame.Surface, top: int = None) -> None:
+        "top：图层顶部的纵坐标（为空则使用PANEL_POSITION；避免遮挡游戏自身的文字）"
+        if self.surface:
+            screen.blit(self.surface, PANEL_POSITION if top is None else [PANEL_POSITION[0], top])
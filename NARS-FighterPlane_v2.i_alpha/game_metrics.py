@@ -0,0 +1,157 @@
+"""游戏表现的「滚动指标」
+- 原先的指标都是「累计值/游戏内总时长」，时间一长便几乎不再变化，掩盖了学习过程中的变化
+- 此处的指标均以「游戏内秒」为步进，增量维护，每次更新与读取都是O(1)
+"""
+
+
+class SlidingWindowCounter:
+    """滑动窗口计数器
+    - 使用环形数组存储最近window个（已结束的）「游戏内秒」中每秒的事件数，外加正在累计的当前秒
+    - 同步维护窗口内总数：步进时减去过期的一格，无需重新扫描历史
+    """
+
+    def __init__(self, window: int) -> None:
+        self.window: int = max(int(window), 1)
+        self._slots: list[int] = [0] * (self.window + 1)
+        self._cursor: int = 0  # 当前（正在累计的）这一秒所在的格子
+        self._total: int = 0  # 所有格子（含当前秒）的事件总数
+        self._elapsed: int = 0  # 已经步进过的秒数（用于窗口未填满时）
+
+    def add(self, n: int = 1) -> None:
+        "在当前这一秒内记录n个事件"
+        self._slots[self._cursor] += n
+        self._total += n
+
+    def advance(self) -> None:
+        "步进一秒：移动到下一格，并丢弃最早的一格"
+        self._cursor = (self._cursor + 1) % len(self._slots)
+        self._total -= self._slots[self._cursor]
+        self._slots[self._cursor] = 0
+        self._elapsed += 1
+
+    def reset(self) -> None:
+        "清空窗口"
+        self._slots = [0] * (self.window + 1)
+        self._cursor = self._total = self._elapsed = 0
+
+    @property
+    def total(self) -> int:
+        "窗口内（已结束的各秒）的事件总数"
+        return self._total - self._slots[self._cursor]
+
+    @property
+    def is_full(self) -> bool:
+        "窗口是否已填满（此后的比率才覆盖完整的窗口）"
+        return self._elapsed >= self.window
+
+    @property
+    def rate(self) -> float:
+        "窗口内平均每秒的事件数（窗口未填满时按已过时间计算）"
+        span: int = min(self._elapsed, self.window)
+        return self.total / span if span else 0.0
+
+
+class EWMA:
+    """指数加权移动平均
+    - 每步进一次：value ← α·样本 + (1-α)·value
+    - 使用「半衰期」（单位：步）构造时，α = 1 - 0.5^(1/半衰期)
+    """
+
+    def __init__(self, alpha: float) -> None:
+        self.alpha: float = alpha
+        self.value: float = 0.0
+        self._initialized: bool = False
+
+    @staticmethod
+    def from_half_life(half_life: float):
+        "根据半衰期构造"
+        return EWMA(1 - 0.5 ** (1 / half_life))
+
+    def update(self, sample: float) -> float:
+        "送入一个样本，返回更新后的值"
+        if self._initialized:
+            self.value += self.alpha * (sample - self.value)
+        else:  # 第一个样本直接作为初值，避免从零开始的偏差
+            self.value = sample
+            self._initialized = True
+        return self.value
+
+    def reset(self) -> None:
+        self.value = 0.0
+        self._initialized = False
+
+
+class RollingMetrics:
+    """游戏的滚动表现指标（按「游戏内秒」步进）
+    - 命中率：最近window秒内平均每秒击中的敌机数
+    - 奖励EWMA：每秒「奖励-惩罚」事件数的指数加权平均
+    - 感知率/操作率：最近window秒内平均每秒送入NARS的感知数/从NARS收到的操作数
+    """
+
+    DEFAULT_WINDOW_S: int = 30
+    DEFAULT_HALF_LIFE_S: float = 10
+
+    def __init__(self, window: int = DEFAULT_WINDOW_S, half_life: float = DEFAULT_HALF_LIFE_S) -> None:
+        self.window: int = window
+        self.hits: SlidingWindowCounter = SlidingWindowCounter(window)
+        self.senses: SlidingWindowCounter = SlidingWindowCounter(window)
+        self.operations: SlidingWindowCounter = SlidingWindowCounter(window)
+        self.reward: EWMA = EWMA.from_half_life(half_life)
+        self._rewards_this_second: int = 0
+        # 上一秒时「累计量」的快照：用差值得到这一秒的增量
+        self._last_total_senses: int = 0
+        self._last_total_operates: int = 0
+
+    def on_hit(self, n: int = 1) -> None:
+        "击中敌机（奖励事件）"
+        self.hits.add(n)
+        self._rewards_this_second += n
+
+    def on_punish(self, n: int = 1) -> None:
+        "被敌机撞击（惩罚事件）"
+        self._rewards_this_second -= n
+
+    def tick_second(self, total_senses: int, total_operates: int) -> None:
+        "游戏内时间前进一秒：结算这一秒的增量，并推进所有窗口"
+        self.senses.add(total_senses - self._last_total_senses)
+        self.operations.add(total_operates - self._last_total_operates)
+        self._last_total_senses = total_senses
+        self._last_total_operates = total_operates
+        self.reward.update(self._rewards_this_second)
+        self._rewards_this_second = 0
+        for counter in (self.hits, self.senses, self.operations):
+            counter.advance()
+
+    def reset(self, total_senses: int = 0, total_operates: int = 0) -> None:
+        "重置所有窗口（累计量从给定值开始计算增量）"
+        for counter in (self.hits, self.senses, self.operations):
+            counter.reset()
+        self.reward.reset()
+        self._rewards_this_second = 0
+        self._last_total_senses = total_senses
+        self._last_total_operates = total_operates
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits.rate
+
+    @property
+    def reward_ewma(self) -> float:
+        return self.reward.value
+
+    @property
+    def sense_rate(self) -> float:
+        return self.senses.rate
+
+    @property
+    def operation_rate(self) -> float:
+        return self.operations.rate
+
+    def snapshot(self) -> dict[str, float]:
+        "以字典形式导出当前指标（供遥测记录）"
+        return {
+            'hit rate': self.hit_rate,
+            'reward ewma': self.reward_ewma,
+            'windowed sense rate': self.sense_rate,
+            'windowed activation rate': self.operation_rate,
+        }
@@ -0,0 +1,89 @@
+"""每局独立、可复现的随机数
+- 每局一个种子，派生出互不干扰的随机数流：world（敌机出场）、babble（无意识操作）
+- 敌机出场表：依次给出每架敌机的(速度, 横坐标)；可预先生成并存为文件，在不同后端/参数之间复用同一个世界
+用法（预生成出场表）：python game_random.py spawns.json --seed 0 --count 2000
+"""
+
+import json
+import random
+import argparse
+
+from game_sprites import SCREEN_RECT, ENEMY_IMAGE, ENEMY_SPEED_RANGE, load_image
+
+STREAM_WORLD: str = 'world'
+STREAM_BABBLE: str = 'babble'
+
+
+def enemy_max_x() -> int:
+    "敌机横坐标的最大值（由敌机图片宽度决定）"
+    return SCREEN_RECT.width - load_image(ENEMY_IMAGE).get_width()
+
+
+def new_seed() -> int:
+    "未指定种子时随机取一个（仍会被记录，以便复现）"
+    return random.randrange(2 ** 32)
+
+
+class GameRandom:
+    "一局游戏的随机数流（由同一种子派生，互相独立）"
+
+    def __init__(self, seed: int = None) -> None:
+        self.seed: int = new_seed() if seed is None else seed
+        # 以「种子:流名」作为字符串种子：各流独立，且不受哈希随机化影响
+        self.world: random.Random = random.Random(f'{self.seed}:{STREAM_WORLD}')
+        self.babble: random.Random = random.Random(f'{self.seed}:{STREAM_BABBLE}')
+
+
+class SpawnSchedule:
+    """敌机出场表
+    - next()：取出下一架敌机的(速度, 横坐标)
+    - 预生成/读入的部分用完后，继续由随机数流按需生成
+    """
+
+    def __init__(self, rng: random.Random, max_x: int, spawns: list[tuple[int, int]] = None) -> None:
+        self.rng: random.Random = rng
+        self.max_x: int = max_x
+        self.spawns: list[tuple[int, int]] = list(spawns or [])
+        self.index: int = 0
+
+    def _generate(self) -> tuple[int, int]:
+        return self.rng.randint(*ENEMY_SPEED_RANGE), self.rng.randint(0, self.max_x)
+
+    def pregenerate(self, count: int) -> None:
+        "预先生成（补足到）count架敌机"
+        while len(self.spawns) < count:
+            self.spawns.append(self._generate())
+
+    def next(self) -> tuple[int, int]:
+        if self.index >= len(self.spawns):
+            self.spawns.append(self._generate())
+        spawn: tuple[int, int] = self.spawns[self.index]
+        self.index += 1
+        return spawn
+
+    def save(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump([list(spawn) for spawn in self.spawns], file)
+
+    @staticmethod
+    def load(path: str, rng: random.Random, max_x: int) -> 'SpawnSchedule':
+        with open(path, encoding='utf-8') as file:
+            return SpawnSchedule(rng, max_x, [tuple(spawn) for spawn in json.load(file)])
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Pregenerate an enemy spawn schedule')
+    parser.add_argument('path', help='output file (JSON)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--count', type=int, default=2000,
+                        help='number of enemies (one per in-game second by default)')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args: argparse.Namespace = parse_args()
+    schedule = SpawnSchedule(GameRandom(args.seed).world, enemy_max_x())
+    schedule.pregenerate(args.count)
+    schedule.save(args.path)
+    print(f'{args.count} spawns with seed {args.seed} are saved to {args.path}.')
@@ -0,0 +1,108 @@
+"""游戏内的事件调度器
+- 替代pygame的USEREVENT定时器：不再经由SDL事件队列，避免游戏迟滞时事件堆积、成批到达
+- 以「模拟时间」（游戏内毫秒）为键，使用优先队列（堆）按到期时间依次派发
+- 由游戏主循环每帧驱动一次（advance），与图形的逐帧运动保持同步
+"""
+
+import heapq
+from itertools import count
+
+
+class ScheduledTask:
+    """一个周期性任务
+    - period_ms：周期（游戏内毫秒）
+    - callback：到期时调用的函数（无参数）
+    """
+
+    def __init__(self, name, period_ms: float, callback) -> None:
+        self.name = name
+        self.period_ms: float = period_ms
+        self.callback = callback
+        self.due_ms: float = 0  # 下一次到期的模拟时间
+        self.paused: bool = False
+        self.runs: int = 0  # 执行次数
+        self._version: int = 0  # 每次重新入堆时递增，用于「惰性删除」堆中的过期条目
+
+    def __repr__(self) -> str:
+        return f'<ScheduledTask {self.name} every {self.period_ms:.1f}ms, due at {self.due_ms:.1f}ms>'
+
+
+class GameScheduler:
+    """基于堆的事件调度器
+    - 所有时间都是「模拟时间」，只在advance时前进；游戏速度变化无需重置任何定时器
+    - 若一次步进跨过了某任务的多个周期，只执行一次（合并错过的周期），避免成批触发
+    - 暂停/恢复都不会影响其它任务的相位
+    """
+
+    def __init__(self) -> None:
+        self.now_ms: float = 0
+        self._heap: list[tuple[float, int, int, ScheduledTask]] = []
+        self._tasks: dict[any, ScheduledTask] = {}
+        self._sequence = count()  # 同一时刻到期时，按安排的先后执行
+
+    def __contains__(self, name) -> bool:
+        return name in self._tasks
+
+    def __getitem__(self, name) -> ScheduledTask:
+        return self._tasks[name]
+
+    def _push(self, task: ScheduledTask) -> None:
+        "（重新）入堆：旧条目因版本号不符而在出堆时被丢弃"
+        task._version += 1
+        heapq.heappush(
+            self._heap,
+            (task.due_ms, next(self._sequence), task._version, task)
+        )
+
+    def schedule(self, name, period_ms: float, callback, delay_ms: float = None) -> ScheduledTask:
+        "安排一个周期性任务（默认一个周期后首次执行），同名任务会被替换"
+        task = ScheduledTask(name, period_ms, callback)
+        task.due_ms = self.now_ms + (period_ms if delay_ms is None else delay_ms)
+        if name in self._tasks:
+            self._tasks[name]._version += 1  # 使旧任务在堆中的条目失效
+        self._tasks[name] = task
+        self._push(task)
+        return task
+
+    def cancel(self, name) -> None:
+        "取消任务"
+        if task := self._tasks.pop(name, None):
+            task._version += 1
+
+    def pause(self, name) -> None:
+        "暂停任务（替代pygame.event.set_blocked）"
+        if (task := self._tasks.get(name)) and not task.paused:
+            task.paused = True
+            task._version += 1
+
+    def resume(self, name) -> None:
+        "恢复任务（替代pygame.event.set_allowed）：从现在起一个周期后执行"
+        if (task := self._tasks.get(name)) and task.paused:
+            task.paused = False
+            task.due_ms = self.now_ms + task.period_ms
+            self._push(task)
+
+    def is_paused(self, name) -> bool:
+        return self._tasks[name].paused
+
+    def advance(self, dt_ms: float) -> int:
+        "推进模拟时间，并按到期顺序执行所有到期任务（返回执行的任务数）"
+        self.now_ms += dt_ms
+        num_runs: int = 0
+        heap = self._heap
+        while heap and heap[0][0] <= self.now_ms:
+            _, _, version, task = heapq.heappop(heap)
+            if version != task._version:  # 已被取消/暂停/重排的过期条目
+                continue
+            # 合并错过的周期：只执行一次，下一次到期落在当前时刻之后
+            missed: int = int((self.now_ms - task.due_ms) // task.period_ms)
+            task.due_ms += (missed + 1) * task.period_ms
+            task.runs += 1
+            self._push(task)
+            task.callback()
+            num_runs += 1
+        return num_runs
+
+    @property
+    def tasks(self) -> list[ScheduledTask]:
+        return list(self._tasks.values())
@@ -4,11 +4,26 @@ import random
 # the size of game window, Rect(left, top, width, height). left = x, top = y
 SCREEN_RECT = pygame.Rect(0, 0, 480, 700)
 
+ENEMY_IMAGE = "./../images/enemy1.png"
+ENEMY_SPEED_RANGE = (2, 3)  # enemy speed is randomly chosen in [2, 3]
+HERO_IMAGE = "./../images/me1.png"
+BULLET_IMAGE = "./../images/bullet1.png"
+BULLET_SPEED = -50
+
+_image_cache = {}  # image path -> loaded surface
+
+
+def load_image(image_name):
+    "load an image once and share the surface (sprites never draw onto their images)"
+    if (image := _image_cache.get(image_name)) is None:
+        image = _image_cache[image_name] = pygame.image.load(image_name)
+    return image
+
 
 class GameSprite(pygame.sprite.Sprite):
     def __init__(self, image_name, speed=1):
         super().__init__()
-        self.image = pygame.image.load(image_name)
+        self.image = load_image(image_name)
         self.rect = self.image.get_rect()
         self.speed = speed
 
@@ -29,12 +44,13 @@ class Background(GameSprite):
 
 
 class Enemy(GameSprite):
-    def __init__(self):
-        super().__init__("./../images/enemy1.png")
-        self.speed = random.randint(2, 3)
+    def __init__(self, speed=None, x=None, rng=random):
+        "speed/x: given by a spawn schedule, or drawn from rng (the global random by default)"
+        super().__init__(ENEMY_IMAGE)
+        self.speed = rng.randint(*ENEMY_SPEED_RANGE) if speed is None else speed
         self.rect.bottom = 0
         max_x = SCREEN_RECT.width - self.rect.width
-        self.rect.x = random.randint(0, max_x)  # the initial x position
+        self.rect.x = rng.randint(0, max_x) if x is None else x  # the initial x position
 
     def update(self):
         super().update()
@@ -48,7 +64,7 @@ class Enemy(GameSprite):
 
 class Hero(GameSprite):
     def __init__(self):
-        super().__init__("./../images/me1.png", 0)
+        super().__init__(HERO_IMAGE, 0)
         self.rect.centerx = SCREEN_RECT.centerx
         self.rect.bottom = SCREEN_RECT.bottom
         self.bullets = pygame.sprite.Group()
@@ -72,7 +88,7 @@ class Hero(GameSprite):
     def fire(self):
         # print("fire")
         for i in [0]:
-            bullet = Bullet(-50)
+            bullet = Bullet(BULLET_SPEED)
             bullet.rect.bottom = self.rect.top - i * 20  # bullet's initial position
             bullet.rect.centerx = self.rect.centerx
             self.bullets.add(bullet)
@@ -80,7 +96,7 @@ class Hero(GameSprite):
 
 class Bullet(GameSprite):
     def __init__(self, speed=-2):
-        super().__init__("./../images/bullet1.png", speed)
+        super().__init__(BULLET_IMAGE, speed)
 
     def update(self):
         super().update()
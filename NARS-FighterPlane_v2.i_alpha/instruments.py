@@ -0,0 +1,190 @@
+"""热点路径的轻量计时/计数注册表
+- 以「名称」区分各段代码（如「game.collision」「nars.write」），名称前缀表示所属模块
+- 关闭时几乎零开销：计时段返回共享的空上下文，装饰器只多一次布尔判断
+- 可在运行时开关（按键或命令行参数），并周期性地导出摘要
+- 可挂接一个时间线追踪器（tracing.Tracer），让同一批计时段同时记录为时间线
+- 线程安全：游戏、读取与写入线程会同时记录，统计的创建与更新都在锁内进行
+"""
+
+import threading
+from time import perf_counter
+from contextlib import nullcontext
+
+_NULL_SECTION = nullcontext()
+"关闭时共享的空计时段"
+
+
+class TimerStat:
+    "单个计时段的统计：次数、总耗时、最大耗时"
+
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class _Section:
+    "开启时使用的计时段（上下文管理器）"
+
+    __slots__ = ('registry', 'name', 'start')
+
+    def __init__(self, registry, name: str) -> None:
+        self.registry = registry
+        self.name: str = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.registry.add_span(self.name, self.start, perf_counter())
+
+
+class Instruments:
+    """计时/计数注册表
+    - section(名称)：with语句计时
+    - timed(名称)：函数装饰器计时
+    - count(名称, n)：计数
+    - summary()：导出自上次重置以来的统计
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self._enabled: bool = enabled
+        self.tracer = None  # 挂接的时间线追踪器
+        self.active: bool = enabled  # 计时段是否需要测量（计时或追踪任一开启）
+        self.timers: dict[str, TimerStat] = {}
+        self.counters: dict[str, int] = {}
+        self.window_start: float = perf_counter()
+        self._lock: threading.Lock = threading.Lock()  # 保护timers与counters（只在开启统计时使用）
+
+    @property
+    def enabled(self) -> bool:
+        "是否统计计时/计数"
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value: bool) -> None:
+        self._enabled = bool(value)
+        self.active = self._enabled or self.tracer is not None
+
+    def attach_tracer(self, tracer) -> None:
+        "挂接时间线追踪器（传入None则卸下）"
+        self.tracer = tracer
+        self.active = self._enabled or self.tracer is not None
+
+    def toggle(self) -> bool:
+        "开关计时（返回开关后的状态）；重新开启时清空旧数据"
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.reset()
+        return self.enabled
+
+    def reset(self) -> None:
+        with self._lock:
+            self.timers = {}
+            self.counters = {}
+            self.window_start = perf_counter()
+
+    # 记录 #
+
+    def add_time(self, name: str, seconds: float) -> None:
+        with self._lock:
+            if (timer := self.timers.get(name)) is None:
+                timer = self.timers[name] = TimerStat()
+            timer.add(seconds)
+
+    def add_span(self, name: str, start: float, end: float) -> None:
+        "记录一个计时段：计入统计，并交给追踪器（若有）"
+        if self._enabled:
+            self.add_time(name, end - start)
+        if (tracer := self.tracer) is not None:
+            tracer.complete(name, start, end)
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self._enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + n
+
+    def section(self, name: str):
+        "计时段：with INSTRUMENTS.section('game.hud'): ..."
+        return _Section(self, name) if self.active else _NULL_SECTION
+
+    def timed(self, name: str):
+        "计时装饰器：@INSTRUMENTS.timed('nars.write')"
+        def decorator(func):
+            def wrapper(*args, **kwargs):
+                if not self.active:
+                    return func(*args, **kwargs)
+                start: float = perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.add_span(name, start, perf_counter())
+            wrapper.__name__ = func.__name__
+            wrapper.__doc__ = func.__doc__
+            return wrapper
+        return decorator
+
+    # 导出 #
+
+    def summary(self, prefix: str = '', reset: bool = False) -> dict[str, dict[str, float]]:
+        """导出统计摘要（仅包含指定前缀的名称）
+        - 计时段：{名称: {count, total_ms, mean_ms, max_ms, share}}，share为耗时占统计窗口的比例
+        - 计数器：{名称: {count, rate}}，rate为每（现实）秒次数
+        """
+        with self._lock:  # 一致的快照
+            window: float = perf_counter() - self.window_start
+            timers: list[tuple[str, int, float, float]] = [
+                (name, timer.count, timer.total, timer.max)
+                for name, timer in self.timers.items()
+            ]
+            counters: list[tuple[str, int]] = list(self.counters.items())
+            if reset:  # 在同一把锁内清空：快照与清空之间的记录不会丢失
+                self.timers, self.counters, self.window_start = {}, {}, perf_counter()
+        result: dict[str, dict[str, float]] = {}
+        for name, count, total, max_seconds in timers:
+            if name.startswith(prefix):
+                result[name] = {
+                    'count': count,
+                    'total_ms': total * 1000,
+                    'mean_ms': total / count * 1000 if count else 0.0,
+                    'max_ms': max_seconds * 1000,
+                    'share': total / window if window else 0.0,
+                }
+        for name, n in counters:
+            if name.startswith(prefix):
+                result[name] = {
+                    'count': n,
+                    'rate': n / window if window else 0.0,
+                }
+        return result
+
+    def report(self, prefix: str = '', reset: bool = False) -> str:
+        "生成可读的摘要文本"
+        lines: list[str] = []
+        for name, stat in sorted(self.summary(prefix, reset).items()):
+            if 'total_ms' in stat:
+                lines.append(
+                    f'{name:<24} n={stat["count"]:<7d} total={stat["total_ms"]:9.2f}ms '
+                    f'mean={stat["mean_ms"]:7.3f}ms max={stat["max_ms"]:7.3f}ms share={stat["share"]:6.1%}'
+                )
+            else:
+                lines.append(
+                    f'{name:<24} n={stat["count"]:<7d} rate={stat["rate"]:.1f}/s')
+        return '\n'.join(lines)
+
+
+INSTRUMENTS: Instruments = Instruments()
+"全局注册表（游戏与NARS共用）"
@@ -0,0 +1,230 @@
+"""学习速度基准：各后端在标准场景下「学会」所需的时间
+- 标准场景：固定种子、固定的敌机出场表、固定的babble预算，无界面、以最快速度推进模拟
+- 对每个后端，记录滚动命中率（窗口填满后）首次达到各阈值时的游戏内时间与现实时间，以及后端进程消耗的CPU时间
+- 结果追加到基准表（CSV）中，按发布版本（--release）区分，并输出各版本、各后端的对比表（Markdown）
+- 后端CPU时间：安装了psutil时在结束前采样（含子进程）；否则在POSIX上使用已回收子进程的资源统计
+用法：python learning_benchmark.py --backend opennars ONA python --release v2.i [--repeats 3]
+"""
+
+import os
+import time
+import argparse
+import multiprocessing as mp
+from statistics import median
+
+import pandas as pd
+
+from experiment_runner import GAME_DIR, DEFAULT_OUTPUT_DIR, SCRIPTED_TYPES, apply_settings
+
+try:
+    import psutil
+except ImportError:  # 可选依赖
+    psutil = None
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_BACKENDS: list[str] = ['opennars', 'ONA', 'python']
+DEFAULT_THRESHOLDS: list[float] = [0.25, 0.5, 0.75]
+"命中率阈值（窗口内平均每秒击中的敌机数）"
+DEFAULT_SCENARIO: dict = {
+    'seed': 0,
+    'babble_times': 200,
+    'game_speed': 1.0,
+    'enable_punish': False,
+    'duration_s': 600,
+}
+"标准场景"
+DEFAULT_RELEASE: str = 'v2.i'
+TABLE_NAME: str = 'learning_benchmark.csv'
+"基准表（位于输出目录，各版本的结果追加到同一张表）"
+
+
+def backend_cpu_time(program) -> float:
+    "（psutil）后端进程及其子进程已消耗的CPU时间（秒）；无法获取时返回None"
+    if psutil is None or program is None or program.process is None:
+        return None
+    try:
+        process = psutil.Process(program.process.pid)
+        return sum(
+            sum(p.cpu_times()[:2])  # user + system
+            for p in [process, *process.children(recursive=True)])
+    except psutil.Error:
+        return None
+
+
+def children_cpu_time() -> float:
+    "（POSIX）已回收子进程的CPU时间（秒）；无法获取时返回None"
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_learning(config: dict) -> dict:
+    "（在子进程中）运行一局标准场景，返回各阈值的达成时间"
+    os.chdir(GAME_DIR)
+    from plane_game import PlaneGame, NARSType, setup_logging, shutdown_logging
+    setup_logging(config['log_level'])
+
+    game = PlaneGame(
+        nars_type=NARSType(config['nars_type']),
+        game_speed=config['game_speed'],
+        enable_punish=config['enable_punish'],
+        headless=True,
+        brain_options=config['brain_options'],
+        seed=config['seed'],
+        spawn_schedule=config['spawn_schedule'],
+    )
+    game.paced = False  # 以最快速度推进模拟
+    thresholds: list[float] = sorted(config['thresholds'])
+    reached: dict[float, tuple[int, float]] = {}
+    cpu_time: float = None
+    start: float = time.perf_counter()
+    try:
+        apply_settings(game, config)
+        game.start_time = game.current_time
+        while game.speeding_delta_time_s < config['duration_s'] and len(reached) < len(thresholds):
+            game.tick()
+            if not game.metrics.hits.is_full:  # 窗口未填满时，比率受开局的偶然击中影响
+                continue
+            for threshold in thresholds[len(reached):]:
+                if game.metrics.hit_rate < threshold:
+                    break
+                reached[threshold] = (
+                    game.speeding_delta_time_s, time.perf_counter() - start)
+        wall_time: float = time.perf_counter() - start
+        cpu_time = backend_cpu_time(game.nars.brain)
+        summary: dict = game.run_summary()
+    finally:
+        game.close()
+        shutdown_logging()
+    if cpu_time is None:  # 此时后端进程已被回收
+        cpu_time = children_cpu_time()
+    return {
+        'release': config['release'],
+        'backend': config['nars_type'],
+        'repeat': config['repeat'],
+        'seed': config['seed'],
+        'ingame_time': summary['ingame_time'],
+        'wall_time': wall_time,
+        'backend_cpu_time': cpu_time,
+        'score': summary['score'],
+        **{f'ingame@{threshold:g}': reached.get(threshold, (None,))[0] for threshold in thresholds},
+        **{f'wall@{threshold:g}': reached.get(threshold, (None, None))[1] for threshold in thresholds},
+    }
+
+
+def make_configs(args: argparse.Namespace) -> list[dict]:
+    "每个后端、每次重复一局（场景完全相同；替身后端也使用场景种子）"
+    return [
+        {
+            'nars_type': backend,
+            'repeat': repeat,
+            'release': args.release,
+            'seed': args.seed,
+            'spawn_schedule': args.spawn_schedule and os.path.abspath(args.spawn_schedule),
+            'babble_times': args.babble_times,
+            'game_speed': args.speed,
+            'enable_punish': args.punish,
+            'duration_s': args.duration,
+            'thresholds': args.thresholds,
+            'brain_options': {'seed': args.seed} if backend in SCRIPTED_TYPES else {},
+            'log_level': args.log_level,
+        }
+        for backend in args.backend
+        for repeat in range(args.repeats)
+    ]
+
+
+def run_benchmark(configs: list[dict], processes: int = 1) -> list[dict]:
+    "逐局运行（默认一次一局：各后端不争抢CPU，现实时间可比）"
+    rows: list[dict] = []
+    with mp.get_context('spawn').Pool(processes, maxtasksperchild=1) as pool:
+        for row in pool.imap_unordered(run_learning, configs):
+            rows.append(row)
+            print(
+                f'[{len(rows)}/{len(configs)}] {row["backend"]} #{row["repeat"]}: '
+                f'score={row["score"]} in {row["ingame_time"]}s in-game, {row["wall_time"]:.1f}s wall')
+    return rows
+
+
+def _format(values: list, unit: str, digits: int = 1) -> str:
+    "多次重复的中位数（附达成次数）"
+    reached: list = [value for value in values if value is not None and not pd.isna(value)]
+    if not reached:
+        return '—'
+    text: str = f'{median(reached):.{digits}f}{unit}'
+    return text if len(reached) == len(values) else f'{text} ({len(reached)}/{len(values)})'
+
+
+def comparison_table(table: pd.DataFrame, thresholds: list[float]) -> str:
+    "对比表（Markdown）：每个「版本+后端」一行，各阈值的游戏内/现实时间与后端CPU时间取中位数"
+    header: list[str] = [
+        'release', 'backend', 'runs',
+        *(f'hit rate ≥ {threshold:g}' for threshold in thresholds),
+        'backend CPU',
+    ]
+    lines: list[str] = [
+        '| ' + ' | '.join(header) + ' |',
+        '|' + '---|' * len(header),
+    ]
+    for (release, backend), runs in table.groupby(['release', 'backend'], sort=False):
+        cells: list[str] = [release, backend, str(len(runs))]
+        for threshold in thresholds:
+            ingame, wall = f'ingame@{threshold:g}', f'wall@{threshold:g}'
+            cells.append(
+                f'{_format(list(runs[ingame]), "s")} / {_format(list(runs[wall]), "s wall")}'
+                if ingame in runs else '—')
+        cells.append(_format(list(runs['backend_cpu_time']), 's', 2))
+        lines.append('| ' + ' | '.join(cells) + ' |')
+    return '\n'.join(lines)
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Benchmark how fast each NARS backend learns the standard scenario')
+    parser.add_argument('--backend', nargs='+', default=DEFAULT_BACKENDS,
+                        help=f'NARS types to compare (default {" ".join(DEFAULT_BACKENDS)})')
+    parser.add_argument('--release', default=DEFAULT_RELEASE,
+                        help=f'release label of this run (default {DEFAULT_RELEASE})')
+    parser.add_argument('--thresholds', type=float, nargs='+', default=DEFAULT_THRESHOLDS,
+                        help='rolling hit rate thresholds (hits per in-game second)')
+    parser.add_argument('--repeats', type=int, default=1,
+                        help='sessions per backend (the median is reported)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SCENARIO['seed'])
+    parser.add_argument('--spawn-schedule', metavar='FILE',
+                        help='pregenerated enemy spawn schedule (default: generated from the seed)')
+    parser.add_argument('--babble-times', type=int, default=DEFAULT_SCENARIO['babble_times'],
+                        help='babble budget of backends that need babbling')
+    parser.add_argument('--speed', type=float, default=DEFAULT_SCENARIO['game_speed'])
+    parser.add_argument('--punish', action='store_true',
+                        default=DEFAULT_SCENARIO['enable_punish'])
+    parser.add_argument('--duration', type=int, default=DEFAULT_SCENARIO['duration_s'],
+                        help='in-game time limit of each session in seconds')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='sessions run at the same time (default 1, for comparable wall times)')
+    parser.add_argument('--log-level', default='WARNING')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR,
+                        help=f'directory of the benchmark table (default {DEFAULT_OUTPUT_DIR})')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args: argparse.Namespace = parse_args()
+    output_dir: str = os.path.abspath(args.output)
+    os.makedirs(output_dir, exist_ok=True)
+    table_path: str = os.path.join(output_dir, TABLE_NAME)
+    rows: list[dict] = run_benchmark(make_configs(args), args.processes)
+    table: pd.DataFrame = pd.DataFrame(rows).sort_values(['backend', 'repeat'])
+    if os.path.exists(table_path):  # 同一版本重新运行时，替换该版本的结果
+        previous: pd.DataFrame = pd.read_csv(table_path)
+        table = pd.concat(
+            [previous[previous['release'] != args.release], table], ignore_index=True)
+    table.to_csv(table_path, index=False)
+    markdown: str = comparison_table(table, sorted(args.thresholds))
+    with open(os.path.join(output_dir, 'learning_benchmark.md'), 'w', encoding='utf-8') as file:
+        file.write(markdown + '\n')
+    print(f'\nTime to competence (median in-game / wall-clock time):\n{markdown}')
+    print(f'Results are saved to {table_path}.')
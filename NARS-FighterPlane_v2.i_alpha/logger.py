@@ -0,0 +1,147 @@
+"""分级、分类、异步的日志（替代热点路径上的print）
+- 分类：io（与NARS程序的读写）、ops（NARS操作）、game（游戏事件）、babble（无意识操作）
+- 分级：使用标准logging的级别，未启用的级别在调用处即被过滤，几乎没有开销
+- 惰性格式化：调用处只传递「模板+参数」，格式化与输出都在后台线程中进行
+- 限流：同一条模板在一个时间窗口内超出次数后被抑制，窗口结束时汇报被抑制的条数
+"""
+
+import sys
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+
+ROOT_LOGGER_NAME: str = 'fighterplane'
+
+CATEGORY_IO: str = 'io'
+CATEGORY_OPS: str = 'ops'
+CATEGORY_GAME: str = 'game'
+CATEGORY_BABBLE: str = 'babble'
+CATEGORIES: tuple[str] = (
+    CATEGORY_IO, CATEGORY_OPS, CATEGORY_GAME, CATEGORY_BABBLE)
+
+DEFAULT_LEVEL: str = 'INFO'
+DEFAULT_FORMAT: str = '%(asctime)s %(levelname)-7s [%(category)s] %(message)s'
+
+DEFAULT_RATE_LIMIT: int = 20
+"每个时间窗口内，同一模板最多输出的条数"
+DEFAULT_RATE_WINDOW: float = 1.0
+"限流窗口（秒）"
+
+
+def get_logger(category: str) -> logging.Logger:
+    "获取某个分类的日志器"
+    return logging.getLogger(f'{ROOT_LOGGER_NAME}.{category}')
+
+
+LOG_IO: logging.Logger = get_logger(CATEGORY_IO)
+LOG_OPS: logging.Logger = get_logger(CATEGORY_OPS)
+LOG_GAME: logging.Logger = get_logger(CATEGORY_GAME)
+LOG_BABBLE: logging.Logger = get_logger(CATEGORY_BABBLE)
+
+
+class RateLimitFilter(logging.Filter):
+    """按「分类+模板」限流（在调用线程中运行，被抑制的日志不会进入队列）"""
+
+    def __init__(self, limit: int = DEFAULT_RATE_LIMIT, window: float = DEFAULT_RATE_WINDOW) -> None:
+        super().__init__()
+        self.limit: int = limit
+        self.window: float = window
+        self._windows: dict[tuple[str, str], list] = {}  # 键 → [窗口起点, 已输出数, 已抑制数]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit <= 0:
+            return True
+        key: tuple[str, str] = (record.name, record.msg)
+        current: float = time.monotonic()
+        if (state := self._windows.get(key)) is None or current - state[0] >= self.window:
+            # 新窗口：汇报上个窗口被抑制的条数
+            if state and state[2]:
+                record.suppressed = state[2]
+            self._windows[key] = [current, 1, 0]
+            return True
+        if state[1] < self.limit:
+            state[1] += 1
+            return True
+        state[2] += 1
+        return False
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """不在调用线程中格式化的队列处理器
+    - 标准QueueHandler会在入队前格式化消息；这里保留「模板+参数」，交给后台线程处理
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class CategoryFormatter(logging.Formatter):
+    "在格式中提供分类名，并附上被限流抑制的条数"
+
+    def format(self, record: logging.LogRecord) -> str:
+        record.category = record.name.rsplit('.', 1)[-1]
+        message: str = super().format(record)
+        if suppressed := getattr(record, 'suppressed', 0):
+            message += f' (+{suppressed} similar messages suppressed)'
+        return message
+
+
+_listener: logging.handlers.QueueListener = None
+
+
+def setup_logging(
+    level: str = DEFAULT_LEVEL,
+    category_levels: dict[str, str] = None,
+    rate_limit: int = DEFAULT_RATE_LIMIT,
+    rate_window: float = DEFAULT_RATE_WINDOW,
+    stream=sys.stdout,
+    fmt: str = DEFAULT_FORMAT,
+) -> None:
+    """配置日志：所有分类经同一队列，由一个后台线程输出
+    - level：默认级别
+    - category_levels：各分类的级别（如 {'io': 'DEBUG'}）
+    """
+    global _listener
+    shutdown_logging()  # 允许重复配置
+    root: logging.Logger = logging.getLogger(ROOT_LOGGER_NAME)
+    root.setLevel(level.upper())
+    root.propagate = False
+    for category in CATEGORIES:
+        get_logger(category).setLevel(logging.NOTSET)  # 默认继承
+    for category, category_level in (category_levels or {}).items():
+        get_logger(category).setLevel(category_level.upper())
+    # 调用线程：限流后入队
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = LazyQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(rate_limit, rate_window))
+    root.handlers = [queue_handler]
+    # 后台线程：格式化并输出
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(CategoryFormatter(fmt, '%H:%M:%S'))
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    "停止后台线程（会先输出队列中剩余的日志）"
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
+
+
+def parse_category_levels(specs: list[str]) -> dict[str, str]:
+    "解析命令行中的「分类=级别」列表，如 ['io=DEBUG', 'ops=WARNING']"
+    result: dict[str, str] = {}
+    for spec in specs or []:
+        category, _, level = spec.partition('=')
+        if category not in CATEGORIES or not level:
+            raise ValueError(
+                f'Invalid log spec "{spec}", expected one of {CATEGORIES}=LEVEL')
+        result[category] = level
+    return result
+
+
+atexit.register(shutdown_logging)
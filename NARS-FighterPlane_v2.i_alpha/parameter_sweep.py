@@ -0,0 +1,169 @@
+"""参数扫描：在配置文件中定义参数网格，逐格运行无界面游戏，可中断、可续跑
+- 网格中的每一格（参数组合）都有一个由「实验名+参数+固定设置」计算出的稳定编号
+- 每完成一格，结果交给后台线程写入SQLite结果库（results_store）；重新启动时跳过该实验在库中已有的格子
+  （换一个实验名重跑同一网格时，各格都会重新运行）
+- 调度复用experiment_runner：进程池大小默认等于CPU核数
+用法：python parameter_sweep.py sweep_example.json [--processes 4] [--export]
+配置文件（JSON，示例见sweep_example.json）：
+- name：实验名（结果库中的experiment字段）；duration_s：每格的游戏内时长（秒）；paced：是否按帧率等待；brain_options：固定的NARS程序配置
+- reuse_brains：工作进程跨格保留，重置并复用已启动的NARS程序（不影响格子编号）
+- grid：参数网格（各列表的笛卡尔积），可用的维度：
+    nars_type、game_speed、inference_cycle_frequency、babble_times（初始babble次数）、
+    babble_probability（babble几率1/n）、enable_punish、sensors（启用的感知器名）、seed、num_agents（智能体数）
+"""
+
+import os
+import json
+import hashlib
+import argparse
+import itertools
+import traceback
+from contextlib import closing
+
+import pandas as pd
+
+from NARS_Program import NARSType, NARSProgram
+from experiment_runner import run_session, session_pool, SCRIPTED_TYPES, DEFAULT_OUTPUT_DIR
+from results_store import ResultStore, ResultWriter, DEFAULT_DB_PATH
+
+DEFAULT_SETTINGS: dict = {
+    'name': 'sweep',
+    'duration_s': 120,
+    'paced': True,
+    'brain_options': {},
+    'reuse_brains': False,
+    'log_level': 'WARNING',
+}
+"配置文件中未给出的固定设置"
+
+DEFAULT_GRID: dict[str, list] = {
+    'nars_type': ['scripted_ONA'],
+    'game_speed': [1.0],
+    'enable_punish': [False],
+    'seed': [0],
+}
+"配置文件中未给出的网格维度"
+
+FIXED_KEYS: tuple[str] = ('name', 'duration_s', 'paced', 'brain_options')
+"参与格子编号计算的固定设置（改变它们即视为新的格子）"
+
+
+def load_config(path: str) -> tuple[dict, dict[str, list]]:
+    "读取配置文件，返回（固定设置, 参数网格）"
+    with open(path, encoding='utf-8') as file:
+        config: dict = json.load(file)
+    grid: dict[str, list] = {**DEFAULT_GRID, **config.pop('grid', {})}
+    settings: dict = {**DEFAULT_SETTINGS, **config}
+    return settings, grid
+
+
+def expand_grid(grid: dict[str, list]) -> list[dict]:
+    "展开参数网格（笛卡尔积）"
+    keys: list[str] = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+def cell_id(cell: dict, settings: dict) -> str:
+    "格子的稳定编号：参数与固定设置（含实验名）的摘要"
+    key: dict = {
+        'cell': cell,
+        **{name: settings[name] for name in FIXED_KEYS},
+    }
+    return hashlib.sha1(
+        json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def session_config(key: str, cell: dict, settings: dict) -> dict:
+    "格子→单局配置（种子作用于敌机出场与babble；对替身NARS也作为其种子）"
+    brain_options: dict = dict(settings['brain_options'])
+    if cell['nars_type'] in SCRIPTED_TYPES:
+        brain_options.setdefault('seed', cell['seed'])
+    NARSProgram.check_options(NARSType.from_str(cell['nars_type']), brain_options)  # 在启动进程池之前报错
+    return {
+        **cell,
+        'run': key,
+        'duration_s': settings['duration_s'],
+        'paced': settings['paced'],
+        'brain_options': brain_options,
+        'reuse_brains': settings['reuse_brains'],
+        'log_level': settings['log_level'],
+    }
+
+
+def run_cell(config: dict) -> dict:
+    "（在子进程中）运行一格；出错时返回错误信息而不中断整个扫描（该格在下次启动时重试）"
+    try:
+        return run_session(config)
+    except Exception:
+        return {'config': config, 'error': traceback.format_exc()}
+
+
+def run_sweep(settings: dict, grid: dict[str, list], db_path: str, processes: int = None) -> int:
+    "运行网格中尚未完成的格子（返回本次运行的格数）"
+    cells: dict[str, dict] = {
+        cell_id(cell, settings): cell for cell in expand_grid(grid)}
+    store = ResultStore(db_path)
+    finished: set[str] = store.finished_cells(settings['name']) & cells.keys()
+    store.close()
+    pending: list[dict] = [
+        session_config(key, cell, settings)
+        for key, cell in cells.items() if key not in finished
+    ]
+    print(f'{len(cells)} cells in grid, {len(finished)} finished, {len(pending)} to run.')
+    if not pending:
+        return 0
+    processes = min(processes or os.cpu_count(), len(pending))
+    writer = ResultWriter(db_path)
+    with closing(writer), session_pool(processes, pending) as pool:
+        for i, result in enumerate(pool.imap_unordered(run_cell, pending), 1):
+            if error := result.get('error'):
+                print(f'[{i}/{len(pending)}] cell {result["config"]["run"]} failed:\n{error}')
+                continue
+            summary: dict = result['summary']
+            key: str = summary['run']
+            writer.submit(result['config'], summary, result['telemetry'],
+                          experiment=settings['name'], cell_id=key,
+                          started_at=summary['started_at'])
+            print(
+                f'[{i}/{len(pending)}] cell {key}: performance={summary["performance"]:.3f} '
+                f'in {summary["wall_time"]:.1f}s')
+        pool.close()
+        pool.join()  # 让工作进程正常退出（终止程序池中的程序）
+    return len(pending)
+
+
+def export_summary(db_path: str, experiment: str, path: str) -> pd.DataFrame:
+    "把所有已完成格子的「配置+摘要」导出为表格"
+    store = ResultStore(db_path)
+    summary: pd.DataFrame = store.runs(experiment=experiment)
+    store.close()
+    summary.to_csv(path, index=False)
+    print(f'Sweep summary of {len(summary)} cells is exported to {path}.')
+    return summary
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Run a resumable parameter sweep of headless NARS-FighterPlane sessions')
+    parser.add_argument('config', help='sweep config file (JSON)')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='size of the process pool (default: number of cores)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR,
+                        help=f'directory of the results (default {DEFAULT_OUTPUT_DIR})')
+    parser.add_argument('--db', default=None,
+                        help=f'SQLite results database (default OUTPUT/{DEFAULT_DB_PATH})')
+    parser.add_argument('--export', action='store_true',
+                        help='only export the summary of finished cells')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args: argparse.Namespace = parse_args()
+    settings, grid = load_config(args.config)
+    output_dir: str = os.path.abspath(args.output)
+    os.makedirs(output_dir, exist_ok=True)
+    db_path: str = args.db or os.path.join(output_dir, DEFAULT_DB_PATH)
+    if not args.export:
+        run_sweep(settings, grid, db_path, args.processes)
+    export_summary(db_path, settings['name'], os.path.join(
+        output_dir, f'{settings["name"]}.summary.csv'))
@@ -0,0 +1,136 @@
+"""Gym风格的环境：用reset()/step(n_ticks)驱动PlaneGame，而不是start_game的无限循环
+- 不渲染、不按帧率等待：每步推进n_ticks个固定步长的模拟帧（1帧=游戏内1/60秒）
+- 策略：NARS智能体（NARSPlanePlayer或其子类，可自带大脑）按游戏的定时事件感知与推理，其操作在每帧被执行
+  - 也可在step时给出一个操作，作为「无意识操作」强制执行（如键盘操作，同时告知NARS）
+- step返回（观察, 得分变化, 回合是否结束, 信息）；观察为主战机的当前感知与状态
+用法：
+    env = PlaneEnv(NARSType.SCRIPTED_ONA, duration_s=60, seed=0)
+    observation = env.reset()
+    while True:
+        observation, reward, done, info = env.step(6)
+        if done: break
+    env.close()
+    python plane_env.py --backend scripted_ONA [--ticks-per-step 1] [--steps 100000] [--agents 2]  # 测量每秒步数
+"""
+
+import os
+import time
+import argparse
+
+from NARS import NARSAgent, NARSOperation
+from NARS_Program import NARSType
+from plane_game import PlaneGame, NARSPlanePlayer
+
+TICKS_PER_RECORD: int = 60
+"默认每隔多少帧记录一行游戏数据（60帧=游戏内一秒；每帧记录会明显拖慢步进）"
+
+
+class PlaneEnv:
+    """Gym风格的PlaneGame环境（无界面、不等待）
+    - policy：控制战机的智能体（或智能体列表，每个控制一架战机）；为空时按nars_type创建
+    - duration_s：每回合的游戏内时长（秒），到达后done为真；为空则不结束
+    """
+
+    def __init__(self, nars_type: NARSType = NARSType.SCRIPTED_ONA, policy=None,
+                 duration_s: int = None, seed: int = None, brain_options: dict = None,
+                 game_speed: float = 1.0, enable_punish: bool = False, num_agents: int = 1,
+                 record_interval: int = TICKS_PER_RECORD) -> None:
+        players: list = [policy] if isinstance(policy, NARSAgent) else policy
+        self.game: PlaneGame = PlaneGame(
+            nars_type=nars_type,
+            game_speed=game_speed,
+            enable_punish=enable_punish,
+            headless=True,
+            brain_options=brain_options,
+            seed=seed,
+            num_agents=num_agents,
+            players=players,
+        )
+        self.game.paced = False
+        self.game.data_record_interval = record_interval
+        self.duration_s: int = duration_s
+        self.last_episode: dict = None
+        "上一回合的摘要（见reset）"
+        self.game.start_time = self.game.current_time
+
+    @property
+    def done(self) -> bool:
+        return self.duration_s is not None and self.game.speeding_delta_time_s >= self.duration_s
+
+    @property
+    def info(self) -> dict:
+        return {
+            'episode': self.game.episode,
+            'ticks': self.game.num_ticks,
+            'ingame_time': self.game.speeding_delta_time_s,
+            'scores': list(self.game.scores),
+        }
+
+    def observe(self, agent: int = 0) -> dict:
+        "第agent架战机的观察：智能体的当前感知（不送入大脑）、战机状态与得分"
+        hero = self.game.heroes[agent]
+        return {
+            'perceptions': self.game.players[agent].perceive(
+                hero=hero, enemy_group=self.game.enemy_group,
+                enemy_rects=[enemy.rect for enemy in self.game.enemy_group.sprites()]),
+            'hero': {'x': hero.rect.centerx, 'speed': hero.speed, 'edge': hero.isAtEdge},
+            'score': self.game.scores[agent],
+        }
+
+    def reset(self, reset_brain: bool = False, seed: int = None) -> dict:
+        "开始新的回合（见PlaneGame.reset_episode），返回初始观察；上一回合的摘要在last_episode中"
+        self.last_episode = self.game.reset_episode(reset_brain, seed)
+        return self.observe()
+
+    def step(self, n_ticks: int = 1, operation: NARSOperation = None) -> tuple[dict, int, bool, dict]:
+        "推进n_ticks帧（operation：先让主智能体强制执行的操作），返回（观察, 总得分变化, 回合是否结束, 信息）"
+        game = self.game
+        if operation is not None:
+            game.nars.force_unconscious_operation(operation)
+        score: int = game.score
+        for _ in range(n_ticks):
+            game.tick()
+        return self.observe(), game.score - score, self.done, self.info
+
+    def close(self) -> None:
+        self.game.close()
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Measure the step rate of the headless FighterPlane environment')
+    parser.add_argument('--backend', default='scripted_ONA')
+    parser.add_argument('--steps', type=int, default=100000)
+    parser.add_argument('--ticks-per-step', type=int, default=1)
+    parser.add_argument('--duration', type=int, default=60,
+                        help='in-game duration of each episode in seconds')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--agents', type=int, default=1,
+                        help='heroes in the world; more than one passes a list policy of NARSPlanePlayer')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args: argparse.Namespace = parse_args()
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))  # 图片以游戏目录为相对路径
+    nars_type: NARSType = NARSType.from_str(args.backend)
+    brain_options: dict = {'seed': args.seed} if args.backend.startswith('scripted') else {}
+    policy: list[NARSPlanePlayer] = [
+        NARSPlanePlayer(nars_type, {**brain_options, 'seed': args.seed + i} if brain_options else None)
+        for i in range(args.agents)
+    ] if args.agents > 1 else None
+    env = PlaneEnv(nars_type, policy=policy, duration_s=args.duration, seed=args.seed,
+                   brain_options=brain_options)
+    # 构造后即可步进（不先reset）：多智能体时每个智能体的得分都已就绪
+    assert len(env.info['scores']) == args.agents, env.info['scores']
+    total_reward: int = 0
+    start: float = time.perf_counter()
+    for _ in range(args.steps):
+        observation, reward, done, info = env.step(args.ticks_per_step)
+        total_reward += reward
+        if done:
+            env.reset(seed=args.seed + info['episode'] + 1)
+    elapsed: float = time.perf_counter() - start
+    env.close()
+    print(f'{args.steps} steps ({args.steps * args.ticks_per_step} ticks) in {elapsed:.2f}s: '
+          f'{args.steps / elapsed:.0f} steps/s, {env.game.episode} episodes, total reward {total_reward}.')
@@ -1,15 +1,50 @@
 #!/usr/bin/python3
 # *-* encoding:utf8 *_*
 
+import os
 import sys
+import time
+import argparse
 from game_sprites import *
 from NARS import NARSAgent, NARSOperation, NARSType, NARSPerception, NARSSensor
-
-# 注册游戏事件
-CREATE_ENEMY_EVENT = pygame.USEREVENT
-UPDATE_NARS_EVENT = pygame.USEREVENT + 1
-OPENNARS_BABBLE_EVENT = pygame.USEREVENT + 2
-INGAME_CLOCK_EVENT = pygame.USEREVENT + 3  # 游戏内时间计数（速度可调之后）
+from game_metrics import RollingMetrics
+from game_scheduler import GameScheduler
+from game_random import GameRandom, SpawnSchedule, enemy_max_x
+from NARS_Latency import LatencyTracker, merge_trackers, STAGES, STAGE_ROUND_TRIP
+from instruments import INSTRUMENTS
+from tracing import Tracer, DEFAULT_BUFFER_SIZE as DEFAULT_TRACE_BUFFER_SIZE
+from profiling import GameProfiler
+from game_hud import PerformanceOverlay
+from results_store import ResultWriter
+from logger import LOG_OPS, LOG_GAME, LOG_BABBLE, DEFAULT_LEVEL as DEFAULT_LOG_LEVEL, \
+    CATEGORIES as LOG_CATEGORIES, setup_logging, shutdown_logging, parse_category_levels
+
+# 注册游戏事件（由内部调度器按模拟时间派发，不再经过SDL事件队列）
+CREATE_ENEMY_EVENT = 'create_enemy'
+UPDATE_NARS_EVENT = 'update_nars'
+OPENNARS_BABBLE_EVENT = 'babble'
+INGAME_CLOCK_EVENT = 'ingame_clock'  # 游戏内时间计数（速度可调之后）
+INSTRUMENTS_SUMMARY_EVENT = 'instruments_summary'  # 周期性汇总热点计时
+
+DEFAULT_TRACE_PATH: str = 'game_trace.json'
+"时间线追踪的默认导出路径"
+
+DEFAULT_PROFILE_DIR: str = 'profiles'
+"性能分析报告的默认目录"
+DEFAULT_PROFILE_TICKS: int = 600
+"按Shift+R时分析的帧数"
+
+SIMULATION_STEP_MS: float = 1000 / 60
+"每帧推进的模拟时间（游戏内毫秒）：图形逐帧运动，帧率随游戏速度同步缩放"
+
+# 定时事件的周期（游戏内毫秒）
+INGAME_CLOCK_PERIOD_MS: int = 1000  # 「游戏内读秒」时钟
+CREATE_ENEMY_PERIOD_MS: int = 1000
+UPDATE_NARS_PERIOD_MS: int = 200
+BABBLE_PERIOD_MS: int = 250
+
+CRASH_RADIUS_RATIO: float = 0.7
+"战机与敌机相撞的判定：两者外接圆半径按此比例缩小后相交"
 
 # 尝试进行数据分析
 ENABLE_GAME_DATA_RECORD: bool = False
@@ -17,10 +52,21 @@ try:
     import matplotlib.pyplot as plt
     import pandas as pd
     import multiprocessing as mp
+    from game_datas import GameDataSummary, DEFAULT_MAX_POINTS
     ENABLE_GAME_DATA_RECORD = True
 except:
     pass
 
+GAME_DATA_COLUMNS: list[str] = [
+    'ingame_time',
+    'performance',
+    'sense rate',
+    'activation rate',
+    *RollingMetrics().snapshot(),
+    *LatencyTracker('').snapshot((STAGE_ROUND_TRIP,)),
+]
+"游戏数据表的各列"
+
 
 class NARSPlanePlayer(NARSAgent):
     """对接游戏：具体的「战机玩家」
@@ -66,6 +112,11 @@ class NARSPlanePlayer(NARSAgent):
 
     ADJECTIVE_NEARBY: str = 'nearby'  # 感知敌机垂直位置
 
+    # 感知器名
+    SENSOR_EDGE: str = 'edge'
+    SENSOR_MOVING: str = 'moving'
+    SENSOR_ENEMY: str = 'enemy'
+
     # 根据词项生成（静态）感知
     SNESE_ENEMY_LEFT: NARSPerception = NARSPerception(
         OBJECT_ENEMY, ADJECTIVE_LEFT)
@@ -89,22 +140,37 @@ class NARSPlanePlayer(NARSAgent):
         ADJECTIVE_MOVING_RIGHT)
     SNESE_STILL: NARSPerception = NARSPerception.new_self(ADJECTIVE_STILL)
 
-    def __init__(self, nars_type: NARSType = None):
+    def __init__(self, nars_type: NARSType = None, brain_options: dict = None, brain_pool=None, io_hub=None):
         super().__init__(
             nars_type=nars_type,
             mainGoal=NARSPlanePlayer.GOAL_GOOD,
-            mainGoal_negative=NARSPlanePlayer.GOAL_BAD
+            mainGoal_negative=NARSPlanePlayer.GOAL_BAD,
+            brain_options=brain_options,
+            brain_pool=brain_pool,
+            io_hub=io_hub
         )  # 目标：「good」
-        # 添加感知器
-        self.add_sensor(NARSSensor(NARSPlanePlayer.sensor_edge))  # 边界感知
-        self.add_sensor(NARSSensor(NARSPlanePlayer.sensor_moving))  # 移动感知
-        self.add_sensor(NARSSensor(NARSPlanePlayer.sensor_enemy))  # 对敌感知
+        # 添加感知器（按名称索引，以便单独开关）
+        self.named_sensors: dict[str, NARSSensor] = {
+            NARSPlanePlayer.SENSOR_EDGE: NARSSensor(NARSPlanePlayer.sensor_edge),  # 边界感知
+            NARSPlanePlayer.SENSOR_MOVING: NARSSensor(NARSPlanePlayer.sensor_moving),  # 移动感知
+            NARSPlanePlayer.SENSOR_ENEMY: NARSSensor(NARSPlanePlayer.sensor_enemy),  # 对敌感知
+        }
+        for sensor in self.named_sensors.values():
+            self.add_sensor(sensor)
+
+    def set_enabled_sensors(self, names: list[str]) -> None:
+        "只启用给定名称的感知器（其余关闭）"
+        if unknown := set(names) - self.named_sensors.keys():
+            raise ValueError(f'Unknown sensors: {unknown}')
+        for name, sensor in self.named_sensors.items():
+            sensor.enabled = name in names
 
     def handle_program_operation(self, operation: NARSOperation):
         "操作名的「别名分发」"
 
-        # 打印操作以跟踪
-        print(operation.value)
+        # 记录操作以跟踪
+        LOG_OPS.debug('%s', operation)
+        read_time: float = operation.read_time  # 别名替换后保留读取时间
 
         # fire = strike
         if operation.name in ['fire', 'up']:  # 更多是用于ONA
@@ -113,7 +179,7 @@ class NARSPlanePlayer(NARSAgent):
             operation = NARSPlanePlayer.OPERATION_DEACTIVATE
 
         # 添加操作
-        super().handle_program_operation(operation)
+        super().handle_program_operation(operation, read_time)
 
     def store_operation(self, operation: NARSOperation):
         "重构：处理「冲突的移动方式」"
@@ -122,16 +188,16 @@ class NARSPlanePlayer(NARSAgent):
         # 代码功能分离：把剩下的代码看做是某种「冲突」
         # NARS gives <(*,{SELF}) --> ^left>. :|:
         if operation == NARSPlanePlayer.OPERATION_LEFT:
-            self[NARSPlanePlayer.OPERATION_RIGHT] = False
+            self.cancel_operation(NARSPlanePlayer.OPERATION_RIGHT)
             # print('move left')
         # NARS gives <(*,{SELF}) --> ^right>. :|:
         elif operation == NARSPlanePlayer.OPERATION_RIGHT:
-            self[NARSPlanePlayer.OPERATION_LEFT] = False
+            self.cancel_operation(NARSPlanePlayer.OPERATION_LEFT)
             # print('move right')
         # NARS gives <(*,{SELF}) --> ^deactivate>. :|:
         elif operation == NARSPlanePlayer.OPERATION_DEACTIVATE:
-            self[NARSPlanePlayer.OPERATION_LEFT] = False
-            self[NARSPlanePlayer.OPERATION_RIGHT] = False
+            self.cancel_operation(NARSPlanePlayer.OPERATION_LEFT)
+            self.cancel_operation(NARSPlanePlayer.OPERATION_RIGHT)
             # print('stay still')
         # NARS gives <(*,{SELF}) --> ^strike>. :|:
         elif operation == NARSPlanePlayer.OPERATION_FIRE:
@@ -177,15 +243,20 @@ class NARSPlanePlayer(NARSAgent):
 
     @staticmethod
     def sensor_enemy(*sense_args: tuple, **sense_targets: dict) -> list[NARSPerception]:
-        "对敌感知（从感知器调用）"
+        "对敌感知（从感知器调用；可传入共享的敌机位置快照enemy_rects，避免每个智能体各自遍历精灵）"
         result: list[NARSPerception] = []
 
         if (
             not (hero := sense_targets.get('hero'))
-            or (enemy_group := sense_targets.get('enemy_group')) == None
+            or (
+                (enemy_rects := sense_targets.get('enemy_rects')) is None
+                and (enemy_group := sense_targets.get('enemy_group')) == None
+            )
         ):
             print('No required target!')
             return result
+        if enemy_rects is None:
+            enemy_rects = [enemy.rect for enemy in enemy_group.sprites()]
 
         # 敌机（总）方位
 
@@ -195,19 +266,19 @@ class NARSPlanePlayer(NARSAgent):
         enemy_ahead = False
         enemy_nearby = False
 
-        for enemy in enemy_group.sprites():
+        for enemy_rect in enemy_rects:
             # 敌机左右位置感知
-            if enemy.rect.right < hero.rect.centerx:
+            if enemy_rect.right < hero.rect.centerx:
                 # result.append(NARSPlanePlayer.SNESE_ENEMY_LEFT)
                 enemy_left = True
-            elif hero.rect.centerx < enemy.rect.left:
+            elif hero.rect.centerx < enemy_rect.left:
                 # result.append(NARSPlanePlayer.SNESE_ENEMY_RIGHT)
                 enemy_right = True
             else:  # enemy.rect.left <= hero.rect.centerx and hero.rect.centerx <= enemy.rect.right
                 # result.append(NARSPlanePlayer.SNESE_ENEMY_AHEAD)
                 enemy_ahead = True
             # 🆕敌机前后位置感知：是否「在旁边」
-            if enemy.rect.bottom < hero.rect.top:  # 检查是否可能与hero有接触
+            if enemy_rect.bottom < hero.rect.top:  # 检查是否可能与hero有接触
                 # result.append(NARSPlanePlayer.SNESE_ENEMY_NEARBY)
                 enemy_nearby = True
 
@@ -222,19 +293,33 @@ class NARSPlanePlayer(NARSAgent):
 
         return result
 
-    def handle_operations(self, hero: Hero):
-        "分模块：处理NARS发送的操作（返回：是否有操作被执行）"
+    MOVE_SPEED: int = 4
+    "战机左右移动的速度（像素/帧）"
+
+    def next_motion(self) -> tuple[int, bool]:
+        "根据NARS发送的操作，决定战机这一帧的（速度, 是否射击）"
         # 左右移动：有操作就不撤回（留给先前的「操作冲突」模块）
         if self[NARSPlanePlayer.OPERATION_LEFT]:
-            hero.speed = -4
+            speed: int = -NARSPlanePlayer.MOVE_SPEED
+            self.mark_operation_applied(NARSPlanePlayer.OPERATION_LEFT)
         elif self[NARSPlanePlayer.OPERATION_RIGHT]:
-            hero.speed = 4
+            speed = NARSPlanePlayer.MOVE_SPEED
+            self.mark_operation_applied(NARSPlanePlayer.OPERATION_RIGHT)
         else:
-            hero.speed = 0
+            speed = 0
+            self.mark_operation_applied(NARSPlanePlayer.OPERATION_DEACTIVATE)
         # 射击：操作后自动重置状态
-        if self[NARSPlanePlayer.OPERATION_FIRE]:
-            hero.fire()
+        fire: bool = bool(self[NARSPlanePlayer.OPERATION_FIRE])
+        if fire:
             self[NARSPlanePlayer.OPERATION_FIRE] = False
+            self.mark_operation_applied(NARSPlanePlayer.OPERATION_FIRE)
+        return speed, fire
+
+    def handle_operations(self, hero: Hero):
+        "分模块：处理NARS发送的操作"
+        hero.speed, fire = self.next_motion()
+        if fire:
+            hero.fire()
 
     def praise(self):
         "对接游戏：奖励自己"
@@ -258,28 +343,83 @@ class PlaneGame:
         if value <= 0:  # 防止速度下降到非正数
             return
         self._game_speed: float = value
-        self.fps: int = int(60 * self._game_speed)
-        print(f'game speed = {self.game_speed:.2f}')
-        self.__set_timer()  # 覆盖之前的定时器
-
-    def __init__(self, nars_type: NARSType, game_speed: float = 1.0, enable_punish: bool = False):
-        "初始化游戏本体"
+        self.fps: int = max(1, int(60 * self._game_speed))  # 极低速时至少每秒一帧（避免帧率为0）
+        LOG_GAME.info('game speed = %.2f', self._game_speed)
+        # 定时器以模拟时间计，速度变化只影响帧率，无需重置定时器
+
+    def __init__(self, nars_type: NARSType, game_speed: float = 1.0, enable_punish: bool = False,
+                 metrics_window_s: int = RollingMetrics.DEFAULT_WINDOW_S,
+                 headless: bool = False, brain_options: dict = None,
+                 seed: int = None, spawn_schedule: str = None, num_agents: int = 1,
+                 brain_pool=None, players: list[NARSPlanePlayer] = None, io_hub=None):
+        """初始化游戏本体
+        - headless：无界面模式（不渲染、不显示窗口），用于批量实验
+        - brain_options：传递给NARS程序的配置
+        - seed：本局的随机数种子（敌机出场、babble；为空则随机选取并记录）
+        - spawn_schedule：预生成的敌机出场表文件（用完后继续由种子生成）
+        - num_agents：同一世界中的战机数，每架由各自的NARS智能体（与NARS程序）控制
+        - brain_pool：NARS程序池（见NARS_Pool）：从中租用已启动的程序，结束时重置并归还
+        - players：预先构造的智能体（如自定义子类），每个控制一架战机；给出时忽略nars_type等大脑配置
+        - io_hub：共享的I/O线程（见NARS_IOHub）：所有智能体的程序由一个线程收发，而不是每个程序两个线程
+        """
         print("Game initialization...")
+        self.headless: bool = headless
+        if headless:  # 须在pygame初始化之前设置
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
         pygame.init()
-        self.nars_type = nars_type
+        self.nars_type = players[0].type if players else nars_type
+        self.brain_options: dict = brain_options or {}
+        self.num_agents: int = len(players) if players else num_agents
+        self.brain_pool = brain_pool
+        self.io_hub = io_hub
         # create a display surface, SCREEN_RECT.size=(480,700)
         self.screen = pygame.display.set_mode(SCREEN_RECT.size)
         self.clock = pygame.time.Clock()  # create a game clock
         # display text like scores, times, etc.
         self.font = pygame.font.SysFont('consolas', 18, True)
+        # 性能HUD页（默认关闭）
+        self.performance_overlay: PerformanceOverlay = PerformanceOverlay(
+            pygame.font.SysFont('consolas', 16, True))
+        self.show_performance_overlay: bool = False
+        # 每局独立的随机数流：同一种子下，敌机出场与babble可以复现
+        self.random: GameRandom = GameRandom(seed)
+        self.seed: int = self.random.seed
+        self.spawns: SpawnSchedule = (
+            SpawnSchedule.load(spawn_schedule, self.random.world, enemy_max_x())
+            if spawn_schedule
+            else SpawnSchedule(self.random.world, enemy_max_x())
+        )
         self.__create_sprites()  # sprites initialization
-        self.__create_NARS(self.nars_type)
-        # 原「__set_timer」被移动到setter内，以便统一修改
+        self.__create_NARS(self.nars_type, self.brain_options, players)
+        for player in self.players:  # 共用一条babble随机数流（按智能体顺序取用，仍可复现）
+            player.rng = self.random.babble
+        # 内部事件调度器：替代SDL定时器
+        self.scheduler: GameScheduler = GameScheduler()
+        self.__set_timer()
         # don't set too large, self.game_speed = 1.0 is the default speed.
         self.game_speed = game_speed
         self.auto_speed_delta: float = 0  # 🆕自动加速的加速步进大小
-        self.score: int = 0  # hit enemy
+        self.scores: list[int] = [0] * self.num_agents  # hit enemy（每个智能体各自计分）
         self.speeding_delta_time_s: int = 0  # 现在因「游戏速度」可动态调整，*游戏内*时间需要一个专门的时钟进行评估
+        self.num_ticks: int = 0  # 模拟帧数
+        self.num_rendered_frames: int = 0  # 渲染帧数
+        # 是否按帧率等待（关闭后以最快速度推进模拟，仅用于无界面模式）
+        self.paced: bool = True
+        # 迟滞统计（仅按帧率等待时）：落后于现实时间目标超过一帧的帧数，以及这些帧中执行的定时事件数
+        self.tick_overruns: int = 0
+        self.timer_overruns: int = 0
+        self._pace_deadline_ms: float = None  # 下一帧应开始的现实时间（毫秒）
+        self._timer_runs: int = 0  # 本帧执行的定时事件数
+        # 滚动表现指标：按游戏内时间增量维护，反映「最近」的表现
+        self.metrics: RollingMetrics = RollingMetrics(metrics_window_s)
+        # 最近一次的热点计时摘要（周期性更新）
+        self.last_instrument_summary: dict[str, dict[str, float]] = {}
+        # 时间线追踪：导出路径与缓冲区大小
+        self.trace_path: str = DEFAULT_TRACE_PATH
+        self.trace_buffer_size: int = DEFAULT_TRACE_BUFFER_SIZE
+        # 性能分析：当前会话与报告目录
+        self.profiler: GameProfiler = None
+        self.profile_dir: str = DEFAULT_PROFILE_DIR
 
         # enable to customize whether game punish NARS
         self.enable_punish: bool = enable_punish
@@ -287,55 +427,119 @@ class PlaneGame:
         self.num_nars_operate: int = 0
 
         # speed melt down mechanism to prevent game stuck
-        self.last_display_update_time: int = 0
         self.speed_melt_down: float = 0  # 游戏卡死时暂存的当前速度
         self.num_melt_down_before_restore: int = 0  # 游戏速度在恢复前熔断的次数
 
-        # 把数据存在游戏里
-        if ENABLE_GAME_DATA_RECORD:
-            self.gameDatas: pd.DataFrame = pd.DataFrame(
-                [],
-                columns=[
-                    'ingame_time',
-                    'performance',
-                    'sense rate',
-                    'activation rate',
-                ]
-            )
+        # 把数据存在游戏里：逐行追加到列表中，需要时再统一转换为表格（避免每帧复制整张表）
+        self._game_data_rows: list[dict] = []
+        self.data_record_interval: int = 1  # 每隔多少帧记录一次
+        # 结果库：游戏结束时写入本局的配置、摘要与数据（为空则不写入）
+        self.results_db: str = None
+        self.started_at: float = time.time()
+        # 回合：当前回合序号与已结束各回合的摘要（见reset_episode）
+        self.episode: int = 0
+        self.episode_summaries: list[dict] = []
+
+    @property
+    def score(self) -> int:
+        "总得分（各智能体之和）"
+        return sum(self.scores)
+
+    @property
+    def agent_score_columns(self) -> list[str]:
+        "多智能体时，游戏数据中各智能体得分的列名"
+        return [f'score {i}' for i in range(self.num_agents)] if self.num_agents > 1 else []
+
+    @property
+    def gameDatas(self) -> 'pd.DataFrame':
+        "获取游戏数据表（按需构建）"
+        return pd.DataFrame(self._game_data_rows, columns=GAME_DATA_COLUMNS + self.agent_score_columns)
+
+    @property
+    def game_data_rows(self) -> list[dict]:
+        "获取游戏数据（逐行字典，不依赖pandas）"
+        return list(self._game_data_rows)
+
+    def run_config(self) -> dict:
+        "本局的配置（后端、速度、感知器等）"
+        return {
+            'backend': self.nars_type.value,
+            'game_speed': self.game_speed,
+            'seed': self.seed,
+            'enable_punish': self.enable_punish,
+            'inference_cycle_frequency': self.nars.brain.inference_cycle_frequency if self.nars.brain else None,
+            'babble_probability': self.babble_probability,
+            'sensors': [name for name, sensor in self.nars.named_sensors.items() if sensor.enabled],
+            'brain_options': self.brain_options,
+            'num_agents': self.num_agents,
+        }
+
+    def run_summary(self) -> dict:
+        "本局的摘要（表现、吞吐量与延迟）"
+        return {
+            'ingame_time': self.speeding_delta_time_s,
+            'ticks': self.num_ticks,
+            'score': self.score,
+            'performance': self.performance,
+            'senses': self.total_senses,
+            'operations': self.total_operates,
+            'tick overruns': self.tick_overruns,
+            'timer overruns': self.timer_overruns,
+            **self.latency().snapshot((STAGE_ROUND_TRIP,)),
+            **({'scores': list(self.scores)} if self.num_agents > 1 else {}),
+        }
+
+    def latency(self, stages: tuple[str] = None) -> LatencyTracker:
+        "整局的延迟统计：单智能体时即其大脑的统计，多智能体时合并各大脑的统计（stages：只合并这些阶段）"
+        if self.num_agents == 1:
+            return self.nars.latency
+        return merge_trackers(
+            (player.latency for player in self.players if player.brain),
+            self.nars.latency.backend, stages or STAGES)
+
+    def save_run(self, path: str) -> None:
+        "把本局写入结果库（在后台线程中写入，并等待完成）"
+        writer = ResultWriter(path)
+        writer.submit(self.run_config(), self.run_summary(),
+                      self.game_data_rows, started_at=self.started_at)
+        writer.close()
+        print(f'Game run is saved to {path}.')
 
     def collectDatas(self) -> None:
         "（同步）获取游戏运行的各项数据"
-        self.gameDatas.loc[len(self.gameDatas)] = {
+        self._game_data_rows.append({
             'ingame_time': self.speeding_delta_time_s,  # 游戏内时间
             'performance': self.performance,  # 表现
             'sense rate': (  # 每（游戏内）秒送入NARS程序的感知语句数
-                self.nars.total_senses / self.speeding_delta_time_s
+                self.total_senses / self.speeding_delta_time_s
                 if self.speeding_delta_time_s  # 避免除以零
                 else 0
             ),
             'activation rate': (  # 每（游戏内）秒从NARS程序中送上的操作数
-                self.nars.total_operates / self.speeding_delta_time_s
+                self.total_operates / self.speeding_delta_time_s
                 if self.speeding_delta_time_s  # 避免除以零
                 else 0
             ),
-        }
+            **self.metrics.snapshot(),  # 滚动指标（增量维护，无需回溯历史）
+            **self.latency((STAGE_ROUND_TRIP,)).snapshot((STAGE_ROUND_TRIP,)),  # 往返延迟分位数（所有智能体）
+            **dict(zip(self.agent_score_columns, self.scores)),
+        })
 
     def __set_timer(self):
-        "设置定时器（用于后面的时序事件）"
-        INGAME_CLOCK_EVENT_TIMER = 1000  # 设置「游戏内读秒」时钟
-        CREATE_ENEMY_EVENT_TIMER = 1000
-        UPDATE_NARS_EVENT_TIMER = 200
-        OPENNARS_BABBLE_EVENT_TIMER = 250
-        timer_ingame_clock = int(INGAME_CLOCK_EVENT_TIMER / self.game_speed)
-        timer_enemy = int(CREATE_ENEMY_EVENT_TIMER / self.game_speed)
-        timer_update_NARS = int(UPDATE_NARS_EVENT_TIMER / self.game_speed)
-        timer_babble = int(OPENNARS_BABBLE_EVENT_TIMER / self.game_speed)
-        pygame.time.set_timer(INGAME_CLOCK_EVENT, timer_ingame_clock)
+        "设置定时器（用于后面的时序事件，周期以游戏内毫秒计）"
+        INSTRUMENTS_SUMMARY_EVENT_TIMER = 10000
+        self.scheduler.schedule(
+            INGAME_CLOCK_EVENT, INGAME_CLOCK_PERIOD_MS, self.__on_ingame_clock)
         # the frequency of creating an enemy
-        pygame.time.set_timer(CREATE_ENEMY_EVENT, timer_enemy)
+        self.scheduler.schedule(
+            CREATE_ENEMY_EVENT, CREATE_ENEMY_PERIOD_MS, self.__on_create_enemy)
         # the activity of NARS
-        pygame.time.set_timer(UPDATE_NARS_EVENT, timer_update_NARS)
-        pygame.time.set_timer(OPENNARS_BABBLE_EVENT, timer_babble)
+        self.scheduler.schedule(
+            UPDATE_NARS_EVENT, UPDATE_NARS_PERIOD_MS, self.__on_update_nars)
+        self.scheduler.schedule(
+            OPENNARS_BABBLE_EVENT, BABBLE_PERIOD_MS, self.__on_babble)
+        self.scheduler.schedule(
+            INSTRUMENTS_SUMMARY_EVENT, INSTRUMENTS_SUMMARY_EVENT_TIMER, self.__on_instruments_summary)
 
     def __create_sprites(self):
         "创造图形界面"
@@ -343,101 +547,152 @@ class PlaneGame:
         bg2 = Background(True)
         self.background_group = pygame.sprite.Group(bg1, bg2)
         self.enemy_group = pygame.sprite.Group()
-        self.hero = Hero()
-        self.hero_group = pygame.sprite.Group(self.hero)
+        self.heroes: list[Hero] = [Hero() for _ in range(self.num_agents)]
+        self.__place_heroes()
+        self.hero = self.heroes[0]  # 主战机：键盘控制与HUD以它为准
+        self.hero_group = pygame.sprite.Group(*self.heroes)
+
+    def __place_heroes(self):
+        "把战机放回初始位置：沿横向均匀排开（单个时居中）"
+        for i, hero in enumerate(self.heroes):
+            hero.rect.centerx = SCREEN_RECT.width * (i + 1) // (self.num_agents + 1)
+            hero.rect.bottom = SCREEN_RECT.bottom
+            hero.speed = 0
 
-    def __create_NARS(self, type: NARSType):
-        "创造NARS（接口）"
-        self.nars: NARSPlanePlayer = NARSPlanePlayer(type)
+    def __create_NARS(self, type: NARSType, brain_options: dict = None, players: list[NARSPlanePlayer] = None):
+        "创造NARS（接口）：每架战机一个智能体；给出种子时，第i个智能体的种子为「种子+i」"
+        brain_options = brain_options or {}
+        self.players: list[NARSPlanePlayer] = list(players) if players else [
+            NARSPlanePlayer(type, (
+                {**brain_options, 'seed': brain_options['seed'] + i}
+                if 'seed' in brain_options and i else brain_options),
+                self.brain_pool, self.io_hub)
+            for i in range(self.num_agents)
+        ]
+        self.nars: NARSPlanePlayer = self.players[0]  # 主智能体：键盘操作与HUD以它为准
         # 既然在这里就凭借「NARS的程序实现」类型区分「是否babble」，那也不妨把babble看做一个「通用行为」
         self.remaining_babble_times: int = (
             200 if self.nars.need_babble
             else 0
         )
+        self.babble_probability: int = 2  # 每次babble事件以1/n的几率执行
 
     def start_game(self):
         "开启游戏"
         print("Game start...")
         self.start_time = pygame.time.get_ticks()
         while True:
-            self.__event_handler()
-            self.__check_collide()
-            self.__update_sprites()
-            pygame.display.update()
-            self.clock.tick(self.fps)
+            self.tick()
 
+    def run(self, duration_s: int) -> None:
+        "（无交互）运行一段固定的游戏内时长（秒）"
+        self.start_time = pygame.time.get_ticks()
+        while self.speeding_delta_time_s < duration_s:
+            self.tick()
+
+    def reset_episode(self, reset_brain: bool = False, seed: int = None) -> dict:
+        """开始新的回合（不重启pygame与NARS程序），返回刚结束的回合的摘要（尚未推进过则为空）
+        - 重置：敌机与子弹、战机位置、得分、游戏内时钟与定时事件、滚动指标窗口、游戏数据与延迟统计
+        - 保留：游戏速度、babble余量、感知器与推理频率等设置
+        - reset_brain：同时清空NARS程序的记忆（否则保留已学到的知识）
+        - seed：用新种子重新生成敌机出场与babble的随机数流（为空则沿用当前的流）
+        """
+        summary: dict = None
+        if self.num_ticks:
+            summary = {'episode': self.episode, 'seed': self.seed, **self.run_summary()}
+            self.episode_summaries.append(summary)
+            self.episode += 1
+        if seed is not None:
+            self.random = GameRandom(seed)
+            self.seed = self.random.seed
+            self.spawns = SpawnSchedule(self.random.world, enemy_max_x())
+            for player in self.players:
+                player.rng = self.random.babble
+        self.remove_all_enemy()
+        for hero in self.heroes:
+            hero.bullets.empty()
+        self.__place_heroes()
+        for player in self.players:
+            player.reset_state(reset_brain)
+        for player in self.players:
+            player.latency.reset()
+        self.scores = [0] * self.num_agents
+        self.speeding_delta_time_s = 0
+        self.num_ticks = 0
+        self.num_rendered_frames = 0
+        self.speed_melt_down = 0
+        self.num_melt_down_before_restore = 0
+        self.tick_overruns = self.timer_overruns = 0
+        self._pace_deadline_ms = None
+        self.scheduler = GameScheduler()  # 定时事件从头开始（第一架敌机仍在一秒后出现）
+        self.__set_timer()
+        self.metrics.reset(self.total_senses, self.total_operates)
+        self._game_data_rows = []
+        self.start_time = self.current_time
+        return summary
+
+    def run_episodes(self, num_episodes: int, duration_s: int, reset_brain: bool = False,
+                     reseed: bool = True) -> list[dict]:
+        "（无交互）连续运行多个回合（每回合固定的游戏内时长），返回各回合的摘要；reseed时第i回合的种子为「当前种子+i」"
+        base_seed: int = self.seed
+        summaries: list[dict] = []
+        for i in range(num_episodes):
+            self.run(duration_s)
+            summaries.append(self.reset_episode(
+                reset_brain, base_seed + i + 1 if reseed else None))
+        return summaries
+
+    def tick(self) -> None:
+        "推进一帧：事件→碰撞→图形→显示→等待"
+        late: bool = self.paced and self.__fell_behind()
+        self.__event_handler()
+        if late:  # 本帧的定时事件都晚于现实时间目标
+            self.timer_overruns += self._timer_runs
+        self.__check_collide()
+        self.__update_sprites()
+        if not self.headless:
+            with INSTRUMENTS.section('game.display'):
+                pygame.display.update()
+            self.num_rendered_frames += 1
+        self.num_ticks += 1
+        if self.paced:
+            with INSTRUMENTS.section('game.clock'):  # 等待下一帧（空闲）
+                self.clock.tick(self.fps)
+        # 性能分析的帧窗口计数（到达窗口末尾时自动结束并写出报告）
+        if self.profiler and not self.profiler.tick():
+            self.profiler = None
+
+    def __fell_behind(self) -> bool:
+        "（按帧率等待时）本帧是否落后于现实时间目标超过一帧；落后时计数，并从现在起重新对齐（不追赶）"
+        now_ms: int = pygame.time.get_ticks()
+        frame_ms: float = 1000 / self.fps
+        late: bool = self._pace_deadline_ms is not None and now_ms - self._pace_deadline_ms > frame_ms
+        if late:
+            self.tick_overruns += 1
+        if late or self._pace_deadline_ms is None:
+            self._pace_deadline_ms = now_ms
+        self._pace_deadline_ms += frame_ms
+        return late
+
+    def close(self) -> None:
+        "结束游戏：导出未保存的时间线、分析报告与本局结果，并断开NARS"
+        INSTRUMENTS.tracer and self.stop_trace()  # 保存未导出的时间线
+        self.profiler and self.stop_profile()  # 保存未导出的分析报告
+        if self.results_db and self.nars.brain:
+            self.save_run(self.results_db)
+        for player in self.players:
+            player.disconnect_brain()  # 重定位：从「程序终止」到「断开连接」
+
+    @INSTRUMENTS.timed('game.event_handler')
     def __event_handler(self):
         "处理事件"
         global ENABLE_GAME_DATA_RECORD
-        dt: int = self.speeding_delta_time_s - self.last_display_update_time
-        # 熔断恢复
-        if dt <= 0 and self.speed_melt_down > 0:  # 卡顿后恢复
-            # 恢复易卡事件
-            pygame.event.set_allowed(CREATE_ENEMY_EVENT)
-            pygame.event.set_allowed(UPDATE_NARS_EVENT)
-            # 恢复速度
-            self.game_speed = self.speed_melt_down - 0.1 * \
-                self.num_melt_down_before_restore  # 在减速中恢复稳态
-            print(f'Game stuck restored with speed={self.game_speed}!')
-            # 实在没办法时，清理所有敌机
-            if self.game_speed <= 0.1:
-                self.remove_all_enemy()
-            # 重置熔断数据
-            self.speed_melt_down = 0
-            self.num_melt_down_before_restore = 0
-        # 开始处理事件
+        # 处理（SDL）外部事件：退出与键盘
         for event in pygame.event.get():
             # 游戏退出
             if event.type == pygame.QUIT:
-                self.nars.disconnect_brain()  # 重定位：从「程序终止」到「断开连接」
+                self.close()
                 PlaneGame.__game_over()
-            # 时钟步进（游戏内时间）
-            elif event.type == INGAME_CLOCK_EVENT:
-                # 自动加速
-                if self.auto_speed_delta:
-                    print(
-                        f'auto speed up {self.game_speed} --[+{self.auto_speed_delta}]-> {self.game_speed+self.auto_speed_delta}')
-                    self.game_speed += self.auto_speed_delta
-                # 避免游戏过卡：游戏速率熔断机制
-                dt: int = self.speeding_delta_time_s - self.last_display_update_time
-                if dt > 0:  # 过度迟滞
-                    print(
-                        f'Game stuck detected with dt={dt} at speed={self.game_speed}!')
-                    # 屏蔽易卡事件
-                    pygame.event.set_blocked(CREATE_ENEMY_EVENT)
-                    pygame.event.set_blocked(UPDATE_NARS_EVENT)
-                    # 存储速度
-                    if self.speed_melt_down == 0:  # 只存储一次
-                        self.speed_melt_down = self.game_speed  # 熔断-暂存速度
-                    # 强制降低游戏速度
-                    self.game_speed = 0.1
-                    self.num_melt_down_before_restore += 1  # 增加熔断次数
-                    # 停止自动加速
-                    if self.auto_speed_delta:
-                        self.auto_speed_delta = 0
-                        print('Automatic acceleration stop.')
-                # 时间计数
-                self.speeding_delta_time_s += 1
-            # 周期性创建敌机
-            elif event.type == CREATE_ENEMY_EVENT:
-                enemy = Enemy()
-                self.enemy_group.add(enemy)
-            # NARS 状态更新
-            elif event.type == UPDATE_NARS_EVENT:
-                # use objects' positions to update NARS's sensors
-                self.nars.update(hero=self.hero, enemy_group=self.enemy_group)
-                pass
-            # NARS babble
-            elif event.type == OPENNARS_BABBLE_EVENT:
-                if self.remaining_babble_times <= 0:
-                    self.remaining_babble_times = 0  # 重置时间
-                    pygame.event.set_blocked(OPENNARS_BABBLE_EVENT)
-                else:
-                    # 在指定范围内babble
-                    self.nars.babble(2, NARSPlanePlayer.BABBLE_OPERATION_LIST)
-                    self.remaining_babble_times -= 1
-                    print('The remaining babble times: ' +
-                          str(self.remaining_babble_times))
             # 键盘按键
             elif (is_up := event.type == pygame.KEYUP) or event.type == pygame.KEYDOWN:
                 self.__handle_keys(
@@ -445,10 +700,129 @@ class PlaneGame:
                     key_mods=pygame.key.get_mods(),  # 键盘按键模式检测
                     isUp=is_up
                 )
+        # 处理内部定时事件：模拟时间前进一帧
+        self._timer_runs = self.scheduler.advance(SIMULATION_STEP_MS)
         # NARS 执行操作（时序上依赖游戏，而非NARS程序）
-        self.nars.handle_operations(self.hero)  # 解耦：封装在「NARSPlanePlayer」中
+        for player, hero in zip(self.players, self.heroes):
+            player.handle_operations(hero)  # 解耦：封装在「NARSPlanePlayer」中
         # 记录游戏数据
-        ENABLE_GAME_DATA_RECORD and self.collectDatas()
+        if ENABLE_GAME_DATA_RECORD and self.num_ticks % self.data_record_interval == 0:
+            self.collectDatas()
+
+    def __on_ingame_clock(self):
+        "时钟步进（游戏内时间）"
+        # 自动加速
+        if self.auto_speed_delta:
+            LOG_GAME.info('auto speed up %s --[+%s]-> %s', self.game_speed,
+                          self.auto_speed_delta, self.game_speed + self.auto_speed_delta)
+            self.game_speed += self.auto_speed_delta
+        # 避免游戏过卡：游戏速率熔断机制（上一帧的现实耗时超过了游戏内一秒）
+        dt: float = self.clock.get_time() * self.game_speed / 1000
+        if dt > 1:  # 过度迟滞
+            LOG_GAME.warning(
+                'Game stuck detected with dt=%.2f at speed=%s!', dt, self.game_speed)
+            # 屏蔽易卡事件
+            self.scheduler.pause(CREATE_ENEMY_EVENT)
+            self.scheduler.pause(UPDATE_NARS_EVENT)
+            # 存储速度
+            if self.speed_melt_down == 0:  # 只存储一次
+                self.speed_melt_down = self.game_speed  # 熔断-暂存速度
+            # 强制降低游戏速度
+            self.game_speed = 0.1
+            self.num_melt_down_before_restore += 1  # 增加熔断次数
+            # 停止自动加速
+            if self.auto_speed_delta:
+                self.auto_speed_delta = 0
+                LOG_GAME.info('Automatic acceleration stop.')
+        # 熔断恢复
+        elif self.speed_melt_down > 0:  # 卡顿后恢复
+            # 恢复易卡事件
+            self.scheduler.resume(CREATE_ENEMY_EVENT)
+            self.scheduler.resume(UPDATE_NARS_EVENT)
+            # 恢复速度
+            self.game_speed = self.speed_melt_down - 0.1 * \
+                self.num_melt_down_before_restore  # 在减速中恢复稳态
+            LOG_GAME.warning(
+                'Game stuck restored with speed=%s!', self.game_speed)
+            # 实在没办法时，清理所有敌机
+            if self.game_speed <= 0.1:
+                self.remove_all_enemy()
+            # 重置熔断数据
+            self.speed_melt_down = 0
+            self.num_melt_down_before_restore = 0
+        # 时间计数
+        self.speeding_delta_time_s += 1
+        self.metrics.tick_second(self.total_senses, self.total_operates)
+
+    def __on_instruments_summary(self):
+        "周期性汇总热点计时（仅在开启时）"
+        if INSTRUMENTS.enabled:
+            self.last_instrument_summary = INSTRUMENTS.summary(reset=True)
+
+    def start_trace(self, path: str = None, buffer_size: int = None) -> None:
+        "开始记录时间线"
+        self.trace_path = path or self.trace_path
+        self.trace_buffer_size = buffer_size or self.trace_buffer_size
+        INSTRUMENTS.attach_tracer(Tracer(self.trace_buffer_size))
+        print(f'Tracing started (buffer={self.trace_buffer_size} events).')
+
+    def stop_trace(self) -> None:
+        "停止记录时间线，并导出到文件"
+        if tracer := INSTRUMENTS.tracer:
+            INSTRUMENTS.attach_tracer(None)
+            tracer.save(self.trace_path)
+
+    def start_profile(self, num_ticks: int = None) -> None:
+        "开始性能分析（num_ticks为空时持续到手动停止）"
+        if self.profiler:
+            return
+        self.profiler = GameProfiler(self.profile_dir, num_ticks)
+        self.profiler.start()
+
+    def stop_profile(self) -> list[str]:
+        "停止性能分析，写出报告（返回报告路径）"
+        if profiler := self.profiler:
+            self.profiler = None
+            return profiler.stop()
+        return []
+
+    def start_recording(self, path: str) -> None:
+        "录制与NARS程序之间的全部I/O（附带游戏帧号），可用NARS_Recording.py回放（多智能体时只录制主智能体）"
+        self.nars.brain.start_recording(path, lambda: self.num_ticks)
+        print(f'Recording NAL I/O to {path}.')
+
+    def instrument_summary(self, reset: bool = False) -> dict[str, dict[str, float]]:
+        "获取游戏相关热点（事件、碰撞、图形、HUD）的计时摘要"
+        return INSTRUMENTS.summary(prefix='game.', reset=reset)
+
+    def __on_create_enemy(self):
+        "周期性创建敌机"
+        enemy = Enemy(*self.spawns.next())
+        self.enemy_group.add(enemy)
+
+    def __on_update_nars(self):
+        "NARS 状态更新"
+        # use objects' positions to update NARS's sensors
+        # 敌机位置快照每次只取一次，由所有智能体共享
+        enemy_rects: list[pygame.Rect] = [
+            enemy.rect for enemy in self.enemy_group.sprites()]
+        for player, hero in zip(self.players, self.heroes):
+            player.update(hero=hero, enemy_group=self.enemy_group,
+                          enemy_rects=enemy_rects)
+
+    def __on_babble(self):
+        "NARS babble"
+        if self.remaining_babble_times <= 0:
+            self.remaining_babble_times = 0  # 重置时间
+            self.scheduler.pause(OPENNARS_BABBLE_EVENT)
+        else:
+            # 在指定范围内babble
+            for player in self.players:
+                player.babble(self.babble_probability,
+                              NARSPlanePlayer.BABBLE_OPERATION_LIST)
+            self.remaining_babble_times -= 1
+            LOG_BABBLE.debug('The remaining babble times: %d',
+                             self.remaining_babble_times)
 
     def __handle_keys(self, key: int, key_mods: int, isUp: bool) -> None:
         "捕捉键盘事件"
@@ -479,6 +853,13 @@ class PlaneGame:
                 self.game_speed *= 0.5
             else:
                 self.game_speed -= 0.25  # 有「避免非负机制」
+        # F5：开始新的回合（Shift+F5：同时清空NARS的记忆）
+        elif key == pygame.K_F5:
+            reset_brain: bool = bool(key_mods & pygame.KMOD_SHIFT)
+            if summary := self.reset_episode(reset_brain):
+                print(f'Episode {summary["episode"]} finished: score={summary["score"]} '
+                      f'in {summary["ingame_time"]}s.')
+            print(f'Episode {self.episode} start{" with a fresh brain" if reset_brain else ""}...')
         # C：清除所有敌机
         elif key == pygame.K_c:
             print('All enemies removed.')
@@ -499,6 +880,32 @@ class PlaneGame:
         elif key == pygame.K_DOWN:
             self.nars.force_unconscious_operation(
                 NARSPlanePlayer.OPERATION_DEACTIVATE)
+        # L：打印延迟统计（多智能体时为各大脑合并后的分布）
+        elif key == pygame.K_l:
+            print(self.latency().report())
+        # H：开关性能HUD页
+        elif key == pygame.K_h:
+            self.show_performance_overlay ^= True
+            self.performance_overlay.reset()
+        # I：开关热点计时（关闭时打印最后的摘要）
+        elif key == pygame.K_i:
+            if not INSTRUMENTS.toggle():
+                print(INSTRUMENTS.report())
+            print(f'Instruments {"on" if INSTRUMENTS.enabled else "off"}.')
+        # T：开始/停止（并导出）时间线追踪
+        elif key == pygame.K_t:
+            if INSTRUMENTS.tracer:
+                self.stop_trace()
+            else:
+                self.start_trace()
+        # R：开始/停止性能分析（Shift+R：只分析接下来的600帧）
+        elif key == pygame.K_r:
+            if self.profiler:
+                self.stop_profile()
+            else:
+                self.start_profile(
+                    DEFAULT_PROFILE_TICKS if key_mods & pygame.KMOD_SHIFT
+                    else None)
         # U：开关「是否惩罚」
         elif key == pygame.K_u:
             self.enable_punish ^= True
@@ -539,7 +946,7 @@ class PlaneGame:
                 if self.remaining_babble_times <= 0:
                     self.remaining_babble_times = 0  # 莫溢出
                 else:  # 重新开始监听事件
-                    pygame.event.set_allowed(OPENNARS_BABBLE_EVENT)
+                    self.scheduler.resume(OPENNARS_BABBLE_EVENT)
         # E：开启/关闭NARS的感知/操作
         elif key == pygame.K_e:
             if key_mods & pygame.KMOD_SHIFT:  # 操作
@@ -560,37 +967,44 @@ class PlaneGame:
             self.nars.force_unconscious_operation(
                 NARSPlanePlayer.OPERATION_FIRE)
 
+    @INSTRUMENTS.timed('game.collision')
     def __check_collide(self):
         "检查碰撞"
-        # Several collisions may happen at the same time
-        collisions = pygame.sprite.groupcollide(self.hero.bullets, self.enemy_group, True,
-                                                True)  # collided=pygame.sprite.collide_circle_ratio(0.8)
-        if collisions:
-            # len(collisions) denotes how many collisions happened
-            self.score += len(collisions)
-            self.nars.praise()
-            print("good")
-            print('score: ' + str(self.score))
-
-        collisions = pygame.sprite.spritecollide(self.hero, self.enemy_group, True,
-                                                 collided=pygame.sprite.collide_circle_ratio(0.7))
-        if collisions and self.enable_punish:
-            self.score -= len(collisions)
-            self.nars.punish()
-            print("bad")
-            pass
-
+        # 多智能体时按顺序结算：同一架敌机只算给先击中/撞上它的战机
+        for i, (player, hero) in enumerate(zip(self.players, self.heroes)):
+            # Several collisions may happen at the same time
+            collisions = pygame.sprite.groupcollide(hero.bullets, self.enemy_group, True,
+                                                    True)  # collided=pygame.sprite.collide_circle_ratio(0.8)
+            if collisions:
+                # len(collisions) denotes how many collisions happened
+                self.scores[i] += len(collisions)
+                self.metrics.on_hit(len(collisions))
+                player.praise()
+                LOG_GAME.debug('good, score of agent %d: %d', i, self.scores[i])
+
+            collisions = pygame.sprite.spritecollide(hero, self.enemy_group, True,
+                                                     collided=pygame.sprite.collide_circle_ratio(CRASH_RADIUS_RATIO))
+            if collisions and self.enable_punish:
+                self.scores[i] -= len(collisions)
+                self.metrics.on_punish(len(collisions))
+                player.punish()
+                LOG_GAME.debug('bad, score of agent %d: %d', i, self.scores[i])
+
+    @INSTRUMENTS.timed('game.sprites')
     def __update_sprites(self):
-        "更新图形"
-        self.last_display_update_time = self.speeding_delta_time_s
+        "更新图形（无界面模式只更新位置，不绘制）"
         self.background_group.update()
-        self.background_group.draw(self.screen)
         self.enemy_group.update()
-        self.enemy_group.draw(self.screen)
         self.hero_group.update()
+        for hero in self.heroes:
+            hero.bullets.update()
+        if self.headless:
+            return
+        self.background_group.draw(self.screen)
+        self.enemy_group.draw(self.screen)
         self.hero_group.draw(self.screen)
-        self.hero.bullets.update()
-        self.hero.bullets.draw(self.screen)
+        for hero in self.heroes:
+            hero.bullets.draw(self.screen)
         self.__display_text()
 
     def remove_all_enemy(self) -> None:
@@ -609,6 +1023,16 @@ class PlaneGame:
         "游戏从开始到现在经历的*现实*时间（秒）"
         return (self.current_time - self.start_time) / 1000
 
+    @property
+    def total_senses(self) -> int:
+        "所有智能体从外界获得的感知总数"
+        return sum(player.total_senses for player in self.players)
+
+    @property
+    def total_operates(self) -> int:
+        "所有智能体从NARS程序接收的操作总数"
+        return sum(player.total_operates for player in self.players)
+
     @property
     def performance(self) -> float:
         "把「玩家表现」独立出来计算（依附于游戏，而非玩家）"
@@ -617,6 +1041,7 @@ class PlaneGame:
             else self.score / self.speeding_delta_time_s
         )
 
+    @INSTRUMENTS.timed('game.hud')
     def __display_text(self):
         "内部文本内容刷新"
 
@@ -633,8 +1058,17 @@ class PlaneGame:
             'Time(s): %d' % self.speeding_delta_time_s, True, [235, 235, 20])
         surface_performance = self.font.render(
             'Performance: %.3f' % self.performance, True, [235, 235, 20])
+        surface_hit_rate = self.font.render(
+            'Hit rate(%ds): %.3f' % (self.metrics.window, self.metrics.hit_rate), True, [235, 235, 20])
+        surface_reward = self.font.render(
+            'Reward EWMA: %.3f' % self.metrics.reward_ewma, True, [235, 235, 20])
+        surface_operation_rate = self.font.render(
+            'Operation rate(%ds): %.2f' % (self.metrics.window, self.metrics.operation_rate), True, [235, 235, 20])
         surface_score = self.font.render(
             'Score: %d' % self.score, True, [235, 235, 20])
+        surface_agent_scores = self.font.render(  # 多智能体时各自的得分
+            'Scores: ' + '/'.join(map(str, self.scores)), True, [235, 235, 20]
+        ) if self.num_agents > 1 else None
         surface_fps = self.font.render(
             'FPS: %d' % self.clock.get_fps(), True, [235, 235, 20])
         surface_babbling = self.font.render(
@@ -650,17 +1084,23 @@ class PlaneGame:
             f'NARS Operation: {"on" if self.nars.enable_brain_control else "off"}', True, [235, 235, 20])  # 指示NARS能否操作
         surface_game_speed = self.font.render(
             'Speed: %.2f' % self.game_speed, True, [235, 235, 20])  # 指示游戏速度
-        self.screen.blit(surface_operation, [20, 10])
-        self.screen.blit(surface_babbling, [20, 30])
-        self.screen.blit(surface_time, [20, 50])
-        self.screen.blit(surface_performance, [20, 70])
+        left_column = [
+            surface_operation, surface_babbling, surface_time, surface_performance,
+            surface_nars_perception_enable, surface_nars_operation_enable,
+            surface_hit_rate, surface_reward, surface_operation_rate]
+        if surface_agent_scores:
+            left_column.append(surface_agent_scores)
+        for i, surface in enumerate(left_column):  # 左侧一列，每行20像素
+            self.screen.blit(surface, [20, 10 + 20 * i])
         self.screen.blit(surface_score, [370, 10])
         self.screen.blit(surface_fps, [370, 30])
         self.screen.blit(surface_game_speed, [370, 50])
         self.screen.blit(surface_nars_type, [5, 680])
         self.screen.blit(surface_version, [435, 680])
-        self.screen.blit(surface_nars_perception_enable, [20, 90])
-        self.screen.blit(surface_nars_operation_enable, [20, 110])
+        # 性能HUD页：放在左侧一列的最后一行之下
+        if self.show_performance_overlay:
+            self.performance_overlay.update(self)
+            self.performance_overlay.draw(self.screen, 10 + 20 * len(left_column) + 10)
 
     @staticmethod
     def __game_over():
@@ -672,17 +1112,13 @@ class PlaneGame:
 if ENABLE_GAME_DATA_RECORD:
 
     from math import ceil
+    from matplotlib.ticker import FuncFormatter, MaxNLocator
 
-    def plotDatas(datas: pd.DataFrame):
-        "展示游戏数据图表"
+    def plotDatas(datas: pd.DataFrame, max_points: int = DEFAULT_MAX_POINTS):
+        "展示游戏数据图表（按视野降采样，缩放/重绘的开销与数据总量无关）"
 
-        # 处理「时间」
-        timeSeries = datas['ingame_time']
-        # timeSeries = timeSeries[::len(timeSeries)//10+1] # 初次均匀截取十个（暂不需要）
-        timeSeries = timeSeries.drop_duplicates()  # 丢掉重复值，让「游戏内时间」与索引脱离（开始不均匀）
-        timeSeries = timeSeries[::len(timeSeries)//10+1]  # 保留最多十个刻度（避免后续刻度太接近）
-        timeRange = timeSeries.index  # 获取索引值
-        # datas = datas.drop(columns='ingame_time') # 去掉「时间数据」
+        # 预计算多分辨率摘要（只在绘图进程中进行一次）
+        summary: GameDataSummary = GameDataSummary(datas)
 
         # 规划图表
         num_plots: int = len(datas.columns)
@@ -692,17 +1128,27 @@ if ENABLE_GAME_DATA_RECORD:
         fig, axes = plt.subplots(*subplot_shape)
         fig.suptitle('Game Datas')
 
+        # 🆕设置横轴坐标为「游戏内时间」，并能反映游戏速度的变化（随缩放自动更新）
+        time_formatter = FuncFormatter(
+            lambda x, _: f'{summary.ingame_time_at(x)}')
+
+        def redraw_on_zoom(ax, line, serie):
+            "视野变化时，从摘要中取出对应层级的曲线"
+            def callback(_):
+                x_from, x_to = ax.get_xlim()
+                line.set_data(*serie.query(x_from, x_to, max_points))
+            return callback
+
         # 绘制图表
         for i, serieName in enumerate(datas.columns):
             ax = axes.flatten()[i]  # 铺平，以便于逐个获取（在子图表超过一行时失效）
-            # ax.plot(timeSeries,datas[serieName]) # 要求曲线精度够高，横轴坐标还有有可比性意义
-            # print(ax,axes,i,datas[serieName],timeSeries)
-            datas[serieName].plot(ax=ax)
+            serie = summary[serieName]
+            line, = ax.plot(*serie.query(max_points=max_points))
+            ax.callbacks.connect(
+                'xlim_changed', redraw_on_zoom(ax, line, serie))
             ax.set_title(serieName)
-            # 🆕设置横轴坐标为「游戏内时间」，并能反映游戏速度的变化
-
-            ax.set_xticks(timeRange)  # 反映「游戏内时间到t时被记录到的索引值」
-            ax.set_xticklabels(timeSeries)
+            ax.xaxis.set_major_locator(MaxNLocator(10))  # 保留最多十个刻度
+            ax.xaxis.set_major_formatter(time_formatter)
             ax.set_xlabel('time')
 
         plt.tight_layout()
@@ -716,28 +1162,78 @@ if ENABLE_GAME_DATA_RECORD:
         print(f'Game datas are exported to {DATA_FILE_NAME}.')
 
 
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    "解析命令行参数（位置参数缺省时，在启动后交互输入）"
+    parser = argparse.ArgumentParser(description='NARS-FighterPlane')
+    parser.add_argument('nars_type', nargs='?',
+                        help='opennars(default)/ONA/python/scripted_opennars/scripted_ONA')
+    parser.add_argument('game_speed', nargs='?', help='default 1.0')
+    parser.add_argument('enable_punish', nargs='?',
+                        help='punish NARS when non-empty')
+    parser.add_argument('--instruments', action='store_true',
+                        help='enable hot-path instrumentation from the start (toggle with I)')
+    parser.add_argument('--trace', metavar='FILE', nargs='?', const=DEFAULT_TRACE_PATH,
+                        help=f'record a trace-event timeline from the start and save it to FILE on exit (toggle with T, default {DEFAULT_TRACE_PATH})')
+    parser.add_argument('--trace-buffer', type=int, default=DEFAULT_TRACE_BUFFER_SIZE,
+                        help='maximum number of trace events kept in memory')
+    parser.add_argument('--profile', metavar='TICKS', type=int, nargs='?', const=0,
+                        help='profile the first TICKS game ticks (0 or omitted: until stopped with R)')
+    parser.add_argument('--profile-dir', default=DEFAULT_PROFILE_DIR,
+                        help='directory of the profile reports')
+    parser.add_argument('--record', metavar='FILE',
+                        help='record the NAL I/O stream to a compressed log (replay with NARS_Recording.py)')
+    parser.add_argument('--agents', type=int, default=1,
+                        help='number of NARS-controlled heroes sharing the world (one brain process each)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='random seed of enemy spawns and babble (default: random, printed at start)')
+    parser.add_argument('--spawn-schedule', metavar='FILE',
+                        help='pregenerated enemy spawn schedule (see game_random.py)')
+    parser.add_argument('--results-db', metavar='FILE',
+                        help='save the config, summary and data of this run to a SQLite results database on exit')
+    parser.add_argument('--log-level', default=DEFAULT_LOG_LEVEL,
+                        help=f'default log level (default {DEFAULT_LOG_LEVEL})')
+    parser.add_argument('--log', metavar='CATEGORY=LEVEL', action='append',
+                        help=f'log level of one category ({"/".join(LOG_CATEGORIES)}), e.g. --log ops=DEBUG')
+    return parser.parse_args(argv)
+
+
 if __name__ == '__main__':
     # game = PlaneGame('opennars')  # input 'ONA' or 'opennars'
     # 可选参数
+    args: argparse.Namespace = parse_args()
+    setup_logging(args.log_level, parse_category_levels(args.log))
     nars_type: NARSType = (
-        NARSType(sys.argv[1]) if len(sys.argv) > 1
+        NARSType(args.nars_type) if args.nars_type
         else NARSType(type)
         if (type := input("Please input the type of NARS(opennars(default)/ONA/python): "))
         else NARSType.OPENNARS
     )
     game_speed: float = float(
-        sys.argv[2] if len(sys.argv) > 2
+        args.game_speed if args.game_speed
         else speed
         if (speed := input("Please input game speed(default 1.0): "))
         else 1.0
     )
     enable_punish: bool = bool(
-        sys.argv[3] if len(sys.argv) > 3
+        args.enable_punish if args.enable_punish is not None
         else input("Please input whether you want to punish NARS(empty for False): ")
     )
+    INSTRUMENTS.enabled = args.instruments
     game = PlaneGame(
         nars_type=nars_type,
         game_speed=game_speed,
         enable_punish=enable_punish,
+        seed=args.seed,
+        spawn_schedule=args.spawn_schedule,
+        num_agents=args.agents,
     )
+    print(f'seed = {game.seed}')
+    if args.trace:
+        game.start_trace(args.trace, args.trace_buffer)
+    game.profile_dir = args.profile_dir
+    game.results_db = args.results_db
+    if args.record:
+        game.start_recording(args.record)
+    if args.profile is not None:
+        game.start_profile(args.profile or None)
     game.start_game()
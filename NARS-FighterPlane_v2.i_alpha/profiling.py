@@ -0,0 +1,161 @@
+"""游戏内置的性能分析器
+- 游戏线程：使用cProfile（确定性分析），精确到每个函数的调用次数与耗时
+- 所有线程：使用一个低开销的采样线程，定期抓取各线程的调用栈，按线程归因（游戏 vs NARS读写线程）
+- 在一段「游戏帧窗口」内运行，结束后把排序好的报告写入磁盘
+"""
+
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+
+from tracing import THREAD_NAME_ALIASES
+
+DEFAULT_SAMPLE_INTERVAL: float = 0.005
+"采样间隔（秒）"
+
+NUM_TOP_FUNCTIONS: int = 25
+"报告中每个线程列出的函数数"
+
+
+def _frame_key(frame) -> str:
+    "调用栈帧→可读的函数标识"
+    code = frame.f_code
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+class SamplingProfiler:
+    """采样分析器：在独立线程中定期抓取所有线程的调用栈
+    - 自身耗时（栈顶函数）与累计耗时（栈中出现过的函数）分别计数
+    - 按线程名归因
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL) -> None:
+        self.interval: float = interval
+        self.samples: dict[str, int] = {}  # 线程名 → 采样数
+        self.self_counts: dict[str, dict[str, int]] = {}  # 线程名 → 函数 → 栈顶次数
+        self.inclusive_counts: dict[str, dict[str, int]] = {}  # 线程名 → 函数 → 出现次数
+        self._running: bool = False
+        self._thread: threading.Thread = None
+
+    def start(self) -> None:
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name='profiler-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own_id: int = threading.get_ident()
+        while self._running:
+            names: dict[int, str] = {
+                thread.ident: THREAD_NAME_ALIASES.get(thread.name, thread.name)
+                for thread in threading.enumerate()}
+            for tid, frame in sys._current_frames().items():
+                if tid == own_id:
+                    continue
+                self._sample(names.get(tid, str(tid)), frame)
+            time.sleep(self.interval)
+
+    def _sample(self, thread_name: str, frame) -> None:
+        self.samples[thread_name] = self.samples.get(thread_name, 0) + 1
+        self_counts = self.self_counts.setdefault(thread_name, {})
+        inclusive_counts = self.inclusive_counts.setdefault(thread_name, {})
+        key: str = _frame_key(frame)
+        self_counts[key] = self_counts.get(key, 0) + 1
+        seen: set[str] = set()  # 递归时只计一次
+        while frame is not None:
+            if (key := _frame_key(frame)) not in seen:
+                seen.add(key)
+                inclusive_counts[key] = inclusive_counts.get(key, 0) + 1
+            frame = frame.f_back
+
+    def report(self) -> str:
+        "按线程生成报告（采样数×间隔≈墙钟时间）"
+        lines: list[str] = [
+            f'Sampling profile (interval={self.interval * 1000:.1f}ms)',
+            f'{"thread":<36}{"samples":>10}{"~seconds":>12}',
+        ]
+        for thread_name, n in sorted(self.samples.items(), key=lambda item: -item[1]):
+            lines.append(
+                f'{thread_name:<36}{n:>10d}{n * self.interval:>12.2f}')
+        for thread_name, n in sorted(self.samples.items(), key=lambda item: -item[1]):
+            lines += ['', f'== {thread_name} ({n} samples) ==',
+                      f'{"self":>8}{"total":>8}  function']
+            inclusive = self.inclusive_counts[thread_name]
+            for key, count in sorted(
+                self.self_counts[thread_name].items(), key=lambda item: -item[1]
+            )[:NUM_TOP_FUNCTIONS]:
+                lines.append(
+                    f'{count / n:>8.1%}{inclusive.get(key, 0) / n:>8.1%}  {key}')
+        return '\n'.join(lines)
+
+
+class GameProfiler:
+    """游戏性能分析会话
+    - start：开始（游戏线程cProfile + 全线程采样）
+    - tick：每帧调用一次；达到预定帧数时自动结束
+    - stop：结束，并把报告写入output_dir
+    """
+
+    def __init__(self, output_dir: str = '.', num_ticks: int = None, sample_interval: float = DEFAULT_SAMPLE_INTERVAL) -> None:
+        self.output_dir: str = output_dir
+        self.num_ticks: int = num_ticks  # 为空则持续到手动停止
+        self.ticks: int = 0
+        self.profile: cProfile.Profile = cProfile.Profile()
+        self.sampler: SamplingProfiler = SamplingProfiler(sample_interval)
+        self.running: bool = False
+
+    def start(self) -> None:
+        "开始分析（须在游戏线程中调用）"
+        self.start_time: float = time.perf_counter()
+        self.sampler.start()
+        self.profile.enable()
+        self.running = True
+        print(
+            f'Profiler started{f" for {self.num_ticks} ticks" if self.num_ticks else ""}.')
+
+    def tick(self) -> bool:
+        "记录一帧，返回分析是否仍在进行"
+        if self.running:
+            self.ticks += 1
+            if self.num_ticks and self.ticks >= self.num_ticks:
+                self.stop()
+        return self.running
+
+    def stop(self) -> list[str]:
+        "结束分析并写出报告（返回报告路径）"
+        if not self.running:
+            return []
+        self.profile.disable()
+        self.sampler.stop()
+        self.running = False
+        wall_time: float = time.perf_counter() - self.start_time
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp: str = time.strftime('%Y%m%d-%H%M%S')
+        game_path: str = os.path.join(
+            self.output_dir, f'profile_{stamp}_game.txt')
+        threads_path: str = os.path.join(
+            self.output_dir, f'profile_{stamp}_threads.txt')
+        # 游戏线程：按累计耗时与自身耗时各排序一次
+        with open(game_path, 'w', encoding='utf-8') as file:
+            file.write(
+                f'Game thread profile: {self.ticks} ticks in {wall_time:.2f}s\n\n')
+            stats = pstats.Stats(self.profile, stream=file)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+                NUM_TOP_FUNCTIONS * 2)
+            stats.sort_stats(pstats.SortKey.TIME).print_stats(
+                NUM_TOP_FUNCTIONS * 2)
+        # 所有线程：采样归因
+        with open(threads_path, 'w', encoding='utf-8') as file:
+            file.write(
+                f'All threads: {self.ticks} ticks in {wall_time:.2f}s\n\n')
+            file.write(self.sampler.report())
+        print(f'Profile reports are exported to {game_path} and {threads_path}.')
+        return [game_path, threads_path]
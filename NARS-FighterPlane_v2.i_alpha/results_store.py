@@ -0,0 +1,239 @@
+"""本地SQLite结果库：存储每局的配置、摘要与时间序列指标
+- runs表：每局一行；配置字段（后端、速度、种子、感知器等）与开始时间均建有索引
+- telemetry表：每局的时间序列（按游戏内时间），以(run_id, ingame_time)索引
+- 摘要与遥测的列随数据自动添加（列名取原名的「小写+下划线」形式，如「round trip p95 (ms)」→round_trip_p95_ms）
+- ResultWriter：在后台线程中批量写入，调用方（游戏循环/实验调度）只需入队
+"""
+
+import re
+import json
+import time
+import queue
+import sqlite3
+import threading
+
+DEFAULT_DB_PATH: str = 'results.sqlite'
+"默认的结果库路径"
+
+CONFIG_COLUMNS: dict[str, str] = {
+    'backend': 'TEXT',
+    'game_speed': 'REAL',
+    'seed': 'INTEGER',
+    'sensors': 'TEXT',
+    'enable_punish': 'INTEGER',
+    'inference_cycle_frequency': 'INTEGER',
+    'babble_times': 'INTEGER',
+    'babble_probability': 'INTEGER',
+    'duration_s': 'REAL',
+}
+"runs表中单独成列（可索引）的配置字段"
+
+SCHEMA: str = f'''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    experiment TEXT,
+    cell_id TEXT UNIQUE,
+    started_at REAL NOT NULL,
+    {', '.join(f'{name} {type}' for name, type in CONFIG_COLUMNS.items())},
+    config TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_config ON runs (backend, game_speed, seed);
+CREATE INDEX IF NOT EXISTS runs_sensors ON runs (sensors);
+CREATE INDEX IF NOT EXISTS runs_experiment ON runs (experiment);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at);
+CREATE TABLE IF NOT EXISTS telemetry (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    ingame_time REAL
+);
+CREATE INDEX IF NOT EXISTS telemetry_run ON telemetry (run_id, ingame_time);
+'''
+
+BATCH_SIZE: int = 64
+"后台写入时，每个事务最多合并的局数"
+
+
+def column_name(name: str) -> str:
+    "指标名→列名"
+    return re.sub(r'\W+', '_', name.lower()).strip('_')
+
+
+def _value(value):
+    "Python值→SQLite值（列表/字典存为JSON）"
+    if isinstance(value, (list, tuple, dict)):
+        return json.dumps(value)
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+class ResultStore:
+    """结果库（单个连接，只在创建它的线程中使用）
+    - add_run(配置, 摘要, 遥测)：写入一局
+    - runs(**条件)/telemetry(局号)：查询为表格（需要pandas）
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH) -> None:
+        self.path: str = path
+        self.connection: sqlite3.Connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')  # 写入时不阻塞读取
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+        self._columns: dict[str, set[str]] = {
+            table: self._table_columns(table) for table in ('runs', 'telemetry')}
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _table_columns(self, table: str) -> set[str]:
+        return {row[1] for row in self.connection.execute(f'PRAGMA table_info({table})')}
+
+    def _ensure_columns(self, table: str, names) -> None:
+        "按需添加列（列不声明类型，按写入的值存储）"
+        for name in names:
+            if name not in self._columns[table]:
+                self.connection.execute(
+                    f'ALTER TABLE {table} ADD COLUMN "{name}"')
+                self._columns[table].add(name)
+
+    # 写入 #
+
+    def add_run(self, config: dict, summary: dict, telemetry: list[dict] = (),
+                experiment: str = None, cell_id: str = None, started_at: float = None) -> int:
+        """写入一局（返回局号）
+        - config：本局配置（后端名可用backend或nars_type给出）
+        - summary：本局摘要；telemetry：遥测行（字典列表）
+        """
+        with self.connection:  # 一局一个事务
+            return self._insert(config, summary, telemetry, experiment, cell_id, started_at)
+
+    def add_runs(self, runs: list[dict]) -> list[int]:
+        "在同一个事务中写入多局（每项为add_run的关键字参数）"
+        with self.connection:
+            return [self._insert(**run) for run in runs]
+
+    def _insert(self, config: dict, summary: dict, telemetry: list[dict] = (),
+                experiment: str = None, cell_id: str = None, started_at: float = None) -> int:
+        if cell_id is not None and (existing := self.connection.execute(
+                'SELECT id FROM runs WHERE cell_id = ?', (cell_id,)).fetchone()):
+            return existing[0]  # 同一格只保留最先写入的结果
+        config = {
+            'backend': config.get('backend', config.get('nars_type')), **config}
+        row: dict = {
+            'experiment': experiment,
+            'cell_id': cell_id,
+            'started_at': started_at or time.time(),
+            **{name: _value(config.get(name)) for name in CONFIG_COLUMNS},
+            'config': json.dumps(config, default=str),
+            **{column_name(name): _value(value) for name, value in summary.items()
+               if column_name(name) not in CONFIG_COLUMNS},
+        }
+        self._ensure_columns('runs', row)
+        run_id: int = self.connection.execute(
+            f'INSERT INTO runs ({", ".join(map(_quote, row))}) VALUES ({", ".join("?" * len(row))})',
+            list(row.values())
+        ).lastrowid
+        if telemetry:
+            columns: list[str] = list(telemetry[0])
+            names: list[str] = ['run_id', *map(column_name, columns)]
+            self._ensure_columns('telemetry', names)
+            self.connection.executemany(
+                f'INSERT INTO telemetry ({", ".join(map(_quote, names))}) VALUES ({", ".join("?" * len(names))})',
+                ([run_id, *(_value(record.get(column)) for column in columns)]
+                 for record in telemetry)
+            )
+        return run_id
+
+    # 查询 #
+
+    def finished_cells(self, experiment: str = None) -> set[str]:
+        "已完成（写入）的格子编号"
+        sql: str = 'SELECT cell_id FROM runs WHERE cell_id IS NOT NULL'
+        params: list = []
+        if experiment is not None:
+            sql += ' AND experiment = ?'
+            params.append(experiment)
+        return {row[0] for row in self.connection.execute(sql, params)}
+
+    def query(self, sql: str, params=()):
+        "执行任意查询，返回表格"
+        import pandas as pd
+        return pd.read_sql_query(sql, self.connection, params=params)
+
+    def runs(self, since: float = None, until: float = None, **filters):
+        """按配置字段（及开始时间范围）筛选各局，如 runs(backend='ONA', game_speed=2.0)
+        - 值为列表/元组时，表示「取其中任一」
+        """
+        conditions: list[str] = []
+        params: list = []
+        for name, value in filters.items():
+            if isinstance(value, (list, tuple)):
+                conditions.append(
+                    f'{_quote(name)} IN ({", ".join("?" * len(value))})')
+                params += [_value(v) for v in value]
+            else:
+                conditions.append(f'{_quote(name)} = ?')
+                params.append(_value(value))
+        if since is not None:
+            conditions.append('started_at >= ?')
+            params.append(since)
+        if until is not None:
+            conditions.append('started_at < ?')
+            params.append(until)
+        where: str = f' WHERE {" AND ".join(conditions)}' if conditions else ''
+        return self.query(f'SELECT * FROM runs{where} ORDER BY id', params)
+
+    def telemetry(self, run_ids: list[int]):
+        "获取若干局的遥测"
+        return self.query(
+            f'SELECT * FROM telemetry WHERE run_id IN ({", ".join("?" * len(run_ids))}) '
+            'ORDER BY run_id, ingame_time',
+            list(run_ids))
+
+
+def _quote(name: str) -> str:
+    return f'"{name}"'
+
+
+class ResultWriter:
+    """后台写入线程：submit只入队，写入在独立线程与连接中批量进行
+    - close()：写完队列中剩余的结果后结束
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH) -> None:
+        self.path: str = path
+        self.num_written: int = 0
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread = threading.Thread(
+            target=self._run, name='results-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, config: dict, summary: dict, telemetry: list[dict] = (),
+               experiment: str = None, cell_id: str = None, started_at: float = None) -> None:
+        "提交一局（不阻塞）"
+        self._queue.put({
+            'config': config, 'summary': summary, 'telemetry': telemetry,
+            'experiment': experiment, 'cell_id': cell_id,
+            'started_at': started_at or time.time(),
+        })
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        store = ResultStore(self.path)
+        running: bool = True
+        while running:
+            batch: list[dict] = [self._queue.get()]  # 阻塞等待第一项
+            while len(batch) < BATCH_SIZE and not self._queue.empty():  # 合并已到达的项
+                batch.append(self._queue.get())
+            if None in batch:
+                running = False
+                batch = [run for run in batch if run is not None]
+            if batch:
+                try:
+                    store.add_runs(batch)
+                    self.num_written += len(batch)
+                except sqlite3.Error as e:
+                    print(f'Failed to write {len(batch)} runs to {self.path}: {e}')
+        store.close()
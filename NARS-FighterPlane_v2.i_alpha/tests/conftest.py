@@ -0,0 +1,8 @@
+"""测试配置：模块以平铺方式组织（直接运行脚本时的导入方式），测试前将其所在目录加入导入路径"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # 导入pygame相关模块时不打开窗口
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
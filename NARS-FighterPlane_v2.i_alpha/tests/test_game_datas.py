@@ -0,0 +1,48 @@
+"""遥测的最值金字塔：保留尖峰与低谷、点数上限与视野"""
+
+import numpy as np
+import pandas as pd
+
+from game_datas import MultiResolutionSeries, GameDataSummary
+
+
+def test_levels_keep_global_extremes():
+    rng = np.random.default_rng(0)
+    y: np.ndarray = rng.normal(size=10000)
+    y[1234], y[8765] = 100.0, -100.0  # 单点尖峰与低谷
+    series = MultiResolutionSeries(np.arange(len(y)), y, factor=4)
+    for x_start, x_min, y_min, x_max, y_max in series.levels:
+        assert y_max.max() == 100.0 and x_max[y_max.argmax()] == 1234
+        assert y_min.min() == -100.0 and x_min[y_min.argmin()] == 8765
+    assert len(series.levels[-1][0]) == 1
+
+
+def test_query_limits_points_and_keeps_order():
+    y: np.ndarray = np.sin(np.arange(100000) / 50)
+    series = MultiResolutionSeries(np.arange(len(y)), y)
+    xs, ys = series.query(max_points=500)
+    assert len(xs) <= 500
+    assert np.all(np.diff(xs) >= 0)
+    assert ys.max() == y.max() and ys.min() == y.min()
+
+
+def test_small_view_returns_raw_points():
+    y: np.ndarray = np.arange(1000, dtype=float)
+    series = MultiResolutionSeries(np.arange(len(y)), y)
+    xs, ys = series.query(100, 199, max_points=500)
+    assert np.array_equal(xs, np.arange(100, 201))  # 从视野起点所在的桶起，右侧多取一个点
+    assert np.array_equal(ys, xs)
+
+
+def test_empty_series():
+    series = MultiResolutionSeries(np.array([]), np.array([]))
+    xs, ys = series.query()
+    assert len(xs) == len(ys) == 0
+
+
+def test_summary_maps_rows_to_ingame_time():
+    datas = pd.DataFrame({'ingame_time': [0, 1, 2, 3], 'score': [0, 1, 1, 2]})
+    summary = GameDataSummary(datas)
+    assert set(summary) == {'ingame_time', 'score'}
+    assert summary.ingame_time_at(2.4) == 2
+    assert summary.ingame_time_at(99) == 3
@@ -0,0 +1,54 @@
+"""滚动指标：滑动窗口的过期、EWMA与按秒结算的增量"""
+
+import pytest
+
+from game_metrics import SlidingWindowCounter, EWMA, RollingMetrics
+
+
+def test_window_evicts_oldest_second():
+    counter = SlidingWindowCounter(3)
+    for n in (1, 2, 3, 4):
+        counter.add(n)
+        counter.advance()
+    assert counter.is_full
+    assert counter.total == 2 + 3 + 4  # 第一秒已过期
+    assert counter.rate == pytest.approx(3)
+
+
+def test_current_second_is_not_counted_until_it_ends():
+    counter = SlidingWindowCounter(3)
+    counter.add(5)
+    assert counter.total == 0
+    assert counter.rate == 0.0
+    counter.advance()
+    assert not counter.is_full
+    assert counter.rate == 5  # 窗口未填满时按已过的秒数计算
+
+
+def test_reset_clears_window():
+    counter = SlidingWindowCounter(2)
+    counter.add(3)
+    counter.advance()
+    counter.reset()
+    assert counter.total == 0 and counter.rate == 0.0 and not counter.is_full
+
+
+def test_ewma_starts_at_first_sample_and_halves_with_half_life():
+    ewma = EWMA.from_half_life(1)
+    assert ewma.update(8) == 8
+    assert ewma.update(0) == pytest.approx(4)
+
+
+def test_rolling_metrics_use_per_second_increments():
+    metrics = RollingMetrics(window=2, half_life=1)
+    metrics.on_hit(2)
+    metrics.on_punish()
+    metrics.tick_second(total_senses=10, total_operates=4)
+    metrics.tick_second(total_senses=30, total_operates=4)
+    assert metrics.sense_rate == pytest.approx(15)  # (10 + 20) / 2
+    assert metrics.operation_rate == pytest.approx(2)
+    assert metrics.hit_rate == pytest.approx(1)
+    metrics.tick_second(total_senses=30, total_operates=4)  # 第一秒过期
+    assert metrics.hit_rate == 0
+    assert metrics.sense_rate == pytest.approx(10)
+    assert metrics.reward_ewma == pytest.approx(0.25)  # 1 → 0.5 → 0.25
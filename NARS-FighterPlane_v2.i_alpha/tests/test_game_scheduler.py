@@ -0,0 +1,66 @@
+"""游戏内事件调度器：到期顺序、合并错过的周期、暂停/恢复"""
+
+from types import SimpleNamespace
+
+from game_scheduler import GameScheduler
+
+
+def test_tasks_run_in_due_order_and_ties_keep_schedule_order():
+    scheduler = GameScheduler()
+    runs: list[str] = []
+    scheduler.schedule('slow', 300, lambda: runs.append('slow'))
+    scheduler.schedule('fast', 100, lambda: runs.append('fast'))
+    scheduler.schedule('tie', 300, lambda: runs.append('tie'))
+    assert scheduler.advance(300) == 3
+    assert runs == ['fast', 'slow', 'tie']
+
+
+def test_missed_periods_are_merged_into_one_run():
+    scheduler = GameScheduler()
+    runs: list[float] = []
+    scheduler.schedule('task', 100, lambda: runs.append(scheduler.now_ms))
+    scheduler.advance(350)  # 跨过三个周期：只执行一次
+    assert runs == [350]
+    assert scheduler['task'].due_ms == 400  # 保持相位
+    scheduler.advance(50)
+    assert runs == [350, 400]
+
+
+def test_pause_skips_task_and_resume_restarts_a_full_period():
+    scheduler = GameScheduler()
+    runs: list[str] = []
+    scheduler.schedule('paused', 100, lambda: runs.append('paused'))
+    scheduler.schedule('other', 100, lambda: runs.append('other'))
+    scheduler.pause('paused')
+    assert scheduler.is_paused('paused')
+    scheduler.advance(250)
+    assert runs == ['other']
+    scheduler.resume('paused')
+    scheduler.advance(90)  # 恢复后要满一个周期才执行
+    assert 'paused' not in runs
+    scheduler.advance(10)
+    assert runs[-1] == 'paused'
+    assert scheduler['paused'].runs == 1
+
+
+def test_cancel_and_replace_drop_stale_heap_entries():
+    scheduler = GameScheduler()
+    runs: list[str] = []
+    scheduler.schedule('task', 100, lambda: runs.append('old'))
+    scheduler.schedule('task', 100, lambda: runs.append('new'))
+    scheduler.schedule('gone', 100, lambda: runs.append('gone'))
+    scheduler.cancel('gone')
+    assert scheduler.advance(100) == 1
+    assert runs == ['new']
+    assert 'gone' not in scheduler
+
+
+def test_game_speed_keeps_fps_positive():
+    "游戏速度减半多次后，帧率仍至少为1（按帧率等待时以它为除数）"
+    from plane_game import PlaneGame
+    game = SimpleNamespace()
+    speed = 1.0
+    for _ in range(8):
+        speed /= 2
+        PlaneGame.game_speed.fset(game, speed)
+        assert game.fps >= 1
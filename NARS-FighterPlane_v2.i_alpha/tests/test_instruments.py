@@ -0,0 +1,47 @@
+"""计时/计数注册表：多线程同时记录时不丢失"""
+
+import threading
+
+import pytest
+
+from instruments import Instruments
+
+NUM_THREADS: int = 8
+NUM_RECORDS: int = 20000
+
+
+def run_threads(target) -> None:
+    threads: list[threading.Thread] = [
+        threading.Thread(target=target, args=(i,)) for i in range(NUM_THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_records_are_not_lost():
+    instruments = Instruments(enabled=True)
+
+    def record(i: int) -> None:
+        for _ in range(NUM_RECORDS):
+            instruments.count('test.count')
+            instruments.add_time(f'test.timer{i % 2}', 0.001)  # 多个线程同时创建同名计时段
+
+    run_threads(record)
+    summary: dict = instruments.summary('test.')
+    assert summary['test.count']['count'] == NUM_THREADS * NUM_RECORDS
+    assert summary['test.timer0']['count'] + summary['test.timer1']['count'] == NUM_THREADS * NUM_RECORDS
+    assert summary['test.timer0']['max_ms'] == pytest.approx(1)
+
+
+def test_disabled_registry_records_nothing():
+    instruments = Instruments()
+    instruments.count('test.count')
+    with instruments.section('test.section'):
+        pass
+    assert instruments.summary() == {}
+    assert instruments.toggle()
+    with instruments.section('test.section'):
+        pass
+    assert instruments.summary(reset=True)['test.section']['count'] == 1
+    assert instruments.summary() == {}
@@ -0,0 +1,106 @@
+"""延迟统计：直方图分位数、跨程序合并与「读取→应用」的计时起点"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from NARS_Elements import NARSOperation
+from NARS_Latency import (
+    LatencyHistogram, LatencyTracker, merge_trackers, now, STAGE_APPLY, STAGE_QUEUE, STAGE_ROUND_TRIP)
+
+
+def test_percentiles_are_within_one_bucket():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):  # 1ms … 100ms
+        histogram.record(ms / 1000)
+    assert histogram.count == 100
+    assert histogram.mean == pytest.approx(0.0505)
+    assert histogram.max == pytest.approx(0.1)
+    for p in (50, 95, 99):
+        exact: float = p / 1000
+        assert exact <= histogram.percentile(p) <= exact * LatencyHistogram.GROWTH
+    assert histogram.percentile(100) == pytest.approx(0.1)  # 不超过最大值
+
+
+def test_empty_histogram_and_extremes():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) == 0.0
+    histogram.record(0)  # 低于最小值：计入第一个桶
+    histogram.record(1e6)  # 超出范围：计入最后一个桶
+    assert histogram.counts[0] == histogram.counts[-1] == 1
+
+
+def test_percentile_cache_follows_new_records():
+    histogram = LatencyHistogram()
+    histogram.record(0.001)
+    assert histogram.percentiles()[99] <= 0.001
+    histogram.record(1.0)
+    assert histogram.percentiles()[99] == pytest.approx(1.0)
+
+
+def test_merge_trackers_combines_only_given_stages():
+    a, b = LatencyTracker('a'), LatencyTracker('b')
+    a.record(STAGE_QUEUE, 0.001)
+    b.record(STAGE_QUEUE, 0.004)
+    b.record(STAGE_QUEUE, 0.002)
+    a.record(STAGE_APPLY, 0.010)
+    merged: LatencyTracker = merge_trackers([a, b], 'both', stages=(STAGE_QUEUE,))
+    assert merged.backend == 'both'
+    assert merged[STAGE_QUEUE].count == 3
+    assert merged[STAGE_QUEUE].total == pytest.approx(0.007)
+    assert merged[STAGE_QUEUE].max == pytest.approx(0.004)
+    assert merged[STAGE_APPLY].count == 0
+    assert a[STAGE_QUEUE].count == 1  # 原统计不变
+
+
+def test_round_trip_starts_at_latest_flushed_perception():
+    tracker = LatencyTracker('test')
+    tracker.on_operation_read(1.0)  # 尚无感知：不计
+    tracker.on_written(1.0, 1.1, 1.2, is_perception=True)
+    tracker.on_written(2.0, 2.1, 2.2, is_perception=False)  # 非感知不改变起点
+    tracker.on_operation_read(3.0)
+    assert tracker[STAGE_ROUND_TRIP].count == 1
+    assert tracker[STAGE_ROUND_TRIP].total == pytest.approx(2.0)
+
+
+@pytest.fixture
+def player():
+    "未装载程序的战机玩家：只挂上延迟统计"
+    from plane_game import NARSPlanePlayer
+    player = NARSPlanePlayer()
+    player.brain = SimpleNamespace(latency=LatencyTracker('test'))
+    yield player
+    player.brain = None
+
+
+def read_operation(name: str, read_time: float) -> NARSOperation:
+    "模拟从程序输出中读取到的操作"
+    operation = NARSOperation(name)
+    operation.read_time = read_time
+    return operation
+
+
+def test_apply_latency_uses_newest_read_time(player):
+    from plane_game import NARSPlanePlayer
+    left = NARSPlanePlayer.OPERATION_LEFT
+    player.handle_program_operation(read_operation('left', now() - 10))
+    player.handle_program_operation(read_operation('left', now()))
+    player.mark_operation_applied(left)
+    histogram: LatencyHistogram = player.brain.latency[STAGE_APPLY]
+    assert histogram.count == 1
+    assert histogram.max < 5  # 以第二次读取为起点（第一次的读取时间已过期）
+
+
+def test_cancelled_move_does_not_keep_its_read_time(player):
+    from plane_game import NARSPlanePlayer
+    left, right = NARSPlanePlayer.OPERATION_LEFT, NARSPlanePlayer.OPERATION_RIGHT
+    player.handle_program_operation(read_operation('left', now() - 10))
+    player.handle_program_operation(read_operation('right', now()))  # 取代向左移动
+    assert not player[left]
+    assert player.next_motion() == (NARSPlanePlayer.MOVE_SPEED, False)
+    player.cancel_operation(right)
+    player.store_operation(left)  # 无意识操作：没有读取时间
+    assert player.next_motion() == (-NARSPlanePlayer.MOVE_SPEED, False)
+    histogram: LatencyHistogram = player.brain.latency[STAGE_APPLY]
+    assert histogram.count == 1  # 只有向右移动被计时
+    assert histogram.max < 5
@@ -0,0 +1,30 @@
+"""程序池：归还后的程序不会把上一次租用的操作传给下一个租用者（使用替身NARS）"""
+
+import time
+
+from NARS_Pool import BrainPool, LEASE_WARM
+from NARS_Program import NARSType
+
+OPTIONS: dict = {'operation_probability': 1.0, 'latency': 0.01}
+"每条语句都输出一个操作，且每次响应都有延迟：归还时后端仍有积压的输入"
+
+
+def test_released_program_does_not_leak_operations_to_next_lease():
+    pool = BrainPool(NARSType.SCRIPTED_ONA)
+    try:
+        program = pool.lease(**OPTIONS)
+        for i in range(20):
+            program.put_goal(f'old{i}')
+        while program.num_cached_cmds:  # 全部写入管道（而不是在归还时被丢弃）
+            time.sleep(0.001)
+        pool.release(program)
+        program = pool.lease(**OPTIONS)
+        assert pool.num_leases[LEASE_WARM] == 1
+        operations: list = []
+        program.operationHook = operations.append
+        program.put_goal('new')
+        time.sleep(0.2)
+        assert len(operations) == 1  # 只有新语句引发的操作
+        pool.release(program)
+    finally:
+        pool.close()
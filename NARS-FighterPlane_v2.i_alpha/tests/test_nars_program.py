@@ -0,0 +1,19 @@
+"""程序构造：各类型接受的配置项"""
+
+import pytest
+
+from NARS_Program import NARSType, NARSProgram, Scripted
+
+
+def test_scripted_backends_accept_their_script_options():
+    for nars_type in (NARSType.SCRIPTED_ONA, NARSType.SCRIPTED_OPENNARS):
+        NARSProgram.check_options(nars_type, dict(Scripted.DEFAULT_OPTIONS))
+
+
+def test_real_backends_accept_only_their_paths():
+    NARSProgram.check_options(NARSType.ONA, {'exe_path': 'NAR'})
+    NARSProgram.check_options(NARSType.OPENNARS, {'jar_path': 'opennars.jar'})
+    with pytest.raises(ValueError, match='noise'):
+        NARSProgram.check_options(NARSType.ONA, {'noise': 10})
+    with pytest.raises(ValueError, match='seed'):
+        NARSProgram.fromType(NARSType.OPENNARS, seed=0)  # 启动之前报错
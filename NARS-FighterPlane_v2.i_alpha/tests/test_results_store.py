@@ -0,0 +1,64 @@
+"""结果库：续跑所需的已完成格子、同一格只保留最先写入的结果、后台批量写入"""
+
+import pytest
+
+from results_store import ResultStore, ResultWriter, column_name
+
+
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    return str(tmp_path / 'results.sqlite')
+
+
+def test_first_write_wins_per_cell(db_path):
+    store = ResultStore(db_path)
+    first: int = store.add_run({'nars_type': 'ONA', 'seed': 1}, {'performance': 1.0},
+                               experiment='a', cell_id='cell')
+    again: int = store.add_run({'nars_type': 'ONA', 'seed': 1}, {'performance': 2.0},
+                               experiment='a', cell_id='cell')
+    assert again == first
+    runs = store.runs()
+    assert len(runs) == 1
+    assert runs['performance'][0] == 1.0
+    assert runs['backend'][0] == 'ONA'  # 后端名取自nars_type
+    store.close()
+
+
+def test_finished_cells_are_scoped_by_experiment_and_survive_reopening(db_path):
+    store = ResultStore(db_path)
+    store.add_run({}, {}, experiment='a', cell_id='a1')
+    store.add_run({}, {}, experiment='b', cell_id='b1')
+    store.add_run({}, {})  # 非扫描的局：没有格子编号
+    store.close()
+    store = ResultStore(db_path)  # 续跑：重新打开
+    assert store.finished_cells() == {'a1', 'b1'}
+    assert store.finished_cells('a') == {'a1'}
+    store.close()
+
+
+def test_summary_and_telemetry_columns_are_added_on_demand(db_path):
+    store = ResultStore(db_path)
+    run_id: int = store.add_run(
+        {'backend': 'ONA', 'sensors': ['edge', 'enemy']},
+        {'round trip p95 (ms)': 3.5},
+        telemetry=[{'ingame_time': 1, 'hit rate': 0.5}, {'ingame_time': 0, 'hit rate': 0.25}])
+    runs = store.runs(backend=['ONA', 'opennars'])
+    assert runs[column_name('round trip p95 (ms)')][0] == 3.5
+    assert runs['sensors'][0] == '["edge", "enemy"]'
+    telemetry = store.telemetry([run_id])
+    assert list(telemetry['hit_rate']) == [0.25, 0.5]  # 按游戏内时间排序
+    store.close()
+
+
+def test_writer_flushes_queued_runs_on_close(db_path):
+    writer = ResultWriter(db_path)
+    for i in range(100):
+        writer.submit({'seed': i}, {'performance': i}, experiment='w', cell_id=f'w{i}')
+    writer.submit({'seed': 0}, {'performance': -1}, experiment='w', cell_id='w0')  # 重复的格子
+    writer.close()
+    assert writer.num_written == 101
+    store = ResultStore(db_path)
+    runs = store.runs(experiment='w')
+    assert len(runs) == 100
+    assert runs['performance'].min() == 0
+    store.close()
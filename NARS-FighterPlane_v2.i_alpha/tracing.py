@@ -0,0 +1,97 @@
+"""游戏循环各阶段与I/O线程活动的「时间线追踪」
+- 记录每个线程（游戏、写入、读取）中各计时段的起止，导出为Chrome「trace event」格式的JSON
+- 可直接在 chrome://tracing 或 Perfetto 等标准查看器中打开
+- 事件存放于定长环形缓冲区中：长时间追踪只保留最近的事件，内存不会无限增长
+"""
+
+import os
+import json
+import threading
+from time import perf_counter
+from collections import deque
+
+DEFAULT_BUFFER_SIZE: int = 200_000
+"默认最多保留的事件数"
+
+THREAD_NAME_ALIASES: dict[str, str] = {
+    'MainThread': 'game',
+}
+"线程名的显示别名"
+
+
+class Tracer:
+    """时间线追踪器
+    - complete(名称, 起, 止)：记录一个完整的计时段（perf_counter秒）
+    - save(路径)：导出为trace event JSON
+    """
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        self.events: deque[tuple[str, float, float, int]] = deque(maxlen=buffer_size)
+        self.start_time: float = perf_counter()
+        self._thread_names: dict[int, str] = {}
+        self.pid: int = os.getpid()
+
+    @property
+    def buffer_size(self) -> int:
+        return self.events.maxlen
+
+    def complete(self, name: str, start: float, end: float) -> None:
+        "记录一个完整的计时段（由所在线程调用）"
+        tid: int = threading.get_ident()
+        if tid not in self._thread_names:  # 只在首次遇到线程时查询名字
+            name_of_thread: str = threading.current_thread().name
+            self._thread_names[tid] = THREAD_NAME_ALIASES.get(
+                name_of_thread, name_of_thread)
+        self.events.append((name, start, end, tid))
+
+    def span(self, name: str):
+        "（单独使用时）计时段上下文"
+        return _Span(self, name)
+
+    def clear(self) -> None:
+        self.events.clear()
+
+    def to_trace_events(self) -> list[dict]:
+        "转换为trace event列表（时间单位：微秒）"
+        events: list[dict] = [
+            {
+                'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid,
+                'args': {'name': name},
+            }
+            for tid, name in list(self._thread_names.items())
+        ]
+        for name, start, end, tid in list(self.events):
+            events.append({
+                'name': name,
+                'cat': name.split('.', 1)[0],  # 名称前缀作为类别
+                'ph': 'X',
+                'ts': (start - self.start_time) * 1e6,
+                'dur': (end - start) * 1e6,
+                'pid': self.pid,
+                'tid': tid,
+            })
+        return events
+
+    def save(self, path: str) -> None:
+        "导出为trace event JSON文件"
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(
+                {'traceEvents': self.to_trace_events(), 'displayTimeUnit': 'ms'},
+                file
+            )
+        print(f'Trace with {len(self.events)} events is exported to {path}.')
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'start')
+
+    def __init__(self, tracer: Tracer, name: str) -> None:
+        self.tracer: Tracer = tracer
+        self.name: str = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.tracer.complete(self.name, self.start, perf_counter())
@@ -0,0 +1,334 @@
+"""批量环境：在一个进程中，用堆叠的NumPy数组同时推进K个互相独立的FighterPlane世界
+- 每个世界一架战机；敌机与子弹存放在(K, 容量)的数组中，以存活掩码区分空位（容量不足时自动加倍）
+- 出场、移动、碰撞与感知都对K个世界一次性向量化计算；只有「与大脑通信」按世界逐个进行
+- 规则与PlaneGame一致（同一调度器的事件周期、图片尺寸、速度与碰撞判定）；第k个世界的敌机出场与PlaneGame(seed=种子+k)相同
+  - 差异：同一帧内两颗子弹击中同一架敌机时，两颗都计分（PlaneGame逐颗结算，只计一颗）
+- 每个世界仍有自己的NARS智能体与程序（可从NARS_Pool的程序池中租用）
+用法：
+    env = VectorPlaneEnv(64, NARSType.SCRIPTED_ONA, seed=0)
+    observation = env.reset()
+    observation, rewards, done, info = env.step(6)  # rewards：各世界的得分变化（数组）
+    env.close()
+    python vector_env.py --worlds 1 16 64 [--seconds 60]  # 测量游戏侧与通信侧的开销
+"""
+
+import os
+import time
+import argparse
+
+import numpy as np
+
+from game_sprites import SCREEN_RECT, ENEMY_IMAGE, HERO_IMAGE, BULLET_IMAGE, BULLET_SPEED, load_image
+from game_random import GameRandom, SpawnSchedule, enemy_max_x
+from game_scheduler import GameScheduler
+from instruments import INSTRUMENTS
+from plane_game import NARSPlanePlayer, NARSType, SIMULATION_STEP_MS, CRASH_RADIUS_RATIO, \
+    INGAME_CLOCK_PERIOD_MS, CREATE_ENEMY_PERIOD_MS, UPDATE_NARS_PERIOD_MS, BABBLE_PERIOD_MS
+
+DEFAULT_CAPACITY: int = 16
+"每个世界中敌机/子弹数组的初始容量"
+
+PERCEPTIONS: list[tuple[str, any]] = [
+    (NARSPlanePlayer.SENSOR_EDGE, NARSPlanePlayer.SENSE_EDGE_LEFT),
+    (NARSPlanePlayer.SENSOR_EDGE, NARSPlanePlayer.SENSE_EDGE_RIGHT),
+    (NARSPlanePlayer.SENSOR_MOVING, NARSPlanePlayer.SNESE_STILL),
+    (NARSPlanePlayer.SENSOR_MOVING, NARSPlanePlayer.SNESE_MOVING_LEFT),
+    (NARSPlanePlayer.SENSOR_MOVING, NARSPlanePlayer.SNESE_MOVING_RIGHT),
+    (NARSPlanePlayer.SENSOR_ENEMY, NARSPlanePlayer.SNESE_ENEMY_LEFT),
+    (NARSPlanePlayer.SENSOR_ENEMY, NARSPlanePlayer.SNESE_ENEMY_RIGHT),
+    (NARSPlanePlayer.SENSOR_ENEMY, NARSPlanePlayer.SNESE_ENEMY_AHEAD),
+    (NARSPlanePlayer.SENSOR_ENEMY, NARSPlanePlayer.SNESE_ENEMY_NEARBY),
+]
+"感知矩阵的各列：（所属感知器, 感知），顺序与NARSPlanePlayer的感知器一致"
+
+
+def _grow(array: np.ndarray) -> np.ndarray:
+    "把(K, 容量)的数组沿容量加倍（新空位为零/假）"
+    return np.concatenate([array, np.zeros_like(array)], axis=1)
+
+
+class VectorPlaneEnv:
+    """K个FighterPlane世界的批量环境（无界面、不等待）
+    - players：每个世界的智能体（为空时按nars_type创建；brain_options含seed时，第k个世界的种子为「seed+k」）
+    - duration_s：每回合的游戏内时长（秒），到达后done为真；为空则不结束
+    """
+
+    def __init__(self, num_worlds: int, nars_type: NARSType = NARSType.SCRIPTED_ONA, seed: int = 0,
+                 brain_options: dict = None, enable_punish: bool = False, duration_s: int = None,
+                 brain_pool=None, players: list[NARSPlanePlayer] = None,
+                 capacity: int = DEFAULT_CAPACITY) -> None:
+        brain_options = brain_options or {}
+        self.num_worlds: int = num_worlds
+        self.enable_punish: bool = enable_punish
+        self.duration_s: int = duration_s
+        self.players: list[NARSPlanePlayer] = list(players) if players else [
+            NARSPlanePlayer(nars_type, (
+                {**brain_options, 'seed': brain_options['seed'] + k}
+                if 'seed' in brain_options and k else brain_options),
+                brain_pool)
+            for k in range(num_worlds)
+        ]
+        # 尺寸（由图片决定）
+        self.hero_size: tuple[int, int] = load_image(HERO_IMAGE).get_size()
+        self.enemy_size: tuple[int, int] = load_image(ENEMY_IMAGE).get_size()
+        self.bullet_size: tuple[int, int] = load_image(BULLET_IMAGE).get_size()
+        self.hero_top: int = SCREEN_RECT.bottom - self.hero_size[1]
+        self.hero_max_x: int = SCREEN_RECT.width - self.hero_size[0]
+        crash_radius = lambda width, height: CRASH_RADIUS_RATIO * 0.5 * (width ** 2 + height ** 2) ** 0.5
+        self.crash_distance_sq: float = (
+            crash_radius(*self.hero_size) + crash_radius(*self.enemy_size)) ** 2
+        # 状态数组
+        self.hero_x: np.ndarray = np.zeros(num_worlds, np.int32)
+        self.hero_speed: np.ndarray = np.zeros(num_worlds, np.int32)
+        self.enemy_x: np.ndarray = np.zeros((num_worlds, capacity), np.int32)
+        self.enemy_y: np.ndarray = np.zeros((num_worlds, capacity), np.int32)
+        self.enemy_speed: np.ndarray = np.zeros((num_worlds, capacity), np.int32)
+        self.enemy_alive: np.ndarray = np.zeros((num_worlds, capacity), bool)
+        self.bullet_x: np.ndarray = np.zeros((num_worlds, capacity), np.int32)
+        self.bullet_y: np.ndarray = np.zeros((num_worlds, capacity), np.int32)
+        self.bullet_alive: np.ndarray = np.zeros((num_worlds, capacity), bool)
+        self.scores: np.ndarray = np.zeros(num_worlds, np.int64)
+        self.babble_probability: int = 2  # 每次babble事件以1/n的几率执行
+        self.episode: int = 0
+        self._seed(seed)
+        self._reset_world()
+
+    def _seed(self, seed: int) -> None:
+        "每个世界独立的随机数流（第k个世界的种子为「seed+k」）"
+        self.seed: int = seed
+        self.randoms: list[GameRandom] = [GameRandom(seed + k) for k in range(self.num_worlds)]
+        max_x: int = enemy_max_x()
+        self.spawns: list[SpawnSchedule] = [SpawnSchedule(random.world, max_x) for random in self.randoms]
+        for player, random in zip(self.players, self.randoms):
+            player.rng = random.babble
+
+    def _reset_world(self) -> None:
+        "清空所有世界，战机回到中间，定时事件从头开始"
+        self.hero_x[:] = SCREEN_RECT.centerx - self.hero_size[0] // 2
+        self.hero_speed[:] = 0
+        self.enemy_alive[:] = False
+        self.bullet_alive[:] = False
+        self.scores[:] = 0
+        self.num_ticks: int = 0
+        self.ingame_time: int = 0
+        self.remaining_babble_times: int = 200 if self.players[0].need_babble else 0
+        self.scheduler: GameScheduler = GameScheduler()
+        self.scheduler.schedule('ingame_clock', INGAME_CLOCK_PERIOD_MS, self._on_ingame_clock)
+        self.scheduler.schedule('create_enemy', CREATE_ENEMY_PERIOD_MS, self._spawn)
+        self.scheduler.schedule('update_nars', UPDATE_NARS_PERIOD_MS, self._update_brains)
+        self.scheduler.schedule('babble', BABBLE_PERIOD_MS, self._babble)
+
+    # 回合 #
+
+    @property
+    def done(self) -> bool:
+        return self.duration_s is not None and self.ingame_time >= self.duration_s
+
+    @property
+    def info(self) -> dict:
+        return {'episode': self.episode, 'ticks': self.num_ticks, 'ingame_time': self.ingame_time}
+
+    def reset(self, reset_brain: bool = False, seed: int = None) -> dict[str, np.ndarray]:
+        "开始新的回合（所有世界同时），返回初始观察；seed：重新生成各世界的随机数流"
+        if self.num_ticks:
+            self.episode += 1
+        if seed is not None:
+            self._seed(seed)
+        for player in self.players:
+            player.reset_state(reset_brain)
+        self._reset_world()
+        return self.observe()
+
+    def step(self, n_ticks: int = 1) -> tuple[dict[str, np.ndarray], np.ndarray, bool, dict]:
+        "推进n_ticks帧，返回（观察, 各世界的得分变化, 回合是否结束, 信息）"
+        scores: np.ndarray = self.scores.copy()
+        for _ in range(n_ticks):
+            self.tick()
+        return self.observe(), self.scores - scores, self.done, self.info
+
+    def tick(self) -> None:
+        "推进一帧：定时事件→执行操作→碰撞→移动（与PlaneGame.tick的顺序相同）"
+        self.scheduler.advance(SIMULATION_STEP_MS)
+        self._apply_operations()
+        self._collide()
+        self._move()
+        self.num_ticks += 1
+
+    def observe(self) -> dict[str, np.ndarray]:
+        "所有世界的观察：感知矩阵（K×len(PERCEPTIONS)，布尔）、战机位置与速度、得分"
+        return {
+            'perceptions': self.perceptions(),
+            'hero_x': self.hero_x.copy(),
+            'hero_speed': self.hero_speed.copy(),
+            'scores': self.scores.copy(),
+        }
+
+    def close(self) -> None:
+        for player in self.players:
+            player.disconnect_brain()
+
+    # 定时事件 #
+
+    def _on_ingame_clock(self) -> None:
+        self.ingame_time += 1
+
+    @INSTRUMENTS.timed('vector.spawn')
+    def _spawn(self) -> None:
+        "每个世界出现一架敌机（速度与位置取自各自的出场表；顶端与屏幕上沿对齐）"
+        slots: np.ndarray = self._free_slots('enemy_alive', ('enemy_x', 'enemy_y', 'enemy_speed'))
+        spawns: np.ndarray = np.array([schedule.next() for schedule in self.spawns], np.int32)
+        worlds: np.ndarray = np.arange(self.num_worlds)
+        self.enemy_speed[worlds, slots] = spawns[:, 0]
+        self.enemy_x[worlds, slots] = spawns[:, 1]
+        self.enemy_y[worlds, slots] = -self.enemy_size[1]
+        self.enemy_alive[worlds, slots] = True
+
+    def _free_slots(self, alive: str, columns: tuple[str]) -> np.ndarray:
+        "每个世界的第一个空位（有世界已满时，先把该类数组的容量加倍）"
+        if getattr(self, alive).all(axis=1).any():
+            for name in (alive, *columns):
+                setattr(self, name, _grow(getattr(self, name)))
+        return getattr(self, alive).argmin(axis=1)
+
+    @INSTRUMENTS.timed('vector.brains')
+    def _update_brains(self) -> None:
+        "把每个世界的感知送入各自的大脑（只发送对应感知器已启用的感知）"
+        perceptions: np.ndarray = self.perceptions()
+        for player, row in zip(self.players, perceptions):
+            sensors: dict = player.named_sensors
+            player.update_perceptions([
+                perception
+                for (sensor, perception), present in zip(PERCEPTIONS, row)
+                if present and sensors[sensor].enabled
+            ])
+
+    def _babble(self) -> None:
+        if self.remaining_babble_times <= 0:
+            self.scheduler.pause('babble')
+            return
+        for player in self.players:
+            player.babble(self.babble_probability, NARSPlanePlayer.BABBLE_OPERATION_LIST)
+        self.remaining_babble_times -= 1
+
+    # 每帧 #
+
+    @INSTRUMENTS.timed('vector.operations')
+    def _apply_operations(self) -> None:
+        "逐个世界读取大脑的操作（速度与射击），新子弹的底端与战机顶端对齐、水平居中"
+        fire: np.ndarray = np.zeros(self.num_worlds, bool)
+        for k, player in enumerate(self.players):
+            self.hero_speed[k], fire[k] = player.next_motion()
+        if not fire.any():
+            return
+        slots: np.ndarray = self._free_slots('bullet_alive', ('bullet_x', 'bullet_y'))
+        worlds: np.ndarray = np.flatnonzero(fire)
+        slots = slots[worlds]
+        hero_centerx: np.ndarray = self.hero_x[worlds] + self.hero_size[0] // 2
+        self.bullet_x[worlds, slots] = hero_centerx - self.bullet_size[0] // 2
+        self.bullet_y[worlds, slots] = self.hero_top - self.bullet_size[1]
+        self.bullet_alive[worlds, slots] = True
+
+    @INSTRUMENTS.timed('vector.collision')
+    def _collide(self) -> None:
+        "子弹击中敌机（矩形相交，二者消失并计分）；敌机撞上战机（缩小的外接圆相交，敌机消失，按需惩罚）"
+        enemy_width, enemy_height = self.enemy_size
+        bullet_width, bullet_height = self.bullet_size
+        # 子弹×敌机：(K, 子弹, 敌机)
+        bullet_x, bullet_y = self.bullet_x[:, :, None], self.bullet_y[:, :, None]
+        enemy_x, enemy_y = self.enemy_x[:, None, :], self.enemy_y[:, None, :]
+        hits: np.ndarray = (
+            self.bullet_alive[:, :, None] & self.enemy_alive[:, None, :]
+            & (bullet_x < enemy_x + enemy_width) & (enemy_x < bullet_x + bullet_width)
+            & (bullet_y < enemy_y + enemy_height) & (enemy_y < bullet_y + bullet_height)
+        )
+        bullet_hits: np.ndarray = hits.any(axis=2)
+        self.bullet_alive &= ~bullet_hits
+        self.enemy_alive &= ~hits.any(axis=1)
+        num_hits: np.ndarray = bullet_hits.sum(axis=1)
+        self.scores += num_hits
+        for k in np.flatnonzero(num_hits):
+            self.players[k].praise()
+        # 战机×敌机：圆心距离
+        dx: np.ndarray = (self.enemy_x + enemy_width // 2) - (self.hero_x + self.hero_size[0] // 2)[:, None]
+        dy: np.ndarray = (self.enemy_y + enemy_height // 2) - (self.hero_top + self.hero_size[1] // 2)
+        crashes: np.ndarray = self.enemy_alive & (dx * dx + dy * dy <= self.crash_distance_sq)
+        self.enemy_alive &= ~crashes
+        if self.enable_punish and crashes.any():
+            num_crashes: np.ndarray = crashes.sum(axis=1)
+            self.scores -= num_crashes
+            for k in np.flatnonzero(num_crashes):
+                self.players[k].punish()
+
+    @INSTRUMENTS.timed('vector.move')
+    def _move(self) -> None:
+        "移动所有精灵，移出屏幕的敌机与子弹消失，战机限制在屏幕内"
+        self.enemy_y += self.enemy_speed
+        self.enemy_alive &= self.enemy_y < SCREEN_RECT.height
+        self.bullet_y += BULLET_SPEED
+        self.bullet_alive &= self.bullet_y + self.bullet_size[1] >= 0
+        np.clip(self.hero_x + self.hero_speed, 0, self.hero_max_x, out=self.hero_x)
+
+    @INSTRUMENTS.timed('vector.perceptions')
+    def perceptions(self) -> np.ndarray:
+        "所有世界的感知矩阵（K×len(PERCEPTIONS)，布尔），判定与NARSPlanePlayer的感知器相同"
+        enemy_width: int = self.enemy_size[0]
+        hero_centerx: np.ndarray = (self.hero_x + self.hero_size[0] // 2)[:, None]
+        alive: np.ndarray = self.enemy_alive
+        left_of: np.ndarray = self.enemy_x + enemy_width < hero_centerx
+        right_of: np.ndarray = hero_centerx < self.enemy_x
+        at_left: np.ndarray = self.hero_x <= 0
+        at_right: np.ndarray = self.hero_x + self.hero_size[0] >= SCREEN_RECT.right
+        still: np.ndarray = at_left | at_right | (self.hero_speed == 0)
+        return np.stack([
+            at_left,
+            at_right & ~at_left,
+            still,
+            ~still & (self.hero_speed < 0),
+            ~still & (self.hero_speed > 0),
+            (alive & left_of).any(axis=1),
+            (alive & right_of).any(axis=1),
+            (alive & ~left_of & ~right_of).any(axis=1),
+            (alive & (self.enemy_y + self.enemy_size[1] < self.hero_top)).any(axis=1),
+        ], axis=1)
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Step K FighterPlane worlds in one process and measure the game-side overhead')
+    parser.add_argument('--worlds', type=int, nargs='+', default=[1, 16, 64])
+    parser.add_argument('--backend', default='scripted_ONA')
+    parser.add_argument('--seconds', type=int, default=60,
+                        help='in-game seconds to simulate for each world count')
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args: argparse.Namespace = parse_args()
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))  # 图片以游戏目录为相对路径
+    nars_type: NARSType = NARSType.from_str(args.backend)
+    game_sections: tuple[str] = ('vector.spawn', 'vector.collision', 'vector.move', 'vector.perceptions')
+    print('| worlds | wall time (s) | world-ticks/s | game side (us/world-tick) | brains (us/world-tick) | scores |')
+    print('|---|---|---|---|---|---|')
+    for num_worlds in args.worlds:
+        env = VectorPlaneEnv(num_worlds, nars_type, seed=args.seed,
+                             brain_options={'seed': args.seed} if args.backend.startswith('scripted') else None)
+        env.reset()
+        INSTRUMENTS.enabled = True
+        INSTRUMENTS.reset()
+        start: float = time.perf_counter()
+        while env.ingame_time < args.seconds:
+            env.tick()
+        wall_time: float = time.perf_counter() - start
+        summary: dict = INSTRUMENTS.summary(prefix='vector.', reset=True)
+        INSTRUMENTS.enabled = False
+        world_ticks: int = num_worlds * env.num_ticks
+        # 感知在大脑更新时也会计算一次：从「大脑」中扣除，计入「游戏侧」
+        game_ms: float = sum(summary.get(name, {}).get('total_ms', 0.0) for name in game_sections)
+        brains_ms: float = sum(summary.get(name, {}).get('total_ms', 0.0)
+                               for name in ('vector.brains', 'vector.operations')) \
+            - summary.get('vector.perceptions', {}).get('total_ms', 0.0)
+        print(f'| {num_worlds} | {wall_time:.2f} | {world_ticks / wall_time:.0f} | '
+              f'{game_ms * 1e3 / world_ticks:.2f} | {brains_ms * 1e3 / world_ticks:.2f} | '
+              f'{int(env.scores.sum())} |')
+        env.close()
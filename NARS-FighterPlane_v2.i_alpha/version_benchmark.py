@@ -0,0 +1,298 @@
+"""跨版本的I/O开销基准：v1.0、v2.0与v2.i三代NARS桥接层
+- v1.0/v2.0：在调用方线程中同步写入（add_to_cmd直接写管道并flush）
+- v2.i：write_line只入队，由写入线程送入管道
+- 三者连接同一个替身NARS（ONA协议），并由同一条确定性的感知轨迹驱动：敌机按出场表出现，战机左右往返（不受操作影响）
+- 替身对每条NAL语句恰好回应一个操作，因此第i个操作对应第i条语句，「操作延迟」即「调用方发出语句→收到对应操作」
+- 报告：每帧在调用方的阻塞时间、每秒送达的语句数、操作延迟；旧版本的桥接层原样加载，只替换进程的启动方式
+用法：python version_benchmark.py [--seconds 10] [--latency 0.0005] [--unpaced]
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+import importlib.util
+import multiprocessing as mp
+from time import perf_counter
+
+GAME_DIR: str = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR: str = os.path.dirname(GAME_DIR)
+
+VERSION_CURRENT: str = 'v2.i'
+LEGACY_VERSIONS: dict[str, str] = {
+    'v1.0': os.path.join(REPO_DIR, 'NARS-FighterPlane_v1.0', 'NARS.py'),
+    'v2.0': os.path.join(REPO_DIR, 'NARS-FighterPlane_v2.0', 'NARS.py'),
+}
+"旧版本的桥接层（模块路径）"
+VERSIONS: list[str] = [*LEGACY_VERSIONS, VERSION_CURRENT]
+
+STAND_IN_OPERATIONS: list[str] = ['left', 'right', 'deactivate']
+"替身输出的操作：三代的ONA解析都能识别"
+
+FPS: int = 60
+HERO_SWEEP_TICKS: int = 90
+"感知轨迹中，战机每次向同一方向移动的帧数"
+SETTLE_S: float = 0.3
+"启动后，操作数在这段时间内不再变化即视为启动阶段的输出已经结束"
+DRAIN_TIMEOUT_S: float = 10.0
+
+
+class TraceWorld:
+    "确定性的感知轨迹（与操作无关，三代看到的世界完全相同）"
+
+    def __init__(self, seed: int) -> None:
+        import pygame
+        from game_sprites import Hero
+        from game_random import GameRandom, SpawnSchedule, enemy_max_x
+        self.hero = Hero()
+        self.enemy_group = pygame.sprite.Group()
+        self.spawns = SpawnSchedule(GameRandom(seed).world, enemy_max_x())
+        self.num_ticks: int = 0
+
+    def step(self) -> None:
+        from game_sprites import Enemy
+        if self.num_ticks % FPS == 0:  # 每秒一架敌机
+            self.enemy_group.add(Enemy(*self.spawns.next()))
+        self.hero.speed = 4 if self.num_ticks // HERO_SWEEP_TICKS % 2 == 0 else -4
+        self.enemy_group.update()
+        self.hero.update()
+        self.num_ticks += 1
+
+
+class Bridge:
+    """被测桥接层的公共接口
+    - sent：调用方发出每条NAL语句的时间；received：收到每个操作的时间
+    - recording为假时不记录（启动阶段）
+    """
+
+    def __init__(self) -> None:
+        self.sent: list[float] = []
+        self.received: list[float] = []
+        self.recording: bool = False
+
+    def on_sent(self, sentence: str) -> None:
+        if self.recording and not sentence.startswith('*'):  # 指令不会得到回应
+            self.sent.append(perf_counter())
+
+    def on_received(self) -> None:
+        self.received.append(perf_counter())
+
+    def start_recording(self) -> None:
+        self.sent.clear()
+        self.received.clear()
+        self.recording = True
+
+    def update(self, world: TraceWorld) -> None:
+        "每帧调用：感知→目标→推理（计时对象）"
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+def load_legacy_module(version: str):
+    "按路径加载旧版本的NARS.py（模块名带版本号，避免与当前版本冲突）"
+    spec = importlib.util.spec_from_file_location(
+        f'NARS_{version.replace(".", "_")}', LEGACY_VERSIONS[version])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_bridge(version: str, options: dict) -> Bridge:
+    "旧版本（同步写入）：继承其ONA类，只替换进程的启动方式与操作回调"
+    from NARS_Program import ScriptedONA
+    module = load_legacy_module(version)
+
+    class LegacyBridge(Bridge, module.ONA):
+
+        def __init__(self) -> None:
+            Bridge.__init__(self)
+            module.ONA.__init__(self)
+
+        def launch_nars(self):
+            self.process = subprocess.Popen(ScriptedONA.command(**options),
+                                            bufsize=1,
+                                            stdin=subprocess.PIPE,
+                                            stdout=subprocess.PIPE,
+                                            universal_newlines=True,
+                                            shell=False)
+            self.add_to_cmd('*volume=0')
+
+        def add_to_cmd(self, str):
+            self.on_sent(str)
+            super().add_to_cmd(str)
+
+        def move_left(self):
+            self.on_received()
+            super().move_left()
+
+        def move_right(self):
+            self.on_received()
+            super().move_right()
+
+        def dont_move(self):
+            self.on_received()
+            super().dont_move()
+
+        def update(self, world: TraceWorld) -> None:
+            module.ONA.update(self, world.hero, world.enemy_group)
+
+        # 不终止替身进程：旧版本的读取线程在输出流关闭时会出错（读到空串），替身随工作进程退出而结束
+
+    return LegacyBridge()
+
+
+class CurrentBridge(Bridge):
+    "当前版本（写入线程）：NARSPlanePlayer + 替身ONA"
+
+    def __init__(self, options: dict) -> None:
+        super().__init__()
+        from plane_game import NARSPlanePlayer, NARSType
+        self.agent = NARSPlanePlayer(NARSType.SCRIPTED_ONA, options)
+        program = self.agent.brain
+        write_line = program.write_line
+        operation_hook = program.operationHook
+
+        def timed_write_line(cmd: str, is_perception: bool = False):
+            self.on_sent(cmd)
+            write_line(cmd, is_perception)
+
+        def on_operation(operation) -> None:
+            self.on_received()
+            operation_hook(operation)
+        program.write_line = timed_write_line
+        program.operationHook = on_operation
+
+    def update(self, world: TraceWorld) -> None:
+        self.agent.update(hero=world.hero, enemy_group=world.enemy_group)
+
+    def close(self) -> None:
+        self.agent.disconnect_brain()
+
+
+def wait_settled(bridge: Bridge) -> None:
+    "等待启动阶段的输出结束"
+    last: int = -1
+    while last != len(bridge.received):
+        last = len(bridge.received)
+        time.sleep(SETTLE_S)
+
+
+def run_version(config: dict) -> dict:
+    "（在子进程中）用感知轨迹驱动一代桥接层，返回统计"
+    os.chdir(GAME_DIR)
+    from NARS_Latency import LatencyHistogram
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')  # 旧版本每收到一个操作都会打印
+    options: dict = {
+        'seed': config['seed'],
+        'operation_probability': 1.0,  # 每条语句恰好回应一个操作
+        'operations': STAND_IN_OPERATIONS,
+        'latency': config['latency'],
+        'jitter': config['jitter'],
+        'noise': config['noise'],
+    }
+    version: str = config['version']
+    try:
+        world = TraceWorld(config['seed'])
+        bridge: Bridge = (
+            CurrentBridge(options) if version == VERSION_CURRENT
+            else legacy_bridge(version, options))
+        wait_settled(bridge)
+        blocking = LatencyHistogram()
+        num_ticks: int = int(config['seconds'] * FPS)
+        bridge.start_recording()
+        start: float = perf_counter()
+        next_tick: float = start
+        for _ in range(num_ticks):
+            world.step()
+            tick_start: float = perf_counter()
+            bridge.update(world)
+            blocking.record(perf_counter() - tick_start)
+            if config['paced']:
+                next_tick += 1 / FPS
+                if (delay := next_tick - perf_counter()) > 0:
+                    time.sleep(delay)
+        run_time: float = perf_counter() - start
+        deadline: float = perf_counter() + DRAIN_TIMEOUT_S
+        while len(bridge.received) < len(bridge.sent) and perf_counter() < deadline:
+            time.sleep(0.01)
+        bridge.recording = False
+        sent, received = list(bridge.sent), list(bridge.received)
+        bridge.close()
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    latency = LatencyHistogram()
+    for sent_time, received_time in zip(sent, received):
+        latency.record(received_time - sent_time)
+    delivered: int = min(len(sent), len(received))
+    return {
+        'version': version,
+        'ticks': num_ticks,
+        'sentences': len(sent),
+        'sentences/tick': len(sent) / num_ticks,
+        'run time (s)': run_time,
+        'blocking mean (us)': blocking.mean * 1e6,
+        'blocking p95 (us)': blocking.percentile(95) * 1e6,
+        'blocking max (us)': blocking.max * 1e6,
+        'blocking/sentence (us)': blocking.total / len(sent) * 1e6 if sent else 0.0,
+        'sentences/s': delivered / (received[delivered - 1] - sent[0]) if delivered else 0.0,
+        'undelivered': len(sent) - delivered,
+        'latency p50 (ms)': latency.percentile(50) * 1e3,
+        'latency p95 (ms)': latency.percentile(95) * 1e3,
+        'latency max (ms)': latency.max * 1e3,
+    }
+
+
+def format_table(rows: list[dict]) -> str:
+    "对比表（Markdown）"
+    columns: list[str] = list(rows[0])
+    lines: list[str] = [
+        '| ' + ' | '.join(columns) + ' |',
+        '|' + '---|' * len(columns),
+    ]
+    for row in rows:
+        lines.append('| ' + ' | '.join(
+            f'{value:.2f}' if isinstance(value, float) else str(value)
+            for value in row.values()) + ' |')
+    return '\n'.join(lines)
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Compare the I/O overhead of the v1.0, v2.0 and v2.i NARS layers')
+    parser.add_argument('--version', nargs='+', default=VERSIONS, choices=VERSIONS)
+    parser.add_argument('--seconds', type=float, default=10,
+                        help='length of the perception trace in seconds (at 60 ticks/s)')
+    parser.add_argument('--unpaced', action='store_true',
+                        help='drive the ticks back to back instead of at 60 ticks/s')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='response latency of the stand-in backend in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--noise', type=int, default=0,
+                        help='derivation lines the stand-in emits per sentence')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args: argparse.Namespace = parse_args()
+    configs: list[dict] = [
+        {
+            'version': version,
+            'seconds': args.seconds,
+            'paced': not args.unpaced,
+            'seed': args.seed,
+            'latency': args.latency,
+            'jitter': args.jitter,
+            'noise': args.noise,
+        }
+        for version in args.version
+    ]
+    # 每代一个子进程，依次运行（旧版本的线程与模块互不干扰）
+    with mp.get_context('spawn').Pool(1, maxtasksperchild=1) as pool:
+        rows: list[dict] = pool.map(run_version, configs)
+    print(format_table(rows))